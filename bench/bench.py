@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  bench.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Benchmarks of the scripts with fake ORCA (bench/fake_orca/orca): the time of
+# ORCA is simulated, so the numbers show the overhead of the scripts itself.
+# Every suite is run in a temporary directory, the scripts are pointed to it
+# and to fake ORCA by environment variables.
+
+import sys, os, re, argparse, time, json, math, random, shutil, socket, tempfile, subprocess
+
+VERSION = "0.11"
+HISTORY = '''
+			0.1 -- start project: startorca.py, orca2xyz.py, logP.py, cosmo-rs.py
+			0.11 -- versions of scripts are read from modules of package chemscripts
+'''
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+FAKE_ORCA_DIR = os.path.join(BENCH_DIR, "fake_orca")
+
+SUITES = ["startorca", "orca2xyz", "logP", "cosmo-rs"]
+
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser()
+	parser.add_argument ("-s", "--suites", nargs='+', choices = SUITES, default = SUITES, help = 'suites of benchmarks, default all')
+	parser.add_argument ("--inputs", type=int, default=20, help = 'number of input files for startorca.py')
+	parser.add_argument ("-j", "--jobs", type=int, default=4, help = 'number of jobs running at the same time for startorca.py')
+	parser.add_argument ("--job-time", type=float, default=0.1, help = 'simulated time of ORCA job for startorca.py, sec.')
+	parser.add_argument ("--size", type=float, default=100, help = 'size of synthetic output for orca2xyz.py, MB')
+	parser.add_argument ("--molecules", type=int, default=10, help = 'number of molecules for logP.py and cosmo-rs.py')
+	parser.add_argument ("--atoms", type=int, default=20, help = 'number of atoms in molecules')
+	parser.add_argument ("-o", "--output", metavar="FILE", help = 'file where results are appended (JSON lines)')
+	parser.add_argument ("--keep", help = 'do not remove temporary directory', nargs='*')
+	parser.add_argument ("-v", "--version", action="version", version=VERSION, help = 'print version')
+	return parser
+
+# random molecule, coordinates lines of XYZ format
+def molecule(n_atoms, seed):
+	rnd = random.Random(seed)
+	lines = []
+	for i in range(n_atoms):
+		symbol = rnd.choice(["C", "C", "C", "N", "O"]) if i % 2 == 0 else "H"
+		lines.append("  %-2s %12.6f %11.6f %11.6f" % (symbol, 1.5 * i + rnd.random(), rnd.uniform(-1, 1), rnd.uniform(-1, 1)))
+	return "\n".join(lines)
+
+def write_file(filename, data):
+	f = open(filename, "w")
+	f.write(data)
+	f.close()
+
+# environment of scripts: fake ORCA, scratch, cache and database in
+# temporary directory
+def environment(tmp_dir, **fake):
+	env = dict(os.environ)
+	env["CHEMSCRIPTS_ORCA_DIR"] = FAKE_ORCA_DIR
+	env["CHEMSCRIPTS_WORK_DIR"] = os.path.join(tmp_dir, "scratch")
+	env["CHEMSCRIPTS_HOME_DIR"] = os.path.join(tmp_dir, "home")
+	env["CHEMSCRIPTS_CACHE"] = os.path.join(tmp_dir, "cache")
+	env["CHEMSCRIPTS_DB"] = os.path.join(tmp_dir, "results.sqlite")
+	env.pop("CHEMSCRIPTS_NOCACHE", None)
+	for key, value in fake.items():
+		env["FAKE_ORCA_" + key.upper()] = str(value)
+	for d in ["scratch", "home"]:
+		os.makedirs(os.path.join(tmp_dir, d), exist_ok=True)
+	return env
+
+# run of script, returns wall time and output
+def run_script(script, args, env, cwd):
+	T_0 = time.perf_counter()
+	proc = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script)] + args, env=env, cwd=cwd, \
+		stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+	T = time.perf_counter() - T_0
+	if proc.returncode != 0:
+		raise RuntimeError(script + " failed:\n" + proc.stdout[-2000:])
+	return T, proc.stdout
+
+
+# queue of startorca.py: throughput and overhead in comparison with ideal
+# scheduler (the jobs of queue are run without gaps)
+def bench_startorca(options, tmp_dir):
+	env = environment(tmp_dir, time=options.job_time)
+	home = env["CHEMSCRIPTS_HOME_DIR"]
+	inputs = []
+	for i in range(options.inputs):
+		name = "job_%03d.inp" % i
+		write_file(os.path.join(home, name), "! opt\n* xyz 0 1\n" + molecule(options.atoms, i) + "\n*\n")
+		inputs.append(name)
+	T, out = run_script("startorca.py", [str(options.jobs), "-j", str(options.jobs)] + inputs, env, home)
+	ideal = math.ceil(options.inputs / options.jobs) * options.job_time
+	res = []
+	res.append(("startorca", "throughput", options.inputs / T, "jobs/sec."))
+	res.append(("startorca", "overhead per job", (T - ideal) / options.inputs, "sec."))
+	res.append(("startorca", "wall time", T, "sec."))
+	return res
+
+# parsing of large output of geometry optimization by orca2xyz.py
+def bench_orca2xyz(options, tmp_dir):
+	env = environment(tmp_dir)
+	work = os.path.join(tmp_dir, "orca2xyz")
+	os.makedirs(work, exist_ok=True)
+	write_file(os.path.join(work, "probe.inp"), "! opt\n* xyz 0 1\n" + molecule(options.atoms, 0) + "\n*\n")
+	# size of one cycle from output with one cycle, then the output of required size
+	probe = {}
+	for cycles in [1, 2]:
+		env["FAKE_ORCA_OPT_CYCLES"] = str(cycles)
+		f = open(os.path.join(work, "probe.out"), "w")
+		subprocess.run([os.path.join(FAKE_ORCA_DIR, "orca"), "probe.inp"], env=env, cwd=work, stdout=f, check=True)
+		f.close()
+		probe[cycles] = os.path.getsize(os.path.join(work, "probe.out"))
+	cycles = max(1, int(options.size * 1024**2 / max(1, probe[2] - probe[1])))
+	env["FAKE_ORCA_OPT_CYCLES"] = str(cycles)
+	T_0 = time.perf_counter()
+	f = open(os.path.join(work, "probe.out"), "w")
+	subprocess.run([os.path.join(FAKE_ORCA_DIR, "orca"), "probe.inp"], env=env, cwd=work, stdout=f, check=True)
+	f.close()
+	T_gen = time.perf_counter() - T_0
+	size = os.path.getsize(os.path.join(work, "probe.out")) / 1024**2
+	T, out = run_script("orca2xyz.py", ["-f", "probe.out"], env, work)
+	frames = int(re.search(r"frames: (\d+)", out).group(1))
+	res = []
+	res.append(("orca2xyz", "parse rate", size / T, "MB/sec."))
+	res.append(("orca2xyz", "frames", frames / T, "frames/sec."))
+	res.append(("orca2xyz", "size of output", size, "MB"))
+	res.append(("orca2xyz", "generation of output", size / T_gen, "MB/sec."))
+	return res
+
+# batch of molecules without run time of ORCA: the first run without cache,
+# the second run takes all jobs from cache
+def bench_batch(label, script, args, options, tmp_dir):
+	env = environment(tmp_dir)
+	work = os.path.join(tmp_dir, script)
+	os.makedirs(work, exist_ok=True)
+	jobs = []
+	for i in range(options.molecules):
+		name = "mol_%03d.xyz" % i
+		write_file(os.path.join(work, name), str(options.atoms) + "\nmol_%03d\n" % i + molecule(options.atoms, i) + "\n")
+		jobs.append(name)
+	log = os.path.join(tmp_dir, script + ".orca.log")
+	env["FAKE_ORCA_LOG"] = log
+	T_cold, out = run_script(script, ["--job"] + jobs + args, env, work)
+	f = open(log, "r")
+	n_orca = len(f.readlines())
+	f.close()
+	T_warm, out = run_script(script, ["--job"] + jobs + args, env, work)
+	res = []
+	res.append((label, "overhead per molecule", T_cold / options.molecules, "sec."))
+	res.append((label, "overhead per ORCA job", T_cold / max(1, n_orca), "sec."))
+	res.append((label, "cached rerun per molecule", T_warm / options.molecules, "sec."))
+	return res
+
+# the scripts are wrappers, the versions are in modules of package chemscripts
+MODULES = {"startorca.py": "startorca.py", "orca2xyz.py": "orca2xyz.py", "logP.py": "logp.py", "cosmo-rs.py": "cosmors_script.py", \
+	"free_energy_liquid.py": "free_energy.py"}
+
+def versions():
+	res = {}
+	for script, module in MODULES.items():
+		f = open(os.path.join(SCRIPTS_DIR, "chemscripts", module), "r")
+		match = re.search(r"^VERSION\s*=\s*\"?([\d.]+)\"?", f.read(), re.M)
+		f.close()
+		res[script] = match.group(1) if match else None
+	try:
+		res["git"] = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=SCRIPTS_DIR, stdout=subprocess.PIPE, \
+			stderr=subprocess.DEVNULL, universal_newlines=True).stdout.strip()
+	except OSError:
+		res["git"] = None
+	return res
+
+
+if __name__ == "__main__":
+	parser = args_parser()
+	namespace = parser.parse_args()
+
+	tmp_dir = tempfile.mkdtemp(prefix="chemscripts_bench_")
+	results = []
+	try:
+		for suite in namespace.suites:
+			print("Suite " + suite + " ...", flush=True)
+			suite_dir = os.path.join(tmp_dir, suite)
+			os.makedirs(suite_dir)
+			if suite == "startorca":
+				results += bench_startorca(namespace, suite_dir)
+			elif suite == "orca2xyz":
+				results += bench_orca2xyz(namespace, suite_dir)
+			elif suite == "logP":
+				results += bench_batch("logP-noopt", "logP.py", ["--noopt"], namespace, suite_dir)
+				results += bench_batch("logP-opt", "logP.py", [], namespace, suite_dir + "_opt")
+			elif suite == "cosmo-rs":
+				results += bench_batch("cosmo-rs", "cosmo-rs.py", ["--method", "BP86", "--solvents", "water", "1-octanol", "hexane"], namespace, suite_dir)
+	finally:
+		if namespace.keep == None:
+			shutil.rmtree(tmp_dir, ignore_errors=True)
+		else:
+			print("Temporary directory: " + tmp_dir)
+
+	# report
+	print("")
+	print("Suite".ljust(12, " "), "Metric".ljust(28, " "), "Value".rjust(12, " "), " Unit")
+	for suite, metric, value, unit in results:
+		print(suite.ljust(12, " "), metric.ljust(28, " "), ("%.4f" % value).rjust(12, " "), " " + unit)
+	if namespace.output != None:
+		record = {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "host": socket.gethostname(), "versions": versions(), \
+			"parameters": {"inputs": namespace.inputs, "jobs": namespace.jobs, "job_time": namespace.job_time, \
+			"size": namespace.size, "molecules": namespace.molecules, "atoms": namespace.atoms}, \
+			"results": list(map(lambda r: {"suite": r[0], "metric": r[1], "value": r[2], "unit": r[3]}, results))}
+		f = open(namespace.output, "a")
+		f.write(json.dumps(record) + "\n")
+		f.close()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+#  __init__.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Common code for scripts of the chemscripts set
+
+VERSION = "0.94"
+HISTORY = '''
+			0.1 -- start project, cache of ORCA results
+			0.2 -- scratch directories of runs are unique and removed atomically
+			0.3 -- journal of completed stages, database of results
+			0.4 -- timing of stages, pre-optimization, compound jobs, ORCA is run by asyncio runner
+			0.5 -- extraction of properties from outputs in one scan
+			0.6 -- failed ORCA jobs are stopped early and repeated with settings of retry ladder
+			0.7 -- calculations of scripts moved to modules of package (logp, cosmo_rs, free_energy, startorca, orca2xyz, chemresults), common settings in module common
+			0.8 -- reading of XYZ files with several structures, table logp_ensemble of database
+			0.9 -- geometric deduplication of structures of batch (module dedup)
+			0.91 -- fix: module cosmo_rs renamed to cosmors_script, dead imports removed
+			0.92 -- fix: stalled geometry optimization (energy is not lowered during CHEMSCRIPTS_STALL_CYCLES cycles) is a fatal event
+			0.93 -- fix: warning when surface file of solute is not written or not accepted by ORCA (SURFACE_EXT, SURFACE_KEYWORD of module cosmors)
+			0.94 -- fix: surface file of ORCA 6.1 (.solute.orcacosmo), ORCA 6.1 can not read surface of solute, without SURFACE_KEYWORD every solvent is calculated by full job
+'''
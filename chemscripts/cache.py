@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+#  cache.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Cache of ORCA results on disk. The key of job is hash of normalized input
+# text (without %pal line, so number of threads does not change the key),
+# path to ORCA and contents of files used by job (hessian, solvent files).
+# The output file and all files created by ORCA are stored for every job.
+
+import os, re, hashlib, shutil, tempfile
+from glob import glob
+
+# directory with cache and maximum size of cache (in GB), may be changed of user
+CACHE_DIR = os.environ.get("CHEMSCRIPTS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "chemscripts"))
+CACHE_SIZE = float(os.environ.get("CHEMSCRIPTS_CACHE_SIZE", "20"))
+
+# the cache is switched off when variable CHEMSCRIPTS_NOCACHE is set
+ENABLED = "CHEMSCRIPTS_NOCACHE" not in os.environ
+
+# name of files in cache entry, "job.out", "job.gbw" and so on
+ENTRY_NAME = "job"
+
+# regular expressions for normalization of input
+EXPRESSIONS = {}
+EXPRESSIONS["pal"] = re.compile(r"%pal\s+nprocs\s+\d+\s+end", re.I)
+EXPRESSIONS["space"] = re.compile(r"\s+")
+
+
+# input text without %pal directive, empty lines and extra spaces
+def normalize_input(input_data):
+	data = EXPRESSIONS["pal"].sub("", input_data)
+	lines = map(lambda s: EXPRESSIONS["space"].sub(" ", s).strip(), data.split("\n"))
+	return "\n".join(filter(lambda s: s != "", lines))
+
+# key of job in cache
+def job_key(input_data, orca, depends=()):
+	key = hashlib.sha256()
+	key.update(os.path.realpath(orca).encode())
+	key.update(b"\0")
+	key.update(normalize_input(input_data).encode())
+	for f in depends:
+		key.update(b"\0")
+		dep = open(f, "rb")
+		for block in iter(lambda: dep.read(1 << 20), b""):
+			key.update(block)
+		dep.close()
+	return key.hexdigest()
+
+def entry_dir(key):
+	return os.path.join(CACHE_DIR, key[:2], key)
+
+# copy files of job from cache to working directory, return name of output
+# file or None if job is absent in cache
+def lookup(key, work_dir, basename):
+	entry = entry_dir(key)
+	if not os.path.isdir(entry):
+		return None
+	output_filename = os.path.join(work_dir, basename + ".out")
+	try:
+		for f in os.listdir(entry):
+			shutil.copy(os.path.join(entry, f), os.path.join(work_dir, basename + f[len(ENTRY_NAME):]))
+		os.utime(entry)
+	except OSError:
+		# entry was removed by other process
+		return None
+	if not os.path.isfile(output_filename):
+		return None
+	return output_filename
+
+# save files of finished job to cache, only normally terminated jobs are saved
+def store(key, work_dir, basename):
+	output_filename = os.path.join(work_dir, basename + ".out")
+	f = open(output_filename, "r")
+	terminated = "ORCA TERMINATED NORMALLY" in f.read()
+	f.close()
+	if not terminated or os.path.isdir(entry_dir(key)):
+		return
+	os.makedirs(os.path.dirname(entry_dir(key)), exist_ok=True)
+	tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir(key)))
+	for f in glob(os.path.join(work_dir, basename + "*")):
+		suffix = os.path.basename(f)[len(basename):]
+		if suffix == ".inp" or "tmp" in suffix or not os.path.isfile(f):
+			continue
+		shutil.copy(f, os.path.join(tmp_dir, ENTRY_NAME + suffix))
+	try:
+		os.rename(tmp_dir, entry_dir(key))
+	except OSError:
+		# the same job was saved by other process
+		shutil.rmtree(tmp_dir, ignore_errors=True)
+	evict()
+
+def entry_size(entry):
+	return sum(map(lambda f: os.path.getsize(os.path.join(entry, f)), os.listdir(entry)))
+
+# remove least recently used entries while size of cache is more than CACHE_SIZE
+def evict(max_size=None):
+	if max_size == None:
+		max_size = CACHE_SIZE
+	entries = []
+	for entry in glob(os.path.join(CACHE_DIR, "??", "*")):
+		try:
+			entries.append([os.path.getmtime(entry), entry_size(entry), entry])
+		except OSError:
+			pass
+	total = sum(map(lambda e: e[1], entries))
+	for mtime, size, entry in sorted(entries):
+		if total <= max_size * 1024**3:
+			break
+		shutil.rmtree(entry, ignore_errors=True)
+		total -= size
+
+# remove all entries
+def clear():
+	evict(0)
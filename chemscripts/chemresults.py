@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  chemresults.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+import sys, argparse, time, csv, json
+
+from chemscripts import results
+
+VERSION = "0.12"
+HISTORY = '''
+			0.1 -- start project, query and export of database of results
+			0.11 -- query moved to module chemscripts.chemresults, the script is a wrapper
+			0.12 -- table logp_ensemble
+'''
+
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser(description = 'query and export of database of results of scripts')
+	parser.add_argument ("command", choices = ["tables", "query", "export"], help = 'list of tables, print of rows or export of rows to file')
+	parser.add_argument ("table", nargs='?', choices = list(results.TABLES), help = 'table: logp, logp_ensemble, cosmors or free_energy')
+	parser.add_argument ("--db", metavar="FILE", type=str, default=None, help = 'database of results, default ' + results.DB_FILE)
+	parser.add_argument ("--molecule", nargs='+', help = 'names of molecules, wildcards * and ? are allowed')
+	parser.add_argument ("--method", nargs='+', help = 'methods')
+	parser.add_argument ("--solvent", nargs='+', help = 'solvents (table cosmors)')
+	parser.add_argument ("-w", "--where", metavar="COLUMN=VALUE", nargs='+', default=[], help = 'other conditions for columns')
+	parser.add_argument ("-o", "--output", metavar="FILE", help = 'file for export, CSV or JSON format by extension')
+	parser.add_argument ("-v", "--version", action="version", version=VERSION, help = 'print version')
+	return parser
+
+# conditions for rows from command line
+def filters(namespace):
+	res = {}
+	for col in ["molecule", "method", "solvent"]:
+		if getattr(namespace, col) != None:
+			res[col] = getattr(namespace, col)
+	for cond in namespace.where:
+		col, sep, value = cond.partition("=")
+		if sep == "":
+			raise ValueError("condition must be COLUMN=VALUE: " + cond)
+		res.setdefault(col, []).append(value)
+	return res
+
+def str_value(value):
+	if value == None:
+		return ""
+	if isinstance(value, float):
+		return "%.8f" % value
+	return str(value)
+
+# print rows as table with aligned columns
+def print_rows(columns, rows):
+	lines = [columns] + list(map(lambda row: list(map(lambda c: str_value(row[c]), columns)), rows))
+	widths = list(map(lambda i: max(map(lambda line: len(line[i]), lines)), range(len(columns))))
+	for line in lines:
+		print("  ".join(map(lambda i: line[i].ljust(widths[i], " "), range(len(columns)))))
+
+def write_rows(filename, columns, rows):
+	f = open(filename, "w", newline="")
+	if filename.lower().endswith(".json"):
+		json.dump(rows, f, indent=1)
+	else:
+		writer = csv.DictWriter(f, fieldnames=columns)
+		writer.writeheader()
+		writer.writerows(rows)
+	f.close()
+
+
+def main(argv=None):
+	parser = args_parser()
+	namespace = parser.parse_args(argv)
+	if namespace.command != "tables" and namespace.table == None:
+		parser.error("table is required for command " + namespace.command)
+	if namespace.command == "export" and namespace.output == None:
+		parser.error("option -o is required for command export")
+
+	T_0 = time.time()
+	db = results.open_db(namespace.db)
+	if namespace.command == "tables":
+		for table in results.TABLES:
+			n_rows = db["conn"].execute("SELECT COUNT(*) FROM " + table).fetchone()[0]
+			print(table.ljust(15, " "), str(n_rows).rjust(10, " "), " rows,  columns: " + ", ".join(results.columns(table)))
+		results.close_db(db)
+		return 0
+
+	try:
+		rows = results.query(db, namespace.table, filters(namespace))
+	except KeyError as e:
+		print("Unknown column " + str(e) + " in table " + namespace.table)
+		return 1
+	except ValueError as e:
+		print(e)
+		return 1
+	results.close_db(db)
+	columns = results.columns(namespace.table)
+	if namespace.command == "query":
+		print_rows(columns, rows)
+	else:
+		write_rows(namespace.output, columns, rows)
+	print("Rows: " + str(len(rows)) + ", time: " + "%.3f" % (time.time() - T_0) + " sec.", file=sys.stderr)
+	return 0
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  common.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Settings and small functions shared by all scripts: directories, the %pal
+# line of ORCA input, reading of XYZ files and lists of names.
+
+import os
+
+# working directories, may be changed of user or by environment variables
+# CHEMSCRIPTS_WORK_DIR and CHEMSCRIPTS_ORCA_DIR
+WORK_DIR = os.environ.get("CHEMSCRIPTS_WORK_DIR", "/mnt/scratch/orca/")
+ORCA_DIR = os.environ.get("CHEMSCRIPTS_ORCA_DIR", "/mnt/programs/orca6/")
+ORCA = os.path.join(ORCA_DIR, "orca")
+
+
+def par_str(nproc):
+	return '''%pal nprocs ''' + str(nproc) + ''' end\n'''
+
+# read number of atoms, name (comment line) and coordinates from XYZ file
+def read_xyz_coord(file_xyz):
+	XYZ_file = open(file_xyz, "r")
+	XYZ_data = XYZ_file.read()
+	XYZ_file.close()
+	data = XYZ_data.split("\n")
+	N_atoms = int(data[0])
+	job_name = data[1].lstrip() if len(data) > 1 else ""
+	XYZ_coords = "\n".join(data[2:2 + N_atoms])
+	return N_atoms, job_name, XYZ_coords
+
+# all frames of XYZ file with several structures one after another (for
+# example, conformers), list of (number of atoms, name, coordinates)
+def read_xyz_frames(file_xyz):
+	XYZ_file = open(file_xyz, "r")
+	data = XYZ_file.read().split("\n")
+	XYZ_file.close()
+	frames = []
+	i = 0
+	while i < len(data) and data[i].strip() != "":
+		N_atoms = int(data[i])
+		job_name = data[i + 1].lstrip() if i + 1 < len(data) else ""
+		frames.append((N_atoms, job_name, "\n".join(data[i + 2:i + 2 + N_atoms])))
+		i += 2 + N_atoms
+	return frames
+
+# list of names from file, one per line, empty lines and comments (#) are skipped
+def read_list(filename):
+	f = open(filename, "r")
+	res = list(filter(lambda s: s != "" and not s.startswith("#"), map(lambda s: s.strip(), f.read().split("\n"))))
+	f.close()
+	return res
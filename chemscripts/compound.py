@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+#  compound.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Several stages of calculation of one molecule in one ORCA process (%Compound
+# job): startup of ORCA, setup of integrals and MPI are done once, and every
+# step starts from the geometry and orbitals of the previous step, unless a new
+# geometry is given in the step (block_coords). The output
+# of compound job is split to steps, which are parsed as outputs of separate jobs.
+
+import re
+
+from chemscripts.common import par_str
+
+# header of step in output of compound job (also for progress of jobs in
+# runner), the number of step is group 1;
+# it may be changed for your version of ORCA
+EXPRESSIONS = {}
+EXPRESSIONS["step"] = re.compile(r"^.*COMPOUND.*?STEP\s*:?\s*(\d+)", re.I | re.M)
+
+
+# block of coordinates; the step with it in text starts from this geometry
+# instead of the geometry of the previous step
+def block_coords(coords, charge="0", multiplicity="1"):
+	return '''* xyz ''' + str(charge) + ''' ''' + str(multiplicity) + '''\n''' + coords + '''\n*\n'''
+
+# input of compound job, steps - list of texts of steps (keywords and blocks),
+# the coordinates are given for the first step
+def job_compound(coords, steps, nproc, charge="0", multiplicity="1"):
+	res = par_str(nproc) + block_coords(coords, charge, multiplicity) + '''%Compound\n'''
+	for step in steps:
+		res += '''New_Step\n''' + step.strip("\n") + '''\nStep_End\n'''
+	return res + '''end\n'''
+
+# output of compound job split to n_steps parts, the part of step which
+# is not found in output (ORCA failed before it) is empty
+def split_steps(data, n_steps):
+	starts = {}
+	for match in EXPRESSIONS["step"].finditer(data):
+		step = int(match.group(1))
+		if step not in starts:
+			starts[step] = match.start()
+	res = []
+	for step in range(1, n_steps + 1):
+		if step not in starts:
+			res.append("")
+			continue
+		end = min([s for s in starts.values() if s > starts[step]] + [len(data)])
+		res.append(data[starts[step]:end])
+	return res
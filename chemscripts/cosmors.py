@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+#  cosmors.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# COSMO-RS calculations for one solute and several solvents. If the version
+# of ORCA can read the sigma surface of solute (SURFACE_KEYWORD), the
+# expensive DFT part is done only in the first ORCA job, the surface file
+# written by ORCA is kept and the other solvents are calculated from it. If
+# ORCA does not write the surface file or can not read it, a warning is
+# printed and every solvent is calculated by full job.
+
+import os
+
+from chemscripts.runner import run_orca, job_directory
+from chemscripts import timing
+from chemscripts.common import par_str
+from chemscripts.extract import extract
+
+# extension of surface file of solute written by ORCA 6.1 (BASENAME.solute.orcacosmo,
+# see notebook docs/contents/notebooks/opencosmors.ipynb of ORCA Python
+# Interface 2.0.0); keyword of %cosmors block for reading of solute surface:
+# ORCA 6.1 has none (the keywords of block are in BlockCosmors of
+# opi/input/blocks/block_cosmors.py of ORCA Python Interface 2.0.0), so it is
+# None and every solvent is calculated by full job; it may be set for version
+# of ORCA which reads the surface, then it is checked by the first jobs of
+# every molecule (see evaluate_solvents)
+SURFACE_EXT = ".solute.orcacosmo"
+SURFACE_KEYWORD = None
+
+
+# solvent is name of solvent from ORCA table or solvent file
+def is_solventfile(solvent):
+	return os.path.isfile(solvent)
+
+def solvent_str(solvent):
+	if is_solventfile(solvent):
+		return '''	solventfilename "''' + os.path.splitext(os.path.abspath(solvent))[0] + '''"\n'''
+	return '''	solvent "''' + solvent + '''"\n'''
+
+# block of COSMO-RS job (or step of compound job); dftfunc - functional for
+# sigma surface, options - additional line for ORCA input, surface - name of
+# file with surface of solute (without extension)
+def block_CRS(solvent, dftfunc=None, options="", surface=None):
+	par = '''%cosmors\n''' + solvent_str(solvent)
+	if dftfunc != None:
+		par += '''	dftfunc "''' + dftfunc + '''"\n'''
+	if surface != None:
+		par += '''	''' + SURFACE_KEYWORD + ''' "''' + surface + '''"\n'''
+	par += '''end\n'''
+	if options != "":
+		par += options + '''\n'''
+	return par
+
+# template of COSMO-RS job
+def job_CRS(coords, solvent, nproc, charge="0", multiplicity="1", dftfunc=None, options="", surface=None):
+	par = block_CRS(solvent, dftfunc, options, surface)
+	return par_str(nproc) + par + '''* xyz ''' + str(charge) + ''' ''' + str(multiplicity) + ''' \n''' + coords + '''\n*'''
+
+# files used by COSMO-RS job, they are used for key of cache
+def job_depends(solvent, surface_file=None):
+	depends = []
+	if is_solventfile(solvent):
+		depends.append(solvent)
+	if surface_file != None:
+		depends.append(surface_file)
+	return depends
+
+# free energy of solvation (Hartree) from output of job, None if it is absent
+def read_G_solv(data):
+	try:
+		return extract(data, last=["G_solv"], optional=["G_solv"])["G_solv"]
+	except ValueError:
+		return None
+
+# COSMO-RS calculation of solute for list of solvents (names or solvent files);
+# returns dictionary: solvent -> (free energy of solvation or None, output of ORCA);
+# without SURFACE_KEYWORD every solvent is calculated by full job; if the
+# surface file is not written or not accepted by ORCA (SURFACE_EXT and
+# SURFACE_KEYWORD do not fit the version of ORCA), a warning is printed once
+# and the other solvents are calculated by full jobs
+def evaluate_solvents(orca, coords, solvents, nproc, work_dir, use_cache=True, **kwargs):
+	res = {}
+	with job_directory("active_job_cosmo-rs", work_dir) as job_dir:
+		surface = None
+		use_surface = len(solvents) > 1 and SURFACE_KEYWORD != None
+		surface_file = os.path.join(job_dir, "surface" + SURFACE_EXT)
+		for solvent in solvents:
+			if surface != None:
+				with timing.stage("input", name="CRS-" + solvent):
+					input_data = job_CRS(coords, solvent, nproc, surface=surface, **kwargs)
+				data = run_orca(orca, input_data, "solvent", job_dir, use_cache, job_depends(solvent, surface_file))
+				with timing.stage("parse", name="CRS-" + solvent):
+					G_solv = read_G_solv(data)
+				if G_solv != None:
+					res[solvent] = (G_solv, data)
+					continue
+				print("Warning, surface of solute is not accepted by ORCA with keyword " + SURFACE_KEYWORD + \
+					" (SURFACE_KEYWORD of chemscripts/cosmors.py), full COSMO-RS jobs from solvent " + solvent)
+				surface = None
+				use_surface = False
+			with timing.stage("input", name="CRS-" + solvent):
+				input_data = job_CRS(coords, solvent, nproc, **kwargs)
+			data = run_orca(orca, input_data, "surface", job_dir, use_cache, job_depends(solvent))
+			with timing.stage("parse", name="CRS-" + solvent):
+				res[solvent] = (read_G_solv(data), data)
+			if not use_surface:
+				continue
+			if os.path.isfile(surface_file):
+				surface = "surface"
+			elif res[solvent][0] != None:
+				print("Warning, surface file of solute surface" + SURFACE_EXT + " is not written by ORCA (SURFACE_EXT of chemscripts/cosmors.py), " + \
+					"full COSMO-RS jobs for all solvents")
+				use_surface = False
+	return res
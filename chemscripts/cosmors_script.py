@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  cosmors_script.py
+#  
+#  Copyright 2023 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Free energies in gas and of solvation by COSMO-RS for list of solvents, the
+# calculations of script cosmo-rs.py. The calculation of one molecule is done
+# by calculate(job, options), options - dictionary made by make_options()
+# with the same parameters as options of command line:
+#
+#	options = cosmors_script.make_options(method="r2SCAN-3c", solvents=["water", "hexane"])
+#	res = cosmors_script.calculate("mol.xyz", options)
+#	print(res["G_gas"], res["G_solv"])
+
+import os, argparse, time, csv
+
+from chemscripts.runner import run_orca, run_directory, job_directory
+from chemscripts.cosmors import evaluate_solvents, block_CRS, job_CRS, job_depends, read_G_solv
+from chemscripts import common, compound, dedup, journal, preopt, results, timing
+from chemscripts.common import par_str, read_xyz_coord, read_list
+from chemscripts.extract import extract, MissingPropertyError
+
+VERSION = "0.35"
+HISTORY = '''
+			0.01 -- start project
+			0.1 -- added choice method for optimisation
+			0.11 -- added support geometry file for solvent
+			0.12 -- added multithreading + fix minor bugs
+			0.13 -- added the option to skip calculation in vacuum
+			0.14 -- added cache of ORCA results
+			0.15 -- COSMO-RS job moved to common module
+			0.2 -- added screening of list of solvents, output of matrix molecule x solvent
+			0.21 -- unique scratch directory for every run, several runs can share WORK_DIR
+			0.22 -- journal of completed stages, resuming of interrupted batch
+			0.23 -- results are saved to database
+			0.24 -- timing of stages
+			0.25 -- directories may be set by environment variables (CHEMSCRIPTS_WORK_DIR, CHEMSCRIPTS_ORCA_DIR)
+			0.26 -- option --preopt: pre-optimization by GFN2-xTB before DFT optimization
+			0.27 -- option --compound: all stages of molecule in one ORCA process
+			0.28 -- energies are read from the tail of output file (module extract)
+			0.29 -- failed ORCA jobs are stopped early and repeated with other settings
+			0.30 -- calculations moved to module chemscripts.cosmo_rs, the script is a wrapper
+			0.31 -- option --dedup: the same structures of batch (rotated, translated) are calculated once
+			0.32 -- fix: module renamed to chemscripts.cosmors_script (not confused with chemscripts.cosmors), shared par_str of common
+			0.33 -- fix: with --compound COSMO-RS is calculated for input geometry, as without --compound
+			0.34 -- fix: journal is locked by the run, the second run with the same journal fails at start and does not truncate it
+			0.35 -- fix: column job of matrix (--matrix) contains the XYZ file of job, as in database, not the name of molecule
+'''
+
+FREQ_STR = '''! freq KDIIS DAMP SOSCF LSHIFT rijcosx\n'''
+
+# options of calculation, names as options of command line: solvent -
+# solvent of optimization (SMD), solvents - solvents of COSMO-RS (names or
+# solvent files, default [solvent]); novacuum, opt, compound - True/False,
+# preopt - method of pre-optimization or None; input_dir - directory of
+# solvent files (default current directory), orca - path to ORCA, work_dir -
+# scratch directory (created at first job if None), journal - journal of
+# stages (journal.open_journal) or None
+DEFAULTS = {}
+DEFAULTS["method"] = None
+DEFAULTS["nproc"] = 1
+DEFAULTS["charge"] = 0
+DEFAULTS["solvent"] = "water"
+DEFAULTS["solvents"] = None
+DEFAULTS["novacuum"] = False
+DEFAULTS["opt"] = False
+DEFAULTS["preopt"] = None
+DEFAULTS["compound"] = False
+DEFAULTS["use_cache"] = True
+DEFAULTS["input_dir"] = None
+DEFAULTS["orca"] = common.ORCA
+DEFAULTS["work_dir"] = None
+DEFAULTS["journal"] = None
+
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser()
+	parser.add_argument ("--job", metavar="FILE", nargs='+', required=True, help = 'jobname for files with coordinates data (XYZ format)')
+	parser.add_argument ("--method", type=str, required=True, help = 'method for calculated properties in vacuum and geometry optimization')
+	parser.add_argument ("--solventfile", metavar="FILE", help = 'solvent file for calculate free energy')
+	parser.add_argument ("--solvent", type=str, default="water", help = 'solvent name for calculate free energy')
+	parser.add_argument ("--solvents", metavar="SOLVENT", nargs='+', help = 'list of solvent names or solvent files for screening, replaces --solvent and --solventfile for COSMO-RS')
+	parser.add_argument ("--solventlist", metavar="FILE", help = 'file with list of solvent names or solvent files, one per line')
+	parser.add_argument ("--matrix", metavar="FILE", help = 'CSV file for matrix molecule x solvent of free energies of solvation and total free energies')
+	parser.add_argument ("-n", "--nthreads", type=int, default=1, help = 'number of CPUs')
+	parser.add_argument ("-v", "--version", action="version", version=VERSION, help = 'print version')
+	parser.add_argument ("-c", "--charge", type=int, default=0, help = 'charge of system')
+	parser.add_argument ("--novacuum", help = 'to skip calculation in vacuum', nargs='*')
+	parser.add_argument ("--opt", help = 'optimization geometry with use SMD and solvent from option "--solvent"', nargs='*')
+	parser.add_argument ("--preopt", metavar="METHOD", nargs='?', const=preopt.METHOD, help = 'with --opt, pre-optimization by semi-empirical method with ALPB solvation, default method ' + preopt.METHOD)
+	parser.add_argument ("--compound", help = 'run all stages of molecule in one ORCA process (%%Compound job)', nargs='*')
+	parser.add_argument ("--dedup", metavar="RMSD", type=float, nargs='?', const=dedup.RMSD, help = 'the same structures (RMSD after superposition below RMSD, default ' + str(dedup.RMSD) + ' A) are calculated once')
+	parser.add_argument ("--nocache", help = 'do not use cache of ORCA results', nargs='*')
+	parser.add_argument ("--journal", metavar="FILE", type=str, default="cosmo-rs_journal.jsonl", help = 'journal of completed stages of jobs')
+	parser.add_argument ("--resume", help = 'skip stages completed in journal by previous run', nargs='*')
+	parser.add_argument ("--db", metavar="FILE", type=str, default=None, help = 'database of results, default ' + results.DB_FILE)
+	parser.add_argument ("--timing", metavar="FILE", type=str, help = 'file for timing of stages of jobs (JSON lines)')
+	parser.add_argument ("--timing-summary", help = 'print summary table of timing of stages', nargs='*')
+	return parser
+
+# options of calculation from DEFAULTS and given values
+def make_options(**kwargs):
+	options = dict(DEFAULTS)
+	for key, value in kwargs.items():
+		if key not in DEFAULTS:
+			raise KeyError("unknown option " + key)
+		options[key] = value
+	if options["method"] == None:
+		raise ValueError("method is required")
+	if options["solvents"] == None:
+		options["solvents"] = [options["solvent"]]
+	if options["input_dir"] == None:
+		options["input_dir"] = os.getcwd()
+	return options
+
+# unique scratch directory of this run, removed at exit
+def run_dir(options):
+	if options["work_dir"] == None:
+		options["work_dir"] = run_directory("cosmo-rs", common.WORK_DIR)
+	return options["work_dir"]
+
+# solvents for COSMO-RS, solvent files are given relative to input directory
+def solvents_crs(options):
+	return list(map(lambda s: options["input_dir"] + "/" + s if os.path.isfile(os.path.join(options["input_dir"], s)) else s, options["solvents"]))
+
+
+def smd_str(options):
+	return '''%cpcm
+	smd true
+	SMDsolvent "''' + options["solvent"] + '''"
+	surfacetype vdw_gaussian
+end\n'''
+
+# templates from job
+def job_vac(coords, options):
+	METHOD = options["method"]
+	CHARGE = str(options["charge"])
+	if options["novacuum"] and options["opt"]:
+		res = par_str(options["nproc"]) + ''' ! opt ''' + METHOD + '''\n''' + smd_str(options) + '''* xyz ''' + CHARGE + ''' 1 \n''' + coords + '''\n*'''
+	elif not options["novacuum"] and options["opt"]:
+		res = par_str(options["nproc"]) + '''* xyz ''' + CHARGE + ''' 1 \n''' + coords + '''\n*''' + '''
+%Compound
+New_Step
+! opt ''' + METHOD + '''\n''' + smd_str(options) + '''
+STEP_END
+
+New_Step
+! ''' + METHOD + '''\n''' + FREQ_STR + '''
+STEP_END
+
+end
+'''
+	elif not options["novacuum"] and not options["opt"]:
+		res = par_str(options["nproc"]) + ''' ! ''' + METHOD + '''\n''' + FREQ_STR + '''* xyz ''' + CHARGE + ''' 1 \n''' + coords + '''\n*'''
+	else:
+		res = '''! NOITER
+* xyz ''' + CHARGE + ''' 1 \n''' + coords + '''\n*'''
+	return res
+
+# all stages of molecule in one ORCA process (option compound): pre-optimization,
+# optimization, frequencies in vacuum and COSMO-RS for every solvent, every
+# step starts from the geometry and orbitals of previous step, except the
+# first COSMO-RS step: as in separate jobs, COSMO-RS is done for the input
+# geometry, which is given again; the output is split to steps, which are
+# parsed as outputs of separate jobs; returns free energy in gas, electronic
+# energy and dictionary solvent -> free energy of solvation
+def compound_job(job, coords, options):
+	METHOD = options["method"]
+	steps = []
+	if options["opt"] and options["preopt"] != None:
+		steps.append(("preopt", preopt.block_preopt(options["solvent"], options["preopt"])))
+	if options["opt"]:
+		steps.append(("opt", '''! opt ''' + METHOD + '''\n''' + smd_str(options)))
+	if not options["novacuum"]:
+		steps.append(("vacuum", '''! ''' + METHOD + '''\n''' + FREQ_STR))
+	depends = []
+	for solvent, solvent_crs in zip(options["solvents"], solvents_crs(options)):
+		block = block_CRS(solvent_crs)
+		if steps and not any(map(lambda s: s[0].startswith("CRS-"), steps)):
+			block += compound.block_coords(coords, options["charge"])
+		steps.append(("CRS-" + solvent, block))
+		depends += job_depends(solvent_crs)
+	with timing.stage("input", name="compound"):
+		input_data = compound.job_compound(coords, [s[1] for s in steps], options["nproc"], str(options["charge"]))
+	key = journal.stage_key(input_data, options["orca"], depends)
+	stage = journal.get_stage(options["journal"], job, "compound", key)
+	if stage == None:
+		with job_directory("active_job", run_dir(options)) as job_dir:
+			data = run_orca(options["orca"], input_data, "compound", job_dir, options["use_cache"], depends)
+		with timing.stage("parse", name="compound"):
+			stage = {"G_gas": None, "E_el": None, "G_solv": {}}
+			for (name, step), part in zip(steps, compound.split_steps(data, len(steps))):
+				if name == "vacuum":
+					stage.update(extract(part, last=["G_gas", "E_el"], optional=["G_gas", "E_el"]))
+				elif name.startswith("CRS-"):
+					stage["G_solv"][name[4:]] = read_G_solv(part)
+		if None not in stage["G_solv"].values() and (options["novacuum"] or stage["G_gas"] != None):
+			journal.record_stage(options["journal"], job, "compound", stage, key)
+	return stage["G_gas"], stage["E_el"], dict(stage["G_solv"])
+
+# pre-optimization, calculation in vacuum and optimization, they are done once
+# for all solvents, the stages completed in journal are skipped; returns free
+# energy in gas and electronic energy (None if they are not calculated) and
+# wall times of pre-optimization and optimization
+def vacuum_job(job, coords, options):
+	ORCA = options["orca"]
+	JOURNAL = options["journal"]
+	times = {}
+	COORDS_OPT = coords
+	if options["opt"] and options["preopt"] != None:
+		T_TIER = timing.clock()
+		with timing.stage("input", name="preopt"):
+			INPUT_PREOPT = preopt.job_preopt(coords, options["solvent"], options["nproc"], str(options["charge"]), 1, options["preopt"])
+		KEY = journal.stage_key(INPUT_PREOPT, ORCA)
+		STAGE = journal.get_stage(JOURNAL, job, "preopt", KEY)
+		if STAGE == None:
+			with job_directory("preopt", run_dir(options)) as job_dir:
+				DATA_RES = run_orca(ORCA, INPUT_PREOPT, "preopt", job_dir, options["use_cache"])
+			with timing.stage("parse", name="preopt"):
+				STAGE = {"XYZ": preopt.read_xyz(DATA_RES)}
+			if STAGE["XYZ"] != None:
+				journal.record_stage(JOURNAL, job, "preopt", STAGE, KEY)
+		if STAGE["XYZ"] != None:
+			COORDS_OPT = STAGE["XYZ"]
+		else:
+			print("Warning, pre-optimization failed, optimization is started from original geometry")
+		timing.record_since("preopt", T_TIER)
+		times["preopt"] = time.perf_counter() - T_TIER[0]
+	T_TIER = timing.clock()
+	with timing.stage("input", name="vacuum"):
+		INPUT_VAC = job_vac(COORDS_OPT, options)
+	KEY = journal.stage_key(INPUT_VAC, ORCA)
+	STAGE = journal.get_stage(JOURNAL, job, "vacuum", KEY)
+	if STAGE == None:
+		# the energies are read from the tail of output file
+		with job_directory("active_job", run_dir(options)) as job_dir:
+			try:
+				if not options["novacuum"]:
+					STAGE = run_orca(ORCA, INPUT_VAC, "active_job", job_dir, options["use_cache"], properties={"last": ["G_gas", "E_el"]})
+				else:
+					run_orca(ORCA, INPUT_VAC, "active_job", job_dir, options["use_cache"])
+					STAGE = {"G_gas": None, "E_el": None}
+				journal.record_stage(JOURNAL, job, "vacuum", STAGE, KEY)
+			except MissingPropertyError as e:
+				print("Error, calculation in vacuum failed: " + str(e))
+				STAGE = {"G_gas": None, "E_el": None}
+	if options["opt"]:
+		timing.record_since("opt", T_TIER)
+		times["opt"] = time.perf_counter() - T_TIER[0]
+	return STAGE["G_gas"], STAGE["E_el"], times
+
+# COSMO-RS for all solvents absent in journal, the surface of solute may be
+# calculated once (see cosmors.evaluate_solvents); returns dictionary solvent -> free energy of solvation
+def solvation_jobs(job, coords, options):
+	KEYS = {}
+	G_SOLV = {}
+	for solvent, solvent_crs in zip(options["solvents"], solvents_crs(options)):
+		KEYS[solvent] = journal.stage_key(job_CRS(coords, solvent_crs, options["nproc"], charge=str(options["charge"])), options["orca"], \
+			job_depends(solvent_crs))
+		STAGE = journal.get_stage(options["journal"], job, "CRS-" + solvent, KEYS[solvent])
+		if STAGE != None:
+			G_SOLV[solvent] = STAGE["G_solv"]
+	MISSING = list(filter(lambda s: s[0] not in G_SOLV, zip(options["solvents"], solvents_crs(options))))
+	if MISSING:
+		RES_CRS = evaluate_solvents(options["orca"], coords, list(map(lambda s: s[1], MISSING)), options["nproc"], run_dir(options), \
+			options["use_cache"], charge=str(options["charge"]))
+		for solvent, solvent_crs in MISSING:
+			G_SOLV[solvent] = RES_CRS[solvent_crs][0]
+			if G_SOLV[solvent] != None:
+				journal.record_stage(options["journal"], job, "CRS-" + solvent, {"G_solv": G_SOLV[solvent]}, KEYS[solvent])
+	return G_SOLV
+
+# calculation for molecule from XYZ file job; returns dictionary: job,
+# molecule (name from XYZ file), free energy in gas and electronic energy
+# (None if they are not calculated), free energies of solvation and total
+# free energies (lists in order of solvents), wall times of optimization
+# stages and rows for database (table cosmors)
+def calculate(job, options):
+	T_JOB = timing.clock()
+	timing.set_labels(job=job)
+	N_atoms, job_name, coords = read_xyz_coord(job)
+	if job_name == "":
+		job_name = job
+	times = {}
+	if options["compound"]:
+		G_gas, E_el, G_SOLV = compound_job(job, coords, options)
+	else:
+		G_gas, E_el, times = vacuum_job(job, coords, options)
+		G_SOLV = solvation_jobs(job, coords, options)
+	G_SOLV = list(map(lambda s: G_SOLV[s], options["solvents"]))
+	G_TOTAL = list(map(lambda g: G_gas + g if G_gas != None and g != None else None, G_SOLV))
+	ROWS = []
+	for solvent, G_solv, G_total in zip(options["solvents"], G_SOLV, G_TOTAL):
+		ROWS.append({"molecule": job_name, "job": job, "method": options["method"], "solvent": solvent, "charge": options["charge"], \
+			"optimized": int(options["opt"]), "G_gas": G_gas, "E_el": E_el, "dG_solv": G_solv, "G_total": G_total})
+	timing.record_since("job", T_JOB)
+	return {"job": job, "molecule": job_name, "G_gas": G_gas, "E_el": E_el, "G_solv": G_SOLV, "G_total": G_TOTAL, "time": times, "rows": ROWS}
+
+
+def main(argv=None):
+	T_0 = time.time()
+	T_00 = T_0
+	parser = args_parser()
+	namespace = parser.parse_args(argv)
+
+	# solvents for COSMO-RS, names or solvent files
+	if namespace.solvents != None or namespace.solventlist != None:
+		SOLVENTS = []
+		if namespace.solvents != None:
+			SOLVENTS += namespace.solvents
+		if namespace.solventlist != None:
+			SOLVENTS += read_list(namespace.solventlist)
+	elif namespace.solventfile:
+		SOLVENTS = [namespace.solventfile]
+	else:
+		SOLVENTS = [namespace.solvent]
+
+	# read parameters from command-line arguments
+	options = make_options(method=namespace.method, nproc=namespace.nthreads, charge=namespace.charge, solvent=namespace.solvent, \
+		solvents=SOLVENTS, novacuum=namespace.novacuum != None, opt=namespace.opt != None, preopt=namespace.preopt, \
+		compound=namespace.compound != None, use_cache=namespace.nocache == None)
+	try:
+		options["journal"] = journal.open_journal(namespace.journal, namespace.resume != None)
+	except journal.JournalLockedError as e:
+		print("Error, " + str(e))
+		return 1
+	RESULTS = results.open_db(namespace.db)
+	if namespace.timing != None or namespace.timing_summary != None:
+		timing.setup(namespace.timing)
+	run_dir(options)
+
+	# file with matrix of results, one row for job (XYZ file), as in database
+	if namespace.matrix != None:
+		MATRIX_FILE = open(namespace.matrix, "w", newline="")
+		MATRIX = csv.writer(MATRIX_FILE)
+		MATRIX.writerow(["job", "G_gas", "E_el"] + list(map(lambda s: "dGsolv:" + s, SOLVENTS)) + list(map(lambda s: "G:" + s, SOLVENTS)))
+
+	# the same structures of batch are calculated once, the results of the
+	# first one are used for others
+	duplicates = {}
+	if namespace.dedup != None:
+		os.chdir(options["input_dir"])
+		duplicates = dedup.find_duplicates(list(map(lambda job: (read_xyz_coord(job)[2], None), namespace.job)), namespace.dedup)
+	uniques = set(map(lambda d: d[0], duplicates.values()))
+	computed = {}
+
+	# start of job and processing of results
+	for num, job in enumerate(namespace.job):
+		print("Job = " + job)
+		os.chdir(options["input_dir"])
+		if num in duplicates:
+			unique, r = duplicates[num]
+			job_name = read_xyz_coord(job)[1]
+			print(dedup.duplicate_str(job, namespace.job[unique], r))
+			res = dict(dedup.fan_out(computed[unique], job, job_name if job_name != "" else job), time={})
+		else:
+			res = calculate(job, options)
+			if num in uniques:
+				computed[num] = res
+		if "preopt" in res["time"]:
+			print("Pre-optimization time  : ", "%.3f" % res["time"]["preopt"], " sec. (" + options["preopt"] + ")")
+		if "opt" in res["time"] and options["preopt"] != None:
+			print("Optimization time      : ", "%.3f" % res["time"]["opt"], " sec. (" + options["method"] + ")")
+		if not options["novacuum"] and res["G_gas"] == None:
+			print("Free energy in gas     :  error in ORCA job")
+		elif not options["novacuum"]:
+			print("Free energy in gas     : ", "%f" % res["G_gas"], " Hartree")
+			print("Electronic energy      : ", "%f" % res["E_el"], " Hartree")
+		for solvent, G_solv in zip(SOLVENTS, res["G_solv"]):
+			if len(SOLVENTS) > 1:
+				print("Solvent                : ", solvent)
+			if G_solv == None:
+				print("Free energy solvalation:  error in COSMO-RS job")
+				continue
+			print("Free energy solvalation: ", "%f" % G_solv, " Hartree")
+		results.add_rows(RESULTS, "cosmors", res["rows"])
+		if namespace.matrix != None:
+			MATRIX.writerow([res["job"], res["G_gas"], res["E_el"]] + res["G_solv"] + res["G_total"])
+			MATRIX_FILE.flush()
+		print("Job execution time  : ", "%.3f" % (time.time() - T_0), " sec.")
+		print("Total execution time: ", "%.3f" % (time.time() - T_00), " sec.\n")
+		T_0 = time.time()
+
+	if namespace.matrix != None:
+		MATRIX_FILE.close()
+	journal.close_journal(options["journal"])
+	results.close_db(RESULTS)
+	timing.finish(namespace.timing_summary != None)
+	return 0
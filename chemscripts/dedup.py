@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  dedup.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Geometric deduplication of structures of batch. Two structures are the same
+# if they have the same composition and RMSD after optimal superposition
+# (Kabsch, rotation without reflection) is below threshold, so translated and
+# rotated copies are found. The structures are grouped by composition and
+# compared by fingerprint which does not depend on rotation and numbering of
+# atoms: principal radii of gyration (singular values of centered coordinates)
+# and mean distance of atoms from center. For superposed structures each of
+# them differs by not more than RMSD, so in a group sorted by the largest
+# radius the candidates are found by binary search, then the other values of
+# fingerprint and the sorted distances of atoms from center (their RMS
+# difference is not more than RMSD too) are compared for all candidates at
+# once. Only the remaining candidates are superposed.
+#
+#	duplicates = find_duplicates([(coords_1, None), (coords_2, None)])
+#	# {1: (0, 0.0012)} - structure 1 is the same as structure 0
+
+import math
+import numpy as np
+
+from chemscripts.volume import parse_xyz
+
+# default threshold of RMSD, Angstrom
+RMSD = 0.1
+
+
+# elements, centered coordinates, fingerprint and sorted distances from
+# center of structure
+def structure(coords):
+	elements, xyz = parse_xyz(coords)
+	elements = list(map(lambda e: e.capitalize(), elements))
+	xyz = xyz.reshape(-1, 3)
+	res = {"elements": elements, "composition": tuple(sorted(set(map(lambda e: (e, elements.count(e)), elements))))}
+	if len(xyz):
+		res["xyz"] = xyz - xyz.mean(axis=0)
+		radii = list(np.linalg.svd(res["xyz"], compute_uv=False) / math.sqrt(len(xyz)))
+		res["distances"] = np.sort(np.linalg.norm(res["xyz"], axis=1))
+		res["fingerprint"] = tuple(map(float, radii + [0.] * (3 - len(radii)) + [res["distances"].mean()]))
+	return res
+
+# RMSD of centered coordinates with the same order of atoms after optimal rotation
+def kabsch_rmsd(P, Q):
+	U, S, Vt = np.linalg.svd(P.T @ Q)
+	if np.linalg.det(U) * np.linalg.det(Vt) < 0:
+		S[-1] = -S[-1]
+	e = ((P * P).sum() + (Q * Q).sum() - 2. * S.sum()) / len(P)
+	return math.sqrt(max(e, 0.))
+
+# atoms sorted by element and distance from center, the order of atoms for
+# structures written with different numbering of atoms
+def canonical_order(s):
+	return sorted(range(len(s["elements"])), key=lambda i: (s["elements"][i], round(float(np.linalg.norm(s["xyz"][i])), 3)))
+
+# RMSD of structures with the same composition: with the order of atoms of
+# files, if it is the same, otherwise (or if it is above threshold) with
+# canonical order; a wrong order of atoms can only make RMSD larger
+def rmsd(a, b, threshold=RMSD):
+	res = kabsch_rmsd(a["xyz"], b["xyz"]) if a["elements"] == b["elements"] else float("inf")
+	if res > threshold:
+		order_a = canonical_order(a)
+		order_b = canonical_order(b)
+		res = min(res, kabsch_rmsd(a["xyz"][order_a], b["xyz"][order_b]))
+	return res
+
+# duplicates in list of structures (coordinates, key): the structures with
+# different keys (charge, settings of job) are not compared, the structures
+# without coordinates (None) are not checked; returns dictionary: number of
+# duplicate -> (number of the first same structure, RMSD)
+def find_duplicates(structures, threshold=RMSD):
+	data = {}
+	groups = {}
+	for num, (coords, key) in enumerate(structures):
+		if coords == None:
+			continue
+		s = structure(coords)
+		if len(s["elements"]) == 0:
+			continue
+		data[num] = s
+		groups.setdefault((key, s["composition"]), []).append(num)
+	res = {}
+	for nums in groups.values():
+		if len(nums) < 2:
+			continue
+		F = np.array(list(map(lambda num: data[num]["fingerprint"], nums)))
+		D = np.array(list(map(lambda num: data[num]["distances"], nums)))
+		order = np.argsort(F[:, 0], kind="stable")
+		F = F[order]
+		# position of structure in sorted group, earlier unique structures
+		position = np.argsort(order)
+		unique = np.zeros(len(nums), dtype=bool)
+		for i in range(len(nums)):
+			p = position[i]
+			lo = np.searchsorted(F[:, 0], F[p, 0] - threshold, side="left")
+			hi = np.searchsorted(F[:, 0], F[p, 0] + threshold, side="right")
+			mask = unique[lo:hi] & (np.abs(F[lo:hi] - F[p]).max(axis=1) <= threshold)
+			cand = order[lo:hi][mask]
+			cand = cand[np.sqrt(((D[cand] - D[i]) ** 2).mean(axis=1)) <= threshold]
+			# the first same structure in order of batch
+			for c in np.sort(cand):
+				r = rmsd(data[nums[c]], data[nums[i]], threshold)
+				if r <= threshold:
+					res[nums[i]] = (nums[c], r)
+					break
+			if nums[i] not in res:
+				unique[p] = True
+	return res
+
+# results of unique structure for its duplicate: names of job and molecule
+# are replaced, also in rows for database
+def fan_out(res, job, molecule):
+	copy = dict(res)
+	copy["job"] = job
+	copy["molecule"] = molecule
+	copy["rows"] = list(map(lambda row: dict(row, job=job, molecule=molecule), res["rows"]))
+	return copy
+
+# message for duplicate
+def duplicate_str(name, name_unique, r):
+	return name + " is the same structure as " + name_unique + " (RMSD " + "%.4f" % r + " A), results of " + name_unique + " are used"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  extract.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Extraction of properties from ORCA outputs. All requested properties are
+# collected by one scan with one combined regular expression. Output files are
+# mapped to memory; if only the last values are requested, the scan starts
+# from the tail of file, the window grows to the beginning until all values
+# are found, so the time hardly depends on size of output.
+#
+# Properties (PROPERTIES): name - (pattern with one group, type of value).
+# The values are requested as the last one, the first one or all of them:
+#
+#	extract_file("job.out", last=["G_gas", "E_el"])
+#	extract(data, first=["Molar"], all=["G", "ST", "SR"])
+
+import os, re, mmap
+
+PROPERTIES = {}
+PROPERTIES["Energy"] = (r"FINAL\ SINGLE\ POINT\ ENERGY\s+(\S+)", float)
+PROPERTIES["E_el"] = PROPERTIES["Energy"]
+PROPERTIES["G_gas"] = (r"Final\ Gibbs\ free\ energy\s*...\s*(\S+)\s*Eh\n", float)
+PROPERTIES["G"] = PROPERTIES["G_gas"]
+PROPERTIES["G_solv"] = (r"Free\ energy\ of\ solvation\ \(dGsolv\)\ \ :\s*(\S+)\sEh", float)
+PROPERTIES["Volume"] = (r"Cavity\ Volume\s*...\s*(\S+)", float)
+PROPERTIES["Molar"] = (r"Total\ Mass\s*...\s*(\S+)\s*AMU\n", float)
+PROPERTIES["ST"] = (r"Translational\ entropy\s*...\s*(\S+)\s*Eh\s*\d*\.\d*\s*kcal\/mol\n", float)
+PROPERTIES["SR"] = (r"Rotational\ entropy\s*...\s*(\S+)\s*Eh\s*\d*\.\d*\s*kcal\/mol\n", float)
+PROPERTIES["XYZ"] = (r"CARTESIAN\ COORDINATES\ \(ANGSTROEM\)\n---------------------------------\n((?s:.*?))\n\n", str)
+
+# initial size of tail window, bytes
+TAIL_SIZE = 1 << 16
+
+# combined expressions, (names, text or bytes) - compiled expression
+EXPRESSIONS = {}
+
+class MissingPropertyError(LookupError):
+	def __init__(self, names, source):
+		self.names = list(names)
+		self.source = source
+		LookupError.__init__(self, "property " + ", ".join(self.names) + " is not found in " + source)
+
+# one expression for all properties, the property of match is found by name
+# of outer group, its value is the next group
+def expression(names, binary):
+	key = (names, binary)
+	if key not in EXPRESSIONS:
+		pattern = "|".join(map(lambda name: "(?P<%s>%s)" % (name, PROPERTIES[name][0]), names))
+		EXPRESSIONS[key] = re.compile(pattern.encode() if binary else pattern)
+	return EXPRESSIONS[key]
+
+# text of value in match
+def group(match):
+	data = match.group(match.re.groupindex[match.lastgroup] + 1)
+	if isinstance(data, bytes):
+		data = data.decode(errors="replace")
+	return data
+
+def value(name, data):
+	try:
+		return PROPERTIES[name][1](data)
+	except ValueError:
+		raise ValueError("wrong value of property " + name + ": " + repr(data))
+
+# one scan of data from position start, the matches at start are skipped when
+# the window does not begin at start of data (the match can be cut)
+def scan(data, names, res, last, first, start=0):
+	for match in expression(tuple(sorted(names)), isinstance(data, (bytes, mmap.mmap))).finditer(data, start):
+		if start > 0 and match.start() == start:
+			continue
+		name = match.lastgroup
+		if name in last:
+			res[name] = group(match)
+		elif name in first:
+			if name not in res:
+				res[name] = group(match)
+		else:
+			res.setdefault(name, []).append(group(match))
+
+def extract_data(data, last, first, all):
+	names = set(last) | set(first) | set(all)
+	matches = {}
+	if first or all:
+		scan(data, names, matches, last, first)
+		return matches
+	# only the last values: windows at the end of data, the larger window
+	# is scanned for the properties which are not found yet
+	size = len(data)
+	window = TAIL_SIZE
+	while True:
+		start = max(0, size - window)
+		scan(data, names - set(matches), matches, last, first, start)
+		if len(matches) == len(names) or start == 0:
+			return matches
+		window *= 4
+
+def values(matches, last, first, all, optional, source):
+	res = {}
+	missing = []
+	for key in list(last) + list(first):
+		res[key] = value(key, matches[key]) if key in matches else None
+		if key not in matches and key not in optional:
+			missing.append(key)
+	for key in all:
+		res[key] = list(map(lambda data: value(key, data), matches.get(key, [])))
+		if not res[key] and key not in optional:
+			missing.append(key)
+	if missing:
+		raise MissingPropertyError(missing, source)
+	return res
+
+# values of properties from text of output; the absent properties raise
+# MissingPropertyError unless they are in optional, then the value is None
+# (empty list for all)
+def extract(data, last=(), first=(), all=(), optional=()):
+	return values(extract_data(data, last, first, all), last, first, all, optional, "output")
+
+# the same for output file, the file is mapped to memory
+def extract_file(filename, last=(), first=(), all=(), optional=()):
+	matches = {}
+	f = open(filename, "rb")
+	try:
+		if os.fstat(f.fileno()).st_size > 0:
+			data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+			try:
+				matches = extract_data(data, last, first, all)
+			finally:
+				data.close()
+	finally:
+		f.close()
+	return values(matches, last, first, all, optional, os.path.basename(filename))
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  free_energy.py
+#  
+#  Copyright 2023 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Free energy of molecule in liquid from free volume of cavity, the
+# calculations of script free_energy_liquid.py. The calculation of one
+# molecule (files JOB.xyz and JOB.hess) is done by calculate(job, options),
+# options - dictionary made by make_options():
+#
+#	options = free_energy.make_options(temperature=[298.15, 310.0])
+#	res = free_energy.calculate("mol", options)
+#	print(res["G_liquid"])
+
+import os, argparse, math, time, csv, json
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from chemscripts.runner import run_orca_parallel, run_directory, split_threads
+from chemscripts import common, thermo, volume, results, timing, extract
+from chemscripts.common import par_str, read_xyz_coord, read_list
+
+VERSION = 0.88
+
+HISTORY = '''
+			0.01 -- start project
+			0.1 -- added all base operations
+			0.2 -- added processed of errors in ORCA jobs
+			0.3 -- added input temperature from command-line arguments
+			0.4 -- added all calculations
+			0.5 -- added formatted output
+			0.51 -- fix minor bags
+			0.6 -- change version ORCA to 6
+			0.61 -- added cache of ORCA results
+			0.62 -- ORCA jobs are run at the same time in separate directories
+			0.7 -- thermochemistry is calculated from Hessian without ORCA, added range of temperatures
+			0.71 -- volumes of cavities are calculated without ORCA
+			0.8 -- added calculation of many molecules, output in CSV or JSON file
+			0.81 -- unique scratch directory for every run, several runs can share WORK_DIR
+			0.82 -- results are saved to database
+			0.83 -- timing of stages
+			0.84 -- directories may be set by environment variables (CHEMSCRIPTS_WORK_DIR, CHEMSCRIPTS_ORCA_DIR)
+			0.85 -- properties are extracted from output files in one scan (module extract)
+			0.86 -- calculations moved to module chemscripts.free_energy, the script is a wrapper
+			0.87 -- fix: native thermochemistry includes electronic energy ($act_energy of Hessian file or JOB.out)
+			0.88 -- fix: XYZ file of job is read from input directory, as Hessian file and output
+'''
+
+# Constants
+BOHR_to_ANGS = 0.52917721
+HARTREE = 2625.49953026
+K_BOLTZMANN = 1.380649 * pow(10,- 23)
+H_PLANCK = 6.62607015 * pow(10, -34)
+R_GAZ_CONST = 8.314
+AMU = 1.66053873 * pow(10, -27)
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser()
+	jobs = parser.add_mutually_exclusive_group(required=True)
+	jobs.add_argument ("--job", metavar="FILE", nargs='+', help = 'jobname(s) for files with coordinates data (XYZ format) and hessian data (ORCA format)')
+	jobs.add_argument ("--joblist", metavar="FILE", help = 'file with list of jobnames, one per line')
+	parser.add_argument ("-c", "--charge", type=int, default=0, help = 'charge of system')
+	parser.add_argument ("-t", "--temperature", nargs='+', default=[298], help = 'temperature')
+	parser.add_argument ("--trange", metavar=("T_MIN", "T_MAX", "STEP"), type=float, nargs=3, help = 'range of temperatures, replaces option -t')
+	parser.add_argument ("--thermochem", choices = ["native", "orca"], default = "native", help = 'thermochemistry is calculated from Hessian by script or by ORCA job')
+	parser.add_argument ("--volume", choices = ["native", "orca"], default = "native", help = 'volumes of cavities are calculated by script or by ORCA jobs')
+	parser.add_argument ("-n", "--nthreads", type=int, default=1, help = 'number of CPUs')
+	parser.add_argument ("-p", "--processes", type=int, default=1, help = 'number of molecules calculated at the same time, threads are divided between them')
+	parser.add_argument ("-o", "--output", metavar="FILE", help = 'file for results, CSV or JSON format by extension')
+	parser.add_argument ("-v", "--version", action="version", version=VERSION, help = 'print version')
+	parser.add_argument ("--nocache", help = 'do not use cache of ORCA results', nargs='*')
+	parser.add_argument ("--db", metavar="FILE", type=str, default=None, help = 'database of results, default ' + results.DB_FILE)
+	parser.add_argument ("--timing", metavar="FILE", type=str, help = 'file for timing of stages of jobs (JSON lines)')
+	parser.add_argument ("--timing-summary", help = 'print summary table of timing of stages', nargs='*')
+
+	return parser
+
+# options of calculation: input_dir - directory of XYZ, Hessian and output
+# files of jobs (default current directory), temperature - list of
+# temperatures, native_thermochem,
+# native_volume - thermochemistry and volumes without ORCA, timing - settings
+# of timing for worker processes (timing.FILENAME, timing.RUN) or None,
+# work_dir - scratch directory (created at first job if None)
+DEFAULTS = {}
+DEFAULTS["input_dir"] = None
+DEFAULTS["charge"] = 0
+DEFAULTS["temperature"] = [298.0]
+DEFAULTS["nproc"] = 1
+DEFAULTS["native_thermochem"] = True
+DEFAULTS["native_volume"] = True
+DEFAULTS["use_cache"] = True
+DEFAULTS["timing"] = None
+DEFAULTS["orca"] = common.ORCA
+DEFAULTS["work_dir"] = None
+
+# options of calculation from DEFAULTS and given values
+def make_options(**kwargs):
+	options = dict(DEFAULTS)
+	for key, value in kwargs.items():
+		if key not in DEFAULTS:
+			raise KeyError("unknown option " + key)
+		options[key] = value
+	if options["input_dir"] == None:
+		options["input_dir"] = os.getcwd()
+	return options
+
+# unique scratch directory of this run, removed at exit
+def run_dir(options):
+	if options["work_dir"] == None:
+		options["work_dir"] = run_directory("free_energy", common.WORK_DIR)
+	return options["work_dir"]
+
+# function calculate of free volume, angstrom^3
+def V_free(V_mol, V_cav):
+	return math.pow((math.pow(V_cav, 1/3.) - math.pow(V_mol, 1/3.)) * BOHR_to_ANGS, 3.)
+
+# function calculate of product S*T, Hartree
+def ST_liquid(V_free, T, m):
+	Lambda = H_PLANCK / math.sqrt (2 * math.pi * m * AMU * K_BOLTZMANN * T)
+	return T * R_GAZ_CONST * (2.5 + math.log(V_free / math.pow(Lambda  * math.pow(10, 10), 3))) / 1000. / HARTREE
+
+def str_f(f):
+	return "%.8f\t" % f
+
+
+# templates from job
+
+# Volume_Bader.inp and Volume_IDSCRF.inp
+def job_volume(coords, charge, radii, nproc):
+	return par_str(nproc) + '''* xyz ''' + str(charge) + ''' 1 \n''' + coords + '''
+*
+
+! RHF SVP NOITER
+
+%cpcm
+	smd true
+	SMDsolvent "water"
+	num_leb 770
+''' + "".join(map(lambda z: "\tradius[" + str(z) + "] " + str(radii[z]) + "\n", radii)) + '''end'''
+
+# Thermochem.inp
+def job_thermochem(coords, charge, filename_hess, temperature, nproc):
+	return par_str(nproc) + '''! printthermochem
+
+%geom
+	inhessname "''' + filename_hess + '''"
+end
+
+%freq
+	temp ''' + ",".join(list(map(str, temperature))) + '''
+ end
+
+%cpcm
+	smd true
+	SMDsolvent "water"
+end
+
+* xyz ''' + str(charge) + ''' 1 \n''' + coords + '''\n*'''
+
+# properties read from output files of jobs
+PROPERTIES = {}
+PROPERTIES["IDSCRF"] = {"first": ["Volume"]}
+PROPERTIES["Bader"] = {"first": ["Volume"]}
+PROPERTIES["Thermochem"] = {"first": ["Molar"], "all": ["G", "ST", "SR"]}
+
+
+# electronic energy of molecule for thermochemistry, Hartree: section
+# $act_energy of Hessian file or the last single point energy in output of
+# frequency job JOB.out in the same directory; None if it is not found
+def electronic_energy(job, hess, options):
+	if hess["energy"] != None:
+		return hess["energy"]
+	filename_out = os.path.join(options["input_dir"], job + ".out")
+	if os.path.isfile(filename_out):
+		return extract.extract_file(filename_out, last=["Energy"], optional=["Energy"])["Energy"]
+	return None
+
+# calculation for one molecule; options - dictionary with parameters
+# from command line, returns dictionary with results
+def calculate(job, options):
+	filename_xyz = os.path.join(options["input_dir"], job + ".xyz")
+	filename_hess = os.path.join(options["input_dir"], job + ".hess")
+	temperature = options["temperature"]
+	native_thermochem = options["native_thermochem"]
+	native_volume = options["native_volume"]
+	N_atoms, job_name, XYZ_coords = read_xyz_coord(filename_xyz)
+
+	# volumes are calculated by ORCA if the radius of some element is unknown
+	if native_volume:
+		try:
+			with timing.stage("calculation", name="volume"):
+				ELEMENTS, XYZ = volume.parse_xyz(XYZ_coords)
+				V_CAV = volume.cavity_volume(ELEMENTS, XYZ, volume.RADII_IDSCRF)
+				V_MOL = volume.cavity_volume(ELEMENTS, XYZ, volume.RADII_BADER)
+		except (KeyError, ValueError):
+			print("Warning, radii of some elements are unknown, volumes are calculated by ORCA (" + job + ")")
+			native_volume = False
+
+	# Gibbs energy in gas includes electronic energy, ORCA is used if it is unknown
+	if native_thermochem:
+		HESS = thermo.read_hess(filename_hess)
+		E_EL = electronic_energy(job, HESS, options)
+		if E_EL == None:
+			print("Warning, electronic energy is not found in " + job + ".hess and " + job + ".out, thermochemistry is calculated by ORCA (" + job + ")")
+			native_thermochem = False
+
+	# start of jobs, the threads are divided between jobs running at the same time;
+	# the hessian file is read by ORCA in thermochemistry job, it is used for key of cache
+	JOB_NAMES = []
+	if not native_volume:
+		JOB_NAMES += ["IDSCRF", "Bader"]
+	if not native_thermochem:
+		JOB_NAMES += ["Thermochem"]
+	NPROC_JOBS = dict(zip(JOB_NAMES, split_threads(options["nproc"], max(len(JOB_NAMES), 1))))
+	JOBS = {}
+	with timing.stage("input"):
+		if not native_volume:
+			JOBS["IDSCRF"] = (job_volume(XYZ_coords, options["charge"], volume.RADII_IDSCRF, NPROC_JOBS["IDSCRF"]), [])
+			JOBS["Bader"] = (job_volume(XYZ_coords, options["charge"], volume.RADII_BADER, NPROC_JOBS["Bader"]), [])
+		if not native_thermochem:
+			JOBS["Thermochem"] = (job_thermochem(XYZ_coords, options["charge"], filename_hess, temperature, NPROC_JOBS["Thermochem"]), [filename_hess])
+	RES = {}
+	if JOBS:
+		try:
+			RES = dict(zip(JOB_NAMES, run_orca_parallel(options["orca"], list(map(lambda name: JOBS[name], JOB_NAMES)), "free_energy", \
+				run_dir(options), options["use_cache"], list(map(lambda name: PROPERTIES[name], JOB_NAMES)))))
+		except extract.MissingPropertyError as e:
+			f = open(job + ".error.log", "w")
+			f.write(e.output)
+			f.close()
+			raise
+
+	# calculate free volume for liquid
+	if not native_volume:
+		V_CAV = RES["IDSCRF"]["Volume"]
+		V_MOL = RES["Bader"]["Volume"]
+	V_FREE = V_free(V_MOL, V_CAV)
+
+	# read other properierties
+	if native_thermochem:
+		with timing.stage("calculation", name="thermochem"):
+			THERMO = thermo.thermochemistry(HESS, temperature, energy=E_EL)
+		MOLAR_M = THERMO["mass"]
+		GIBBS_GAS = list(map(float, THERMO["G"]))
+		ST_GAS = list(map(float, THERMO["TS_trans"]))
+		SR_GAS = list(map(float, THERMO["TS_rot"]))
+	else:
+		MOLAR_M = RES["Thermochem"]["Molar"]
+		GIBBS_GAS = RES["Thermochem"]["G"]
+		ST_GAS = RES["Thermochem"]["ST"]
+		SR_GAS = RES["Thermochem"]["SR"]
+
+	# calculate translational entropy in liquid
+	N_POINTS = len(temperature)
+	ST_LIQUID = list(map(ST_liquid, [V_FREE] * N_POINTS, temperature, [MOLAR_M] * N_POINTS))
+
+	# calculate total Gibbs free energy in liquid
+	G_LIQUID = list(map(lambda x, y, z: x + y - z, GIBBS_GAS, ST_GAS, ST_LIQUID))
+
+	res = {}
+	res["job"] = job
+	res["charge"] = options["charge"]
+	res["thermochem_method"] = "native" if native_thermochem else "orca"
+	res["volume_method"] = "native" if native_volume else "orca"
+	res["molar_mass"] = MOLAR_M
+	res["volume_bader"] = V_MOL
+	res["volume_idscrf"] = V_CAV
+	res["free_volume"] = V_FREE
+	res["temperature"] = temperature
+	res["G_gas"] = GIBBS_GAS
+	res["ST_gas"] = ST_GAS
+	res["SR_gas"] = SR_GAS
+	res["ST_liquid"] = ST_LIQUID
+	res["G_liquid"] = G_LIQUID
+	return res
+
+# calculation in worker process, errors are returned to main process,
+# so one bad molecule does not stop the others
+def run_job(args):
+	job, options = args
+	# timing is switched on again in new process which is not forked
+	if options["timing"] != None and not timing.ENABLED:
+		timing.setup(*options["timing"])
+	timing.set_labels(job=job)
+	T_JOB = timing.clock()
+	try:
+		return job, calculate(job, options), None
+	except Exception as e:
+		return job, None, repr(e)
+	finally:
+		timing.record_since("job", T_JOB)
+
+# return of results for one molecule
+def print_results(res):
+	print("Molar mass, amu".ljust(45, " "), " = %.2f" % res["molar_mass"])
+	print("Volume Bader, Bohr^3".ljust(45, " "), " = %.4f" % res["volume_bader"])
+	print("Volume IDSCRF, Bohr^3".ljust(45, " "), " = %.4f" % res["volume_idscrf"])
+	print("Free Volume, Angsrtrom^3".ljust(45, " "), " = %.8f" % res["free_volume"])
+	print("Temperature, Kelvin".ljust(45, " "), " =", "\t\t".join(map(str, res["temperature"])))
+	print("Total Gibbs in gas, Hartree".ljust(45, " "), " =", "".join(list(map(str_f, res["G_gas"]))))
+	print("Translational entropy in gas, Hartree".ljust(45, " "), " =", "".join(list(map(str_f, res["ST_gas"]))))
+	print("Rotational entropy in gas, Hartree".ljust(45, " "), " =", "".join(list(map(str_f, res["SR_gas"]))))
+	print("Translational entropy in liquid, Hartree".ljust(45, " "), " =", "".join(list(map(str_f, res["ST_liquid"]))))
+	print("Total Gibbs energy in liquid, Hartree".ljust(45, " "), " =", "".join(list(map(str_f, res["G_liquid"]))))
+
+# columns of output file, one row for molecule and temperature
+COLUMNS = ["job", "temperature", "molar_mass", "volume_bader", "volume_idscrf", "free_volume", "G_gas", "ST_gas", "SR_gas", "ST_liquid", "G_liquid"]
+PER_TEMPERATURE = ["temperature", "G_gas", "ST_gas", "SR_gas", "ST_liquid", "G_liquid"]
+
+def table_rows(res):
+	rows = []
+	for i in range(len(res["temperature"])):
+		row = {}
+		for key in COLUMNS:
+			row[key] = res[key][i] if key in PER_TEMPERATURE else res[key]
+		rows.append(row)
+	return rows
+
+# rows for table free_energy of database of results
+def db_rows(res):
+	rows = []
+	for row in table_rows(res):
+		row["molecule"] = row.pop("job")
+		for key in ["charge", "thermochem_method", "volume_method"]:
+			row[key] = res[key]
+		rows.append(row)
+	return rows
+
+def write_results(filename, rows):
+	f = open(filename, "w")
+	if filename.lower().endswith(".json"):
+		json.dump(rows, f, indent=1)
+	else:
+		writer = csv.DictWriter(f, fieldnames=COLUMNS)
+		writer.writeheader()
+		writer.writerows(rows)
+	f.close()
+
+
+def main(argv=None):
+	T_0 = time.time()
+	parser = args_parser()
+	namespace = parser.parse_args(argv)
+
+	# read parameters from command-line arguments
+	if namespace.joblist != None:
+		jobs = read_list(namespace.joblist)
+	else:
+		jobs = namespace.job
+	temperature = list(map(float,namespace.temperature))
+	if namespace.trange != None:
+		T_MIN, T_MAX, T_STEP = namespace.trange
+		temperature = list(map(float, np.arange(T_MIN, T_MAX + T_STEP / 2., T_STEP)))
+	n_processes = max(1, min(namespace.processes, len(jobs)))
+
+	options = make_options(charge=namespace.charge, temperature=temperature, nproc=max(1, namespace.nthreads // n_processes), \
+		native_thermochem=namespace.thermochem == "native", native_volume=namespace.volume == "native", \
+		use_cache=namespace.nocache == None)
+	if namespace.timing != None or namespace.timing_summary != None:
+		timing.setup(namespace.timing)
+		options["timing"] = (timing.FILENAME, timing.RUN)
+	# unique scratch directory of this run, removed at exit
+	run_dir(options)
+
+	tasks = list(map(lambda job: (job, options), jobs))
+	if n_processes > 1:
+		pool = ProcessPoolExecutor(max_workers=n_processes)
+		outputs = pool.map(run_job, tasks)
+	else:
+		outputs = map(run_job, tasks)
+
+	rows = []
+	n_errors = 0
+	db = results.open_db(namespace.db)
+	for job, res, error in outputs:
+		if error != None:
+			print("Job = " + job + " failed: " + error)
+			n_errors += 1
+			continue
+		if namespace.output != None:
+			print("Job = " + job + " done")
+		else:
+			if len(jobs) > 1:
+				print("Job = " + job)
+			print_results(res)
+		rows += table_rows(res)
+		results.add_rows(db, "free_energy", db_rows(res))
+	if n_processes > 1:
+		pool.shutdown()
+	results.close_db(db)
+	timing.finish(namespace.timing_summary != None)
+	if namespace.output != None:
+		write_results(namespace.output, rows)
+
+	print("Total execution time: ", "%.3f" % (time.time() - T_0), " sec.")
+	return 1 if n_errors else 0
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+#  journal.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+
+# Journal of completed stages of calculations for resuming of long batches.
+# It is a text file with one JSON object per line:
+#   {"job": "mol.xyz", "stage": "opt-water", "key": "...", "results": {...}}
+# The line is written and flushed to disk as soon as the stage is finished,
+# so after crash or preemption only unfinished stages are lost; a broken last
+# line (the write was interrupted) is ignored. The key is hash of input of
+# stage (see cache.job_key), a stage is taken from journal only if the key
+# is the same, so changed parameters of calculation are not skipped. The
+# journal is locked by the run (fcntl.flock), two runs in one directory
+# with the same journal are not possible, the second one fails at start.
+
+import os, json, fcntl, threading
+
+from chemscripts import cache
+
+
+class JournalLockedError(RuntimeError):
+	def __init__(self, filename):
+		self.filename = filename
+		RuntimeError.__init__(self, "journal " + filename + " is used by other run, give other file by option --journal")
+
+# open journal: with resume=True the completed stages are read from file and
+# new stages are added to it, otherwise the file is started again; the file
+# is truncated only after it is locked, so the journal of running job is not
+# lost (JournalLockedError)
+def open_journal(filename, resume=False):
+	journal = {"filename": filename, "stages": {}, "lock": threading.Lock()}
+	journal["file"] = open(filename, "a+")
+	try:
+		fcntl.flock(journal["file"].fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+	except OSError:
+		journal["file"].close()
+		raise JournalLockedError(filename)
+	if not resume:
+		journal["file"].truncate(0)
+		return journal
+	journal["file"].seek(0)
+	data = journal["file"].read()
+	for line in data.split("\n"):
+		try:
+			entry = json.loads(line)
+			journal["stages"][(entry["job"], entry["stage"])] = entry
+		except (ValueError, KeyError, TypeError):
+			pass
+	# end of broken line, the new records start from new line
+	if data != "" and not data.endswith("\n"):
+		journal["file"].write("\n")
+	return journal
+
+# the lock is released with closing of file
+def close_journal(journal):
+	journal["file"].close()
+
+# key of stage: hash of input text of ORCA job (or other text describing
+# stage) and files used by it
+def stage_key(input_data, orca, depends=()):
+	return cache.job_key(input_data, orca, depends)
+
+# results of completed stage or None if the stage must be done; journal
+# may be None (calculations without journal)
+def get_stage(journal, job, stage, key=None):
+	if journal == None:
+		return None
+	entry = journal["stages"].get((job, stage))
+	if entry == None or entry.get("key") != key:
+		return None
+	return entry["results"]
+
+# record of completed stage, results must be serializable to JSON;
+# may be called from several threads
+def record_stage(journal, job, stage, results, key=None):
+	if journal == None:
+		return
+	entry = {"job": job, "stage": stage, "key": key, "results": results}
+	with journal["lock"]:
+		journal["stages"][(job, stage)] = entry
+		journal["file"].write(json.dumps(entry) + "\n")
+		journal["file"].flush()
+		os.fsync(journal["file"].fileno())
@@ -0,0 +1,716 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  logp.py
+#  
+#  Copyright 2023 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+
+# Partition coefficient octanol/water (logP) by COSMO-RS and/or SMD, the
+# calculations of script logP.py. The calculation of one molecule is done
+# by calculate(job, options), options - dictionary made by make_options()
+# with the same parameters as options of command line, so the module can be
+# used without the script:
+#
+#	options = logp.make_options(nproc=4, method="r2SCAN-3c", preopt="XTB2")
+#	res = logp.calculate("mol.xyz", options)
+#	print(res["logP"]["COSMO-RS"])
+
+import os, argparse, math, time, shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from chemscripts.runner import run_orca, run_orca_parallel, run_directory, job_directory, split_threads
+from chemscripts import common, compound, cosmors, dedup, journal, preopt, results, timing
+from chemscripts.common import par_str, read_xyz_coord, read_xyz_frames
+from chemscripts.extract import extract, MissingPropertyError
+
+VERSION = "0.40"
+HISTORY = '''
+			0.01 -- start project
+			0.10 -- add multiplity jobs, output in file, multiprocessing and other changes
+			0.11 -- change output format
+			0.12 -- add reading name job from comment string XYZ file
+			0.13 -- add saving result of optimazation to XYZ file
+			0.15 -- fix minor bags
+			0.16 -- refactoring
+			0.20 -- adding SMD for calculate logP
+			0.21 -- added cache of ORCA results
+			0.22 -- calculations in water and octanol are run at the same time
+			0.23 -- without optimization the surface of solute for COSMO-RS is calculated once
+			0.24 -- unique scratch directory for every run, several runs can share WORK_DIR
+			0.25 -- journal of completed stages, resuming of interrupted batch
+			0.26 -- results are saved to database instead of logP_output_data.txt
+			0.27 -- timing of stages, execution time is printed for every job
+			0.28 -- directories may be set by environment variables (CHEMSCRIPTS_WORK_DIR, CHEMSCRIPTS_ORCA_DIR)
+			0.29 -- option --chain: octanol optimization and COSMO-RS start from water geometry and orbitals
+			0.30 -- option --preopt: pre-optimization by GFN2-xTB before DFT optimization
+			0.31 -- option --compound: all stages of molecule in one ORCA process
+			0.32 -- energies and coordinates are extracted from output in one scan (module extract)
+			0.33 -- failed ORCA jobs are stopped early and repeated with other settings, failed optimization does not stop other jobs
+			0.34 -- calculations moved to module chemscripts.logp, the script is a wrapper
+			0.35 -- option --ensemble: Boltzmann average of logP for conformers, conformers above energy window are not calculated
+			0.36 -- option --dedup: the same structures of batch (rotated, translated) are calculated once
+			0.37 -- fix: logP of ensemble from free energies of ensemble in water and octanol with own weights, screening in rolling pool
+			0.38 -- fix: with --compound the octanol branch starts from own (pre-optimized) input geometry, from geometry of water only with --chain
+			0.39 -- fix: journal is locked by the run, the second run with the same journal fails at start and does not truncate it
+			0.40 -- fix: approximation of weights of conformers for COSMO-RS (--ensemble) is stated in help and README
+'''
+
+# Constants
+HARTREE = 2625.49953026
+R_GAZ_CONST = 8.314
+T = 298.15
+KCAL = 4.184
+
+# functional and keywords of COSMO-RS jobs
+DFTFUNC_CRS = "BP86 KDIIS DAMP SOSCF LSHIFT ri defgrid3"
+
+# options of calculation, names as options of command line: noopt, chain,
+# compound - True/False, preopt - method of pre-optimization or None;
+# window - energy window of conformers of ensemble (kcal/mol),
+# conformer_jobs - number of conformers calculated at the same time; orca -
+# path to ORCA, work_dir - scratch directory (created at first job if None),
+# journal - journal of stages (journal.open_journal) or None
+DEFAULTS = {}
+DEFAULTS["nproc"] = 1
+DEFAULTS["charge"] = 0
+DEFAULTS["multiplicity"] = 1
+DEFAULTS["method"] = "r2SCAN-3c"
+DEFAULTS["options"] = ""
+DEFAULTS["solvation"] = "COSMO-RS"
+DEFAULTS["noopt"] = False
+DEFAULTS["preopt"] = None
+DEFAULTS["chain"] = False
+DEFAULTS["compound"] = False
+DEFAULTS["window"] = 3.0
+DEFAULTS["conformer_jobs"] = 1
+DEFAULTS["use_cache"] = True
+DEFAULTS["orca"] = common.ORCA
+DEFAULTS["work_dir"] = None
+DEFAULTS["journal"] = None
+
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser()
+	parser.add_argument ("--job", metavar="FILE", nargs='+', required=True, help = 'jobname for files with coordinates data (XYZ format)')
+	parser.add_argument ("-n", "--nthreads", type=int, default=1, help = 'number of CPUs')
+	parser.add_argument ("-v", "--version", action="version", version=VERSION, help = 'print version')
+	parser.add_argument ("-c", "--charge", type=int, default=0, help = 'charge of system')
+	parser.add_argument ("--method", type=str, default="r2SCAN-3c", help = 'method for geometry optimization')
+	parser.add_argument ("--noopt", help = 'to skip optimization', nargs='*')
+	parser.add_argument ("-m", "--multiplicity", type=int, default=1, help = 'multiplicity of system')
+	parser.add_argument ("-o", "--options", type=str, default="", help = 'additional option for ORCA input')
+	parser.add_argument ("-sm", "--solvation", type=str, default="COSMO-RS", help = 'Implicit Solvation Model')
+	parser.add_argument ("--preopt", metavar="METHOD", nargs='?', const=preopt.METHOD, help = 'pre-optimization by semi-empirical method with ALPB solvation before optimization, default method ' + preopt.METHOD)
+	parser.add_argument ("--chain", help = 'start optimization in octanol from geometry and orbitals of water, COSMO-RS from orbitals of optimization', nargs='*')
+	parser.add_argument ("--compound", help = 'run all stages of molecule in one ORCA process (%%Compound job)', nargs='*')
+	parser.add_argument ("--ensemble", help = 'conformers of molecule are calculated as ensemble: files with several structures or files with the same name of molecule (comment line); for COSMO-RS the weights of conformers are approximate: energy with SMD in water plus difference of COSMO-RS free energies of solvation between solvents (see README)', nargs='*')
+	parser.add_argument ("--window", metavar="KCAL", type=float, default=3.0, help = 'with --ensemble, conformers with energy after pre-optimization above the lowest one by more than KCAL kcal/mol are not calculated')
+	parser.add_argument ("-j", "--jobs", type=int, default=1, help = 'with --ensemble, number of conformers calculated at the same time, threads are divided between them')
+	parser.add_argument ("--dedup", metavar="RMSD", type=float, nargs='?', const=dedup.RMSD, help = 'the same structures (RMSD after superposition below RMSD, default ' + str(dedup.RMSD) + ' A) are calculated once, with --ensemble the same conformers are skipped')
+	parser.add_argument ("--savexyz", help = 'save xyz files with optimized geometry', nargs='*')
+	parser.add_argument ("--nocache", help = 'do not use cache of ORCA results', nargs='*')
+	parser.add_argument ("--journal", metavar="FILE", type=str, default="logP_journal.jsonl", help = 'journal of completed stages of jobs')
+	parser.add_argument ("--resume", help = 'skip stages completed in journal by previous run', nargs='*')
+	parser.add_argument ("--db", metavar="FILE", type=str, default=None, help = 'database of results, default ' + results.DB_FILE)
+	parser.add_argument ("--timing", metavar="FILE", type=str, help = 'file for timing of stages of jobs (JSON lines)')
+	parser.add_argument ("--timing-summary", help = 'print summary table of timing of stages', nargs='*')
+	return parser
+
+# options of calculation from DEFAULTS and given values; with SMD the
+# optimization is not skipped
+def make_options(**kwargs):
+	options = dict(DEFAULTS)
+	for key, value in kwargs.items():
+		if key not in DEFAULTS:
+			raise KeyError("unknown option " + key)
+		options[key] = value
+	if options["solvation"] == "SMD" and options["noopt"]:
+		options["noopt"] = False
+		print("Warning, discovered SMD, --noopt is skipped")
+	return options
+
+# unique scratch directory of this run, removed at exit
+def run_dir(options):
+	if options["work_dir"] == None:
+		options["work_dir"] = run_directory("logP", common.WORK_DIR)
+	return options["work_dir"]
+
+# solvents of branches: name, SMD solvent, COSMO-RS solvent, threads
+def solvents(options):
+	nproc_branch = split_threads(options["nproc"], 2)
+	return [("water", "water", "water", nproc_branch[0]), ("octanol", "octanol", "1-octanol", nproc_branch[1])]
+
+# models of logP: name and property of branches
+def models(options):
+	if options["noopt"] or options["solvation"] == "COSMO-RS":
+		return [("COSMO-RS", "G_solv")]
+	if options["solvation"] == "SMD":
+		return [("SMD", "Energy")]
+	if options["solvation"] == "BOTH":
+		return [("SMD", "Energy"), ("COSMO-RS", "G_solv")]
+	return []
+
+# logP from free energies in water and octanol (Hartree)
+def logP(G_H2O, G_OCTANOL):
+	return -(G_OCTANOL-G_H2O)*HARTREE*1000/(R_GAZ_CONST*T*math.log(10))
+
+
+# save errors and intermediate results
+def write_error(data_list):
+	f = open("error.log", "w")
+	for data in data_list.values():
+		f.write(data)
+		f.write("\n------------------------------------------------------------------------\n")
+	f.close()
+
+# write optimize XYZ coordinates to file
+def write_xyz(job, data_opt_H2O, data_opt_OCTANOL):
+		f = open(job[:-4] + ".H2O.xyz", "w")
+		f.write(data_opt_H2O)
+		f.close()
+		f = open(job[:-4] + ".OCTANOL.xyz", "w")
+		f.write(data_opt_OCTANOL)
+		f.close()
+
+
+# additional line of ORCA input from option options
+def orca_options(options):
+	return ('''! ''' + options["options"]).rstrip("\n")
+
+# templates from job
+def job_CRS(coords, solvent, nproc, options, guess=None):
+	line = orca_options(options)
+	if guess != None:
+		line += "\n" + guess_str(guess).rstrip("\n")
+	return cosmors.job_CRS(coords, solvent, nproc, str(options["charge"]), str(options["multiplicity"]), DFTFUNC_CRS, line)
+
+
+# guess - file with orbitals for initial guess
+def guess_str(guess):
+	return '''! MORead\n%moinp "''' + guess + '''"\n'''
+
+# keywords and blocks of optimization (job or step of compound job)
+def block_opt(solvent, options, guess=None):
+	return '''! ''' + options["method"] + "\n" + (guess_str(guess) if guess != None else "") + '''! opt
+! KDIIS DAMP SOSCF LSHIFT rijcosx 
+
+%cpcm
+	smd true
+	SMDsolvent "''' + solvent + '''"
+end
+'''
+
+def job_opt(coords, solvent, nproc, options, guess=None):
+	return par_str(nproc) + block_opt(solvent, options, guess) + '''* xyz ''' + str(options["charge"]) + ''' ''' + str(options["multiplicity"]) + '''\n''' + coords + '''\n*'''
+
+
+# orbitals of finished job are copied for initial guess of next jobs (ORCA can
+# not read orbitals from file with name of the job itself), returns name of
+# copy in job_dir or guess if the job has not orbitals (it is taken from journal)
+GUESS = "guess.gbw"
+def keep_guess(job_dir, basename, guess=None):
+	gbw = os.path.join(job_dir, basename + ".gbw")
+	if not os.path.isfile(gbw):
+		return guess
+	shutil.copyfile(gbw, os.path.join(job_dir, GUESS))
+	return GUESS
+
+# files used by job with initial guess, for key of cache
+def guess_depends(job_dir, guess):
+	return [os.path.join(job_dir, guess)] if guess != None else []
+
+# one branch of calculation for solvent: geometry optimization with SMD (if it
+# is not skipped) and COSMO-RS, in own temporary subdirectory of scratch
+# directory or in job_dir; the stages completed in journal are skipped, new
+# stages are recorded; guess - orbitals in job_dir for initial guess of
+# optimization, with option chain the orbitals of optimization are used for
+# COSMO-RS; with option preopt the geometry is pre-optimized before
+# optimization (if it is not already optimized in other solvent,
+# preoptimize=False); returns dictionary with outputs of ORCA jobs, energy,
+# optimized coordinates, free energy of solvation, orbitals for next jobs
+# (guess) and wall times of pre-optimization and optimization
+def solvent_branch(job, coords, name, solvent_smd, solvent_crs, nproc, options, job_dir=None, guess=None, preoptimize=True):
+	if job_dir == None:
+		with job_directory("active_job", run_dir(options)) as job_dir:
+			return solvent_branch(job, coords, name, solvent_smd, solvent_crs, nproc, options, job_dir, guess, preoptimize)
+	ORCA = options["orca"]
+	JOURNAL = options["journal"]
+	USE_CACHE = options["use_cache"]
+	res = {"time": {}}
+	if not options["noopt"] and options["preopt"] != None and preoptimize:
+		T_TIER = timing.clock()
+		with timing.stage("input", name="preopt-" + name):
+			input_data = preopt.job_preopt(coords, solvent_smd, nproc, str(options["charge"]), str(options["multiplicity"]), options["preopt"])
+		key = journal.stage_key(input_data, ORCA)
+		stage = journal.get_stage(JOURNAL, job, "preopt-" + name, key)
+		if stage == None:
+			res["preopt"] = run_orca(ORCA, input_data, "preopt_" + name, job_dir, USE_CACHE)
+			with timing.stage("parse", name="preopt-" + name):
+				stage = {"XYZ": preopt.read_xyz(res["preopt"])}
+			if stage["XYZ"] != None:
+				journal.record_stage(JOURNAL, job, "preopt-" + name, stage, key)
+		if stage["XYZ"] != None:
+			coords = stage["XYZ"]
+		else:
+			print("Warning, pre-optimization in " + name + " failed, optimization is started from original geometry")
+		timing.record_since("preopt", T_TIER, name=name)
+		res["time"]["preopt"] = time.perf_counter() - T_TIER[0]
+	if not options["noopt"]:
+		T_TIER = timing.clock()
+		with timing.stage("input", name="opt-" + name):
+			input_data = job_opt(coords, solvent_smd, nproc, options)
+		# the initial guess does not change results, so it is not a part of journal key
+		key = journal.stage_key(input_data, ORCA)
+		stage = journal.get_stage(JOURNAL, job, "opt-" + name, key)
+		if stage == None:
+			if guess != None:
+				input_data = job_opt(coords, solvent_smd, nproc, options, guess)
+			res["opt"] = run_orca(ORCA, input_data, "opt_" + name, job_dir, USE_CACHE, guess_depends(job_dir, guess))
+			try:
+				with timing.stage("parse", name="opt-" + name):
+					stage = extract(res["opt"], last=["Energy", "XYZ"])
+			except MissingPropertyError as e:
+				# the other stages of branch are skipped, the output goes to error log
+				print("Error, optimization in " + name + " failed: " + str(e))
+				res["guess"] = guess
+				return res
+			journal.record_stage(JOURNAL, job, "opt-" + name, stage, key)
+		res.update(stage)
+		coords = res["XYZ"]
+		timing.record_since("opt", T_TIER, name=name)
+		res["time"]["opt"] = time.perf_counter() - T_TIER[0]
+		if options["chain"]:
+			guess = keep_guess(job_dir, "opt_" + name, guess)
+	if options["solvation"] == "COSMO-RS" or options["solvation"] == "BOTH":
+		with timing.stage("input", name="CRS-" + name):
+			input_data = job_CRS(coords, solvent_crs, nproc, options)
+		depends = cosmors.job_depends(solvent_crs)
+		key = journal.stage_key(input_data, ORCA, depends)
+		stage = journal.get_stage(JOURNAL, job, "CRS-" + name, key)
+		if stage == None:
+			if options["chain"] and guess != None:
+				res["CRS"] = run_orca(ORCA, job_CRS(coords, solvent_crs, nproc, options, guess), "CRS_" + name, job_dir, USE_CACHE, \
+					depends + guess_depends(job_dir, guess))
+				with timing.stage("parse", name="CRS-" + name):
+					stage = {"G_solv": cosmors.read_G_solv(res["CRS"])}
+				if stage["G_solv"] == None:
+					print("Warning, orbitals of optimization can not be used, COSMO-RS job without initial guess for " + name)
+			if stage == None or stage["G_solv"] == None:
+				res["CRS"] = run_orca(ORCA, input_data, "CRS_" + name, job_dir, USE_CACHE, depends)
+				with timing.stage("parse", name="CRS-" + name):
+					stage = {"G_solv": cosmors.read_G_solv(res["CRS"])}
+			if stage["G_solv"] != None:
+				journal.record_stage(JOURNAL, job, "CRS-" + name, stage, key)
+		res.update(stage)
+	res["guess"] = guess
+	return res
+
+
+# all stages of molecule in one ORCA process (option compound): optimization
+# in water (after pre-optimization), COSMO-RS in water, optimization in octanol
+# (after pre-optimization) and COSMO-RS in octanol; the octanol branch starts
+# from the input geometry as without compound, with option chain from the
+# geometry of water (without pre-optimization), the other steps start from the
+# geometry and orbitals of previous step; the output is split to steps and
+# parsed as outputs of separate jobs; returns results of branches for water
+# and octanol as solvent_branch()
+def compound_branches(job, coords, options):
+	SOLVENTS = solvents(options)
+	steps = []
+	depends = []
+	for num, (name, solvent_smd, solvent_crs, nproc) in enumerate(SOLVENTS):
+		first = len(steps)
+		if options["preopt"] != None and (num == 0 or not options["chain"]):
+			steps.append(("preopt-" + name, preopt.block_preopt(solvent_smd, options["preopt"])))
+		steps.append(("opt-" + name, block_opt(solvent_smd, options)))
+		if num > 0 and not options["chain"]:
+			steps[first] = (steps[first][0], steps[first][1] + compound.block_coords(coords, options["charge"], options["multiplicity"]))
+		if options["solvation"] == "COSMO-RS" or options["solvation"] == "BOTH":
+			steps.append(("CRS-" + name, cosmors.block_CRS(solvent_crs, DFTFUNC_CRS, orca_options(options))))
+			depends += cosmors.job_depends(solvent_crs)
+	with timing.stage("input", name="compound"):
+		input_data = compound.job_compound(coords, [s[1] for s in steps], options["nproc"], str(options["charge"]), str(options["multiplicity"]))
+	key = journal.stage_key(input_data, options["orca"], depends)
+	stage = journal.get_stage(options["journal"], job, "compound", key)
+	data = None
+	if stage == None:
+		with job_directory("active_job", run_dir(options)) as job_dir:
+			data = run_orca(options["orca"], input_data, "compound", job_dir, options["use_cache"], depends)
+		with timing.stage("parse", name="compound"):
+			stage = {}
+			for (name, step), part in zip(steps, compound.split_steps(data, len(steps))):
+				if name.startswith("opt-"):
+					try:
+						stage[name] = extract(part, last=["Energy", "XYZ"])
+					except MissingPropertyError:
+						stage[name] = {"Energy": None, "XYZ": None}
+				elif name.startswith("CRS-"):
+					stage[name] = {"G_solv": cosmors.read_G_solv(part)}
+		if all(map(lambda s: None not in s.values(), stage.values())):
+			journal.record_stage(options["journal"], job, "compound", stage, key)
+	res = []
+	for name, solvent_smd, solvent_crs, nproc in SOLVENTS:
+		branch = {"time": {}}
+		for prefix in ["opt-", "CRS-"]:
+			branch.update(stage.get(prefix + name, {}))
+		# the output of compound job is saved to error log once
+		if data != None and not res:
+			branch["opt"] = data
+		res.append(branch)
+	return res
+
+# without optimization the geometry is the same for both solvents, so the
+# surface of solute may be calculated once (see cosmors.evaluate_solvents)
+# for all solvents absent in journal; returns results of branches for water and octanol
+def noopt_branches(job, coords, options):
+	SOLVENTS = solvents(options)
+	KEYS = {}
+	RES = {}
+	for name, solvent_smd, solvent_crs, nproc in SOLVENTS:
+		KEYS[name] = journal.stage_key(job_CRS(coords, solvent_crs, options["nproc"], options), options["orca"], cosmors.job_depends(solvent_crs))
+		stage = journal.get_stage(options["journal"], job, "CRS-" + name, KEYS[name])
+		RES[name] = {} if stage == None else dict(stage)
+	MISSING = [s for s in SOLVENTS if RES[s[0]] == {}]
+	if MISSING:
+		RES_CRS = cosmors.evaluate_solvents(options["orca"], coords, [s[2] for s in MISSING], options["nproc"], run_dir(options), \
+			options["use_cache"], charge=str(options["charge"]), multiplicity=str(options["multiplicity"]), dftfunc=DFTFUNC_CRS, \
+			options=orca_options(options))
+		for name, solvent_smd, solvent_crs, nproc in MISSING:
+			G_solv, data = RES_CRS[solvent_crs]
+			RES[name] = {"CRS": data, "G_solv": G_solv}
+			if G_solv != None:
+				journal.record_stage(options["journal"], job, "CRS-" + name, {"G_solv": G_solv}, KEYS[name])
+	return RES["water"], RES["octanol"]
+
+# calculation of logP for molecule (coordinates coords, name job_name) of
+# job: the branches for water and octanol are run at the same time, the
+# threads are divided between them; with option chain the octanol branch is
+# started from results of water branch, so the branches are run one after
+# another in one directory with all threads; returns dictionary: job,
+# molecule, number of atoms, results of branches (water, octanol), logP for
+# models and rows for database (table logp); if logP can not be calculated,
+# the outputs of ORCA are saved to error.log
+def calculate_coords(job, job_name, N_atoms, coords, options):
+	SOLVENTS = solvents(options)
+	if options["noopt"]:
+		RES_H2O, RES_OCTANOL = noopt_branches(job, coords, options)
+	elif options["compound"]:
+		RES_H2O, RES_OCTANOL = compound_branches(job, coords, options)
+	elif options["chain"]:
+		with job_directory("active_job", run_dir(options)) as job_dir:
+			RES_H2O = solvent_branch(job, coords, *SOLVENTS[0][:3], options["nproc"], options, job_dir)
+			RES_OCTANOL = solvent_branch(job, RES_H2O.get("XYZ", coords), *SOLVENTS[1][:3], options["nproc"], options, job_dir, \
+				RES_H2O["guess"], "XYZ" not in RES_H2O)
+	else:
+		run_dir(options)
+		pool = ThreadPoolExecutor(max_workers=2)
+		RES_H2O, RES_OCTANOL = pool.map(timing.in_context(lambda s: solvent_branch(job, coords, *s, options)), SOLVENTS)
+		pool.shutdown()
+
+	# outputs of jobs in order of running for error log
+	DATA_RES = {}
+	for num, key in enumerate(["opt", "CRS"]):
+		for branch, res in enumerate([RES_H2O, RES_OCTANOL]):
+			if key in res:
+				DATA_RES[2 * num + branch] = res[key]
+
+	res = {"job": job, "molecule": job_name, "n_atoms": N_atoms, "water": RES_H2O, "octanol": RES_OCTANOL, "logP": {}, "rows": []}
+	T_PARSE = timing.clock()
+	try:
+		for model, key in models(options):
+			G_H2O = float(RES_H2O[key])
+			G_OCTANOL = float(RES_OCTANOL[key])
+			res["logP"][model] = logP(G_H2O, G_OCTANOL)
+			res["rows"].append({"molecule": job_name, "job": job, "method": options["method"], "model": model, "charge": options["charge"], \
+				"multiplicity": options["multiplicity"], "optimized": int(not options["noopt"]), "G_water": G_H2O, "G_octanol": G_OCTANOL, \
+				"logP": res["logP"][model]})
+	except (KeyError, TypeError, ValueError):
+		print("Error, LogP is not calculated for job " + job_name + ", outputs of ORCA are saved to error.log")
+		write_error(DATA_RES)
+	timing.record_since("parse", T_PARSE, name="logP")
+	return res
+
+# calculation of logP for molecule from XYZ file job, see calculate_coords()
+def calculate(job, options):
+	T_JOB = timing.clock()
+	timing.set_labels(job=job)
+	N_atoms, job_name, coords = read_xyz_coord(job)
+	if job_name == "":
+		job_name = job
+	res = calculate_coords(job, job_name, N_atoms, coords, options)
+	timing.record_since("job", T_JOB)
+	return res
+
+
+# conformers of ensembles from XYZ files: every file with several structures
+# is an ensemble named by the file (the conformers are named FILE_N.xyz), the
+# files with one structure and the same name of molecule are conformers of
+# one ensemble; returns list of (molecule, list of (job, number of atoms,
+# coordinates)) in order of files
+def read_ensembles(jobs):
+	res = {}
+	for job in jobs:
+		frames = read_xyz_frames(job)
+		if len(frames) > 1:
+			name = os.path.splitext(os.path.basename(job))[0]
+			conformers = list(map(lambda i: (job[:-4] + "_" + str(i + 1) + ".xyz", frames[i][0], frames[i][2]), range(len(frames))))
+		else:
+			name = frames[0][1] if frames[0][1] != "" else job
+			conformers = [(job, frames[0][0], frames[0][2])]
+		res.setdefault(name, []).extend(conformers)
+	return list(res.items())
+
+# conformers of ensemble without the same structures (module dedup), the
+# first of the same conformers is kept
+def unique_conformers(conformers, threshold=dedup.RMSD):
+	duplicates = dedup.find_duplicates(list(map(lambda c: (c[2], None), conformers)), threshold)
+	for num, (unique, r) in sorted(duplicates.items()):
+		print("Conformer " + conformers[num][0] + " is the same structure as " + conformers[unique][0] + " (RMSD " + "%.4f" % r + " A), it is skipped")
+	return [c for i, c in enumerate(conformers) if i not in duplicates]
+
+# free energy of ensemble of conformers with free energies (Hartree) in one
+# phase, -RT ln(sum exp(-G/RT)), and Boltzmann weights of conformers
+def ensemble_energy(energies):
+	E_min = min(energies)
+	RT = R_GAZ_CONST * T / (HARTREE * 1000)
+	factors = list(map(lambda E: math.exp(-(E - E_min) / RT), energies))
+	return E_min - RT * math.log(sum(factors)), list(map(lambda f: f / sum(factors), factors))
+
+# free energies of conformer in water and octanol for ensemble, Hartree: for
+# SMD the energies of optimization in the solvents; for COSMO-RS the energy in
+# water (of optimization, or of pre-optimization energy_water without it)
+# and the same energy with difference of free energies of solvation in
+# octanol and water, so for one conformer the ensemble gives its logP; None
+# if the values are absent. For COSMO-RS it is an approximation, not E_gas +
+# G_solv in both phases (the energy in gas is not calculated): the energy in
+# water contains SMD (ALPB) solvation, only the difference between solvents
+# is of COSMO-RS
+def phase_energies(res, model, key, energy_water):
+	if model not in res["logP"] or energy_water == None:
+		return None
+	if key == "Energy":
+		return float(res["water"]["Energy"]), float(res["octanol"]["Energy"])
+	return float(energy_water), float(energy_water) - float(res["water"]["G_solv"]) + float(res["octanol"]["G_solv"])
+
+# pre-optimization of all conformers in water (method of option preopt or
+# the default one) gives geometries and energies for the energy window; up to
+# nproc jobs are run at the same time, the next one is started as soon as a
+# job is finished, the threads are divided between running jobs; the
+# stage is the same as pre-optimization in water branch, so with option
+# preopt it is not repeated for calculated conformers; returns list of
+# energies (None if pre-optimization failed)
+def screen_conformers(conformers, options):
+	method = options["preopt"] if options["preopt"] != None else preopt.METHOD
+	T_TIER = timing.clock()
+	with timing.stage("input", name="screen"):
+		inputs = list(map(lambda c: preopt.job_preopt(c[2], "water", 1, str(options["charge"]), str(options["multiplicity"]), method), conformers))
+	keys = list(map(lambda input_data: journal.stage_key(input_data, options["orca"]), inputs))
+	stages = list(map(lambda c, key: journal.get_stage(options["journal"], c[0], "preopt-water", key), conformers, keys))
+	missing = [i for i in range(len(conformers)) if stages[i] == None or "Energy" not in stages[i]]
+	# no more jobs at the same time than threads; if all jobs are run at once,
+	# the threads are divided between them, otherwise equally
+	n_parallel = max(1, min(options["nproc"], len(missing)))
+	if n_parallel == len(missing):
+		nproc = split_threads(options["nproc"], n_parallel)
+	else:
+		nproc = [max(1, options["nproc"] // n_parallel)] * len(missing)
+	jobs = list(map(lambda i, n: (preopt.job_preopt(conformers[i][2], "water", n, str(options["charge"]), str(options["multiplicity"]), method), []), \
+		missing, nproc))
+	# the results are written to journal as soon as the job is finished
+	def done(num, data):
+		i = missing[num]
+		with timing.stage("parse", name="screen"):
+			stages[i] = {"XYZ": preopt.read_xyz(data), "Energy": extract(data, last=["Energy"], optional=["Energy"])["Energy"]}
+		if stages[i]["XYZ"] != None and stages[i]["Energy"] != None:
+			journal.record_stage(options["journal"], conformers[i][0], "preopt-water", stages[i], keys[i])
+	if missing:
+		run_orca_parallel(options["orca"], jobs, "screen", run_dir(options), options["use_cache"], limit=n_parallel, done=done)
+	timing.record_since("preopt", T_TIER, name="screen")
+	return list(map(lambda stage: stage["Energy"] if stage["XYZ"] != None else None, stages))
+
+# calculation of logP for ensemble of conformers of molecule name: the
+# conformers are pre-optimized, the conformers above the lowest one by more
+# than window are pruned, the others are calculated by calculate_coords()
+# (option conformer_jobs of them at the same time); logP of molecule is
+# given by free energies of ensemble in water and octanol, every phase with
+# own Boltzmann weights of conformers (see phase_energies());
+# returns dictionary: molecule, conformers (job, dE - energy above the lowest
+# conformer after pre-optimization, kcal/mol, status, weights in water and
+# octanol for models and results of calculate_coords()), logP for models,
+# rows for database (tables logp and logp_ensemble)
+def calculate_ensemble(name, conformers, options):
+	T_JOB = timing.clock()
+	timing.set_labels(job=name)
+	run_dir(options)
+	energies = screen_conformers(conformers, options)
+	known = [E for E in energies if E != None]
+	res = {"molecule": name, "conformers": [], "logP": {}, "rows": [], "ensemble_rows": []}
+	for (job, N_atoms, coords), E in zip(conformers, energies):
+		conformer = {"job": job, "dE": None, "status": "calculated", "weights": {}, "res": None}
+		if E == None:
+			print("Warning, pre-optimization of conformer " + job + " failed, the conformer is not pruned")
+		else:
+			conformer["dE"] = (E - min(known)) * HARTREE / KCAL
+			if conformer["dE"] > options["window"]:
+				conformer["status"] = "pruned"
+		res["conformers"].append(conformer)
+
+	# the conformers are calculated at the same time, the threads are divided between them
+	selected = [i for i in range(len(conformers)) if res["conformers"][i]["status"] == "calculated"]
+	n_jobs = max(1, min(options["conformer_jobs"], len(selected)))
+	nproc = split_threads(options["nproc"], n_jobs)
+	def run(num, i):
+		job, N_atoms, coords = conformers[i]
+		timing.set_labels(job=job, molecule=name)
+		return calculate_coords(job, name, N_atoms, coords, dict(options, nproc=nproc[num % n_jobs]))
+	pool = ThreadPoolExecutor(max_workers=n_jobs)
+	for i, res_conformer in zip(selected, pool.map(timing.in_context(run), range(len(selected)), selected)):
+		res["conformers"][i]["res"] = res_conformer
+		res["rows"] += res_conformer["rows"]
+	pool.shutdown()
+
+	# free energies of ensemble in water and octanol with own Boltzmann weights
+	# in every phase, the conformers without energy or logP are skipped
+	for model, key in models(options):
+		used = []
+		for i in selected:
+			conformer = res["conformers"][i]
+			E_water = conformer["res"]["water"].get("Energy") if not options["noopt"] else energies[i]
+			G = phase_energies(conformer["res"], model, key, E_water)
+			if G != None:
+				used.append((i, G))
+		if not used:
+			print("Error, LogP is not calculated for any conformer of " + name)
+			continue
+		G_H2O, weights_H2O = ensemble_energy(list(map(lambda u: u[1][0], used)))
+		G_OCTANOL, weights_OCTANOL = ensemble_energy(list(map(lambda u: u[1][1], used)))
+		for (i, G), weight_H2O, weight_OCTANOL in zip(used, weights_H2O, weights_OCTANOL):
+			res["conformers"][i]["weights"][model] = (weight_H2O, weight_OCTANOL)
+		res["logP"][model] = logP(G_H2O, G_OCTANOL)
+		res["ensemble_rows"].append({"molecule": name, "method": options["method"], "model": model, "charge": options["charge"], \
+			"multiplicity": options["multiplicity"], "optimized": int(not options["noopt"]), "window": options["window"], \
+			"conformers": len(conformers), "calculated": len(used), "logP": res["logP"][model]})
+	for i in selected:
+		if res["conformers"][i]["res"]["logP"] == {}:
+			res["conformers"][i]["status"] = "failed"
+	timing.record_since("job", T_JOB)
+	return res
+
+# output of results of job: logP for models, optimized coordinates (option
+# savexyz) and wall times of pre-optimization and optimization; title - name
+# of job in output, default molecule
+def print_job(job, res, options, savexyz=False, title=None):
+	if title == None:
+		title = "job " + res["molecule"]
+	for model, value in res["logP"].items():
+		method = " (SMD / " + options["method"] + ")" if model == "SMD" else " (COSMO-RS)"
+		print("For " + title + " LogP = " + str(round(value, 3)) + method)
+	RES_H2O, RES_OCTANOL = res["water"], res["octanol"]
+	# write optimize XYZ coordinates to file
+	if savexyz and not options["noopt"] and RES_H2O.get("XYZ") != None and RES_OCTANOL.get("XYZ") != None:
+		data_opt_H2O = str(res["n_atoms"]) + "\n" + res["molecule"] + "\n" + RES_H2O["XYZ"]
+		data_opt_OCTANOL = str(res["n_atoms"]) + "\n" + res["molecule"] + "\n" + RES_OCTANOL["XYZ"]
+		write_xyz(job, data_opt_H2O, data_opt_OCTANOL)
+	if not options["noopt"] and options["preopt"] != None:
+		for name, branch in filter(lambda r: r[1]["time"], [("water", RES_H2O), ("octanol", RES_OCTANOL)]):
+			tiers = filter(lambda t: t[1] in branch["time"], [(options["preopt"], "preopt"), (options["method"], "opt")])
+			print("Optimization in " + name.ljust(8, " ") + ": ", ", ".join(map(lambda t: t[0] + " " + "%.3f" % branch["time"][t[1]] + " sec.", tiers)))
+
+# output of results of ensemble: energies and weights of conformers, results
+# of calculated conformers and average logP
+def print_ensemble(res, options, savexyz=False):
+	print("Molecule = " + res["molecule"] + " (" + str(len(res["conformers"])) + " conformers)")
+	for conformer in res["conformers"]:
+		line = "Conformer " + conformer["job"] + ": "
+		line += "dE = " + ("%.3f" % conformer["dE"] + " kcal/mol" if conformer["dE"] != None else "unknown")
+		line += ", " + conformer["status"]
+		for model, (weight_H2O, weight_OCTANOL) in conformer["weights"].items():
+			line += ", weights in water/octanol" + (" (" + model + ")" if len(conformer["weights"]) > 1 else "") + \
+				" = " + "%.3f" % weight_H2O + "/" + "%.3f" % weight_OCTANOL
+		print(line)
+	for conformer in res["conformers"]:
+		if conformer["res"] != None:
+			print_job(conformer["job"], conformer["res"], options, savexyz, "conformer " + conformer["job"])
+	for model, value in res["logP"].items():
+		method = " (SMD / " + options["method"] + ")" if model == "SMD" else " (COSMO-RS)"
+		n = len([c for c in res["conformers"] if model in c["weights"]])
+		print("For molecule " + res["molecule"] + " LogP = " + str(round(value, 3)) + method + ", ensemble of " + str(n) + " conformers")
+
+
+def main(argv=None):
+	T_0 = time.time()
+	T_00 = T_0
+	parser = args_parser()
+	namespace = parser.parse_args(argv)
+
+	# read parameters from command-line arguments
+	options = make_options(nproc=namespace.nthreads, charge=namespace.charge, multiplicity=namespace.multiplicity, \
+		method=namespace.method, options=namespace.options, solvation=namespace.solvation, noopt=namespace.noopt != None, \
+		preopt=namespace.preopt, chain=namespace.chain != None, compound=namespace.compound != None, window=namespace.window, \
+		conformer_jobs=namespace.jobs, use_cache=namespace.nocache == None)
+	try:
+		options["journal"] = journal.open_journal(namespace.journal, namespace.resume != None)
+	except journal.JournalLockedError as e:
+		print("Error, " + str(e))
+		return 1
+	RESULTS = results.open_db(namespace.db)
+	if namespace.timing != None or namespace.timing_summary != None:
+		timing.setup(namespace.timing)
+	run_dir(options)
+
+	# molecules are single jobs or ensembles of conformers
+	if namespace.ensemble != None:
+		molecules = read_ensembles(namespace.job)
+	else:
+		molecules = list(map(lambda job: (job, None), namespace.job))
+	# the same structures of batch are calculated once, the results of the
+	# first one are used for others
+	duplicates = {}
+	if namespace.dedup != None and namespace.ensemble == None:
+		duplicates = dedup.find_duplicates(list(map(lambda job: (read_xyz_coord(job)[2], None), namespace.job)), namespace.dedup)
+	uniques = set(map(lambda d: d[0], duplicates.values()))
+	computed = {}
+	for num, (job, conformers) in enumerate(molecules):
+		if conformers == None and num in duplicates:
+			unique, r = duplicates[num]
+			job_name = read_xyz_coord(job)[1]
+			print(dedup.duplicate_str(job, molecules[unique][0], r))
+			res = dedup.fan_out(computed[unique], job, job_name if job_name != "" else job)
+			print_job(job, res, options, namespace.savexyz != None)
+		elif conformers == None:
+			res = calculate(job, options)
+			if num in uniques:
+				computed[num] = res
+			print_job(job, res, options, namespace.savexyz != None)
+		else:
+			if namespace.dedup != None:
+				conformers = unique_conformers(conformers, namespace.dedup)
+			res = calculate_ensemble(job, conformers, options)
+			print_ensemble(res, options, namespace.savexyz != None)
+			results.add_rows(RESULTS, "logp_ensemble", res["ensemble_rows"])
+		results.add_rows(RESULTS, "logp", res["rows"])
+		print("Job execution time  : ", "%.3f" % (time.time() - T_0), " sec.")
+		print("Total execution time: ", "%.3f" % (time.time() - T_00), " sec." ,"\n")
+		T_0 = time.time()
+
+	journal.close_journal(options["journal"])
+	results.close_db(RESULTS)
+	timing.finish(namespace.timing_summary != None)
+	return 0
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  orca2xyz.py
+#  
+#  Copyright 2019 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+import os, argparse, time
+from multiprocessing import Pool
+
+VERSION = 0.42
+HISTORY = '''
+			0.3 -- added parsing of scan jobs by coordinate
+			0.4 -- output files are read line by line, frames are written at once
+			0.41 -- added parallel processing of files, report for files
+			0.42 -- processing moved to module chemscripts.orca2xyz, the script is a wrapper
+'''
+
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser()
+	parser.add_argument ("-t", "--type", choices = ["opt", "scan"], default = "opt", help = 'choice type of job, optimization geometry or relaxation scan')
+	parser.add_argument ("-f", "--files", nargs='+', help = 'processed files (output files for jobs)')
+	parser.add_argument ("-j", "--jobs", type=int, default=1, help = 'number of processes for processing of files')
+
+	return parser
+
+# function for create one frame to XYZ file 
+def create_frame(coords, energy):
+	frame = " " + str(len(coords)) + "\n" + " Energy = " + energy + "\n" + "\n".join(coords)
+	return frame
+
+
+TAG_1 = "CARTESIAN COORDINATES (ANGSTROEM)"
+TAG_1_LINE = "---------------------------------"
+TAG_2 = "FINAL SINGLE POINT ENERGY"
+TAG_3 = "                 *** FINAL ENERGY EVALUATION AT THE STATIONARY POINT ***"
+TAG_4 = "*** OPTIMIZATION RUN DONE ***"
+
+
+# generator of frames (list of coordinate lines, energy) from ORCA output file,
+# the file is read line by line, so only current frame is kept in memory;
+# for optimization the n-th block of coordinates is joined with the n-th energy,
+# for scan the first coordinates and energy after each stationary point are taken
+def read_frames(f, job_type):
+	coords = None
+	coords_list = []
+	energy_list = []
+	in_scan = False
+	previous = None
+	for line in f:
+		line = line[:-1] if line.endswith("\n") else line
+		if coords != None:
+			# reading of block of coordinates up to empty line
+			if line == "":
+				if not job_type == "scan" or (in_scan and not coords_list):
+					coords_list.append(coords)
+				coords = None
+			else:
+				coords.append(line)
+		elif line == TAG_1_LINE and previous != None and previous.endswith(TAG_1):
+			coords = []
+		elif TAG_2 in line:
+			if not job_type == "scan" or (in_scan and not energy_list):
+				energy_list.append(line.partition(TAG_2)[2].strip(" "))
+		elif job_type == "scan" and TAG_3 in line:
+			in_scan = True
+		elif job_type == "scan" and TAG_4 in line and in_scan:
+			in_scan = False
+			if coords_list and energy_list:
+				yield coords_list.pop(0), energy_list.pop(0)
+			coords_list = []
+			energy_list = []
+		previous = line
+		if job_type == "opt" and coords_list and energy_list:
+			yield coords_list.pop(0), energy_list.pop(0)
+
+# write trajectory from ORCA output file to XYZ file, return number of frames
+def write_trajectory(name, job_type):
+	n_frames = 0
+	f = open(name + ".out", "r")
+	o = open(name + ".xyz", "w")
+	for coords, energy in read_frames(f, job_type):
+		o.write(create_frame(coords, energy) + "\n")
+		n_frames += 1
+	o.close()
+	f.close()
+	return n_frames
+
+
+# processing of one file in worker process, errors are returned
+# to main process, so one bad file does not stop processing of other
+def process_file(args):
+	name, job_type = args
+	T_0 = time.time()
+	if not os.path.isfile(name + ".out"):
+		return name, None, 0, 0., "Orca outpute file not found"
+	try:
+		size = os.path.getsize(name + ".out")
+		n_frames = write_trajectory(name, job_type)
+	except Exception as e:
+		return name, None, 0, time.time() - T_0, str(e)
+	return name, n_frames, size, time.time() - T_0, None
+
+
+def main(argv=None):
+	parser = args_parser()
+	namespace = parser.parse_args(argv)
+	names = map(lambda x: x[:-4] , namespace.files)
+	tasks = list(map(lambda name: (name, namespace.type), names))
+
+	T_0 = time.time()
+	if namespace.jobs > 1:
+		pool = Pool(min(namespace.jobs, len(tasks)))
+		results = pool.imap(process_file, tasks)
+	else:
+		results = map(process_file, tasks)
+
+	# report for files
+	n_frames_all = 0
+	size_all = 0
+	n_errors = 0
+	print("File".ljust(45, " "), "Frames".rjust(8, " "), "Size, MB".rjust(10, " "), "Time, sec.".rjust(12, " "))
+	for name, n_frames, size, t, error in results:
+		if error != None:
+			print((name + ".out").ljust(45, " "), " " + error)
+			n_errors += 1
+			continue
+		print((name + ".out").ljust(45, " "), str(n_frames).rjust(8, " "), ("%.2f" % (size / 1024**2)).rjust(10, " "), ("%.3f" % t).rjust(12, " "))
+		n_frames_all += n_frames
+		size_all += size
+	if namespace.jobs > 1:
+		pool.close()
+		pool.join()
+
+	T = max(time.time() - T_0, 1e-6)
+	print("Files: " + str(len(tasks)) + ", errors: " + str(n_errors) + ", frames: " + str(n_frames_all))
+	print("Total execution time: ", "%.3f" % T, " sec.")
+	print("Throughput: ", "%.2f" % (size_all / 1024**2 / T), " MB/sec., ", "%.1f" % (n_frames_all / T), " frames/sec.")
+	return 1 if n_errors else 0
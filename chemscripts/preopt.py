@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+#  preopt.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Pre-optimization of geometry by cheap semi-empirical method (GFN2-xTB in
+# ORCA) with implicit solvation ALPB before DFT optimization. Crude
+# geometries (for example, from molecular builders) are refined, so the DFT
+# optimization needs fewer cycles. If the pre-optimization fails, the
+# original geometry is used.
+
+from chemscripts.common import par_str
+from chemscripts.extract import extract
+
+# default method, ORCA keyword
+METHOD = "XTB2"
+# names of solvents of ALPB model different from names of SMD solvents
+ALPB_SOLVENTS = {"1-octanol": "octanol", "n-hexane": "hexane", "n-octanol": "octanol"}
+
+
+# keywords of pre-optimization (job or step of compound job), solvent - name
+# of SMD solvent or None for gas phase
+def block_preopt(solvent, method=METHOD):
+	solvation = ""
+	if solvent != None:
+		solvation = ''' ALPB(''' + ALPB_SOLVENTS.get(solvent.lower(), solvent) + ''')'''
+	return '''! ''' + method + ''' opt''' + solvation + '''\n'''
+
+# template of pre-optimization job
+def job_preopt(coords, solvent, nproc, charge="0", multiplicity="1", method=METHOD):
+	return par_str(nproc) + block_preopt(solvent, method) + '''* xyz ''' + str(charge) + ''' ''' + str(multiplicity) + '''\n''' + coords + '''\n*'''
+
+# optimized coordinates from output of job, None if the optimization is
+# not converged or failed
+def read_xyz(data):
+	if "OPTIMIZATION RUN DONE" not in data:
+		return None
+	return extract(data, last=["XYZ"], optional=["XYZ"])["XYZ"]
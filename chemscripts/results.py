@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+#  results.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+
+# Database of results of all scripts (SQLite). There is a table for every
+# type of calculation; a row is identified by its key columns (molecule and
+# parameters of calculation), so a repeated calculation replaces the old row.
+# The rows are written in batches, one transaction for BATCH_SIZE rows or
+# BATCH_TIME seconds; the database may be used by several runs at once.
+
+import os, time, sqlite3
+
+# file of database, may be changed of user
+DB_FILE = os.environ.get("CHEMSCRIPTS_DB", os.path.join(os.path.expanduser("~"), ".local", "share", "chemscripts", "results.sqlite"))
+
+# size of batch of rows and maximum time between transactions, sec.
+BATCH_SIZE = 100
+BATCH_TIME = 10.
+# waiting time for database locked by other run, sec.
+TIMEOUT = 60.
+
+# tables: list of columns (name, type), key columns and indexed columns
+TABLES = {}
+TABLES["logp"] = {
+	"columns": [("molecule", "TEXT"), ("job", "TEXT"), ("method", "TEXT"), ("model", "TEXT"), ("charge", "INTEGER"),
+		("multiplicity", "INTEGER"), ("optimized", "INTEGER"), ("G_water", "REAL"), ("G_octanol", "REAL"), ("logP", "REAL")],
+	"key": ["molecule", "job", "method", "model", "charge", "multiplicity", "optimized"],
+	"index": ["method", "model"]}
+TABLES["logp_ensemble"] = {
+	"columns": [("molecule", "TEXT"), ("method", "TEXT"), ("model", "TEXT"), ("charge", "INTEGER"), ("multiplicity", "INTEGER"),
+		("optimized", "INTEGER"), ("window", "REAL"), ("conformers", "INTEGER"), ("calculated", "INTEGER"), ("logP", "REAL")],
+	"key": ["molecule", "method", "model", "charge", "multiplicity", "optimized"],
+	"index": ["method", "model"]}
+TABLES["cosmors"] = {
+	"columns": [("molecule", "TEXT"), ("job", "TEXT"), ("method", "TEXT"), ("solvent", "TEXT"), ("charge", "INTEGER"),
+		("optimized", "INTEGER"), ("G_gas", "REAL"), ("E_el", "REAL"), ("dG_solv", "REAL"), ("G_total", "REAL")],
+	"key": ["molecule", "job", "method", "solvent", "charge", "optimized"],
+	"index": ["method", "solvent"]}
+TABLES["free_energy"] = {
+	"columns": [("molecule", "TEXT"), ("charge", "INTEGER"), ("thermochem_method", "TEXT"), ("volume_method", "TEXT"), ("temperature", "REAL"),
+		("molar_mass", "REAL"), ("volume_bader", "REAL"), ("volume_idscrf", "REAL"), ("free_volume", "REAL"),
+		("G_gas", "REAL"), ("ST_gas", "REAL"), ("SR_gas", "REAL"), ("ST_liquid", "REAL"), ("G_liquid", "REAL")],
+	"key": ["molecule", "charge", "thermochem_method", "volume_method", "temperature"],
+	"index": ["temperature"]}
+
+
+def columns(table):
+	return list(map(lambda c: c[0], TABLES[table]["columns"])) + ["created"]
+
+def create_tables(conn):
+	for table, desc in TABLES.items():
+		cols = ", ".join(map(lambda c: c[0] + " " + c[1], desc["columns"]))
+		conn.execute("CREATE TABLE IF NOT EXISTS %s (%s, created TEXT DEFAULT (datetime('now')))" % (table, cols))
+		# the unique index of key columns is also index for molecule
+		conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS %s_key ON %s (%s)" % (table, table, ", ".join(desc["key"])))
+		for col in desc["index"]:
+			conn.execute("CREATE INDEX IF NOT EXISTS %s_%s ON %s (%s)" % (table, col, table, col))
+	conn.commit()
+
+# open database (DB_FILE by default), tables are created if they are absent
+def open_db(filename=None):
+	if filename == None:
+		filename = DB_FILE
+	if os.path.dirname(filename) != "":
+		os.makedirs(os.path.dirname(filename), exist_ok=True)
+	conn = sqlite3.connect(filename, timeout=TIMEOUT)
+	conn.execute("PRAGMA journal_mode=WAL")
+	create_tables(conn)
+	return {"conn": conn, "pending": 0, "time": time.time()}
+
+def commit(db):
+	db["conn"].commit()
+	db["pending"] = 0
+	db["time"] = time.time()
+
+# add rows (dictionaries with columns of table), a row with the same key
+# columns is replaced
+def add_rows(db, table, rows):
+	cols = list(map(lambda c: c[0], TABLES[table]["columns"]))
+	sql = "INSERT OR REPLACE INTO %s (%s) VALUES (%s)" % (table, ", ".join(cols), ", ".join(["?"] * len(cols)))
+	db["conn"].executemany(sql, map(lambda row: list(map(lambda c: row.get(c), cols)), rows))
+	db["pending"] += len(rows)
+	if db["pending"] >= BATCH_SIZE or time.time() - db["time"] > BATCH_TIME:
+		commit(db)
+
+def close_db(db):
+	commit(db)
+	db["conn"].close()
+
+# rows of table as dictionaries; filters - dictionary column -> value or list
+# of values, strings may contain wildcards * and ? (SQL GLOB)
+def query(db, table, filters={}, order=None):
+	conditions = []
+	values = []
+	for col, value in filters.items():
+		if col not in columns(table):
+			raise KeyError(col)
+		value = value if isinstance(value, (list, tuple)) else [value]
+		parts = []
+		for v in value:
+			parts.append(col + (" GLOB ?" if isinstance(v, str) and ("*" in v or "?" in v) else " = ?"))
+			values.append(v)
+		conditions.append("(" + " OR ".join(parts) + ")")
+	sql = "SELECT %s FROM %s" % (", ".join(columns(table)), table)
+	if conditions:
+		sql += " WHERE " + " AND ".join(conditions)
+	sql += " ORDER BY " + ", ".join(order if order != None else TABLES[table]["key"])
+	cursor = db["conn"].execute(sql, values)
+	return list(map(lambda row: dict(zip(columns(table), row)), cursor))
@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+#
+#  runner.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Launch of ORCA jobs. ORCA is started directly (without shell), its output
+# is streamed to file by asyncio and watched for progress of job, so many
+# jobs can be run at the same time in one thread, with time limit and
+# cancellation.
+
+import os, sys, re, json, shutil, tempfile, atexit, signal, threading, time, asyncio
+from contextlib import contextmanager
+from subprocess import Popen, PIPE, STDOUT
+
+from chemscripts import cache, compound, timing, extract
+
+# niceness of ORCA processes, time limit of ORCA job in seconds (0 - without
+# limit); with variable CHEMSCRIPTS_PROGRESS the progress of jobs is printed
+NICE = int(os.environ.get("CHEMSCRIPTS_NICE", "10"))
+TIMEOUT = float(os.environ.get("CHEMSCRIPTS_TIMEOUT", "0"))
+PROGRESS = "CHEMSCRIPTS_PROGRESS" in os.environ
+# number of repeated runs of failed ORCA job (steps of RETRY_LADDER), file
+# where every run of ORCA job is written (JSON lines)
+RETRIES = int(os.environ.get("CHEMSCRIPTS_RETRIES", "2"))
+ATTEMPTS_LOG = os.environ.get("CHEMSCRIPTS_ATTEMPTS_LOG")
+# time for stopped ORCA to finish after SIGTERM before SIGKILL, sec.
+KILL_DELAY = 10.
+# interval of checking of end of process, if pidfd is not supported, sec.
+POLL_INTERVAL = 0.01
+BLOCK_SIZE = 1 << 16
+
+# events of progress in output of ORCA, group 1 is the argument of event
+PROGRESS_EVENTS = {}
+PROGRESS_EVENTS["optimization cycle"] = re.compile(r"GEOMETRY OPTIMIZATION CYCLE\s+(\d+)")
+# header of step of compound job, the same as for splitting of its output
+PROGRESS_EVENTS["compound step"] = compound.EXPRESSIONS["step"]
+PROGRESS_EVENTS["terminated normally"] = re.compile(r"ORCA TERMINATED NORMALLY()")
+
+# fatal events in output of ORCA, the job is stopped at once, as the result
+# is useless; group 1 is the argument of event. "SCF NOT CONVERGED" is not
+# fatal: ORCA may go on (optimization), and when it aborts the run, the error
+# termination follows at once
+FATAL_EVENTS = {}
+FATAL_EVENTS["optimization not converged"] = re.compile(r"The optimization did not converge()")
+FATAL_EVENTS["error termination"] = re.compile(r"ORCA finished by error termination in (\S+)")
+FATAL_EVENTS["input error"] = re.compile(r"INPUT ERROR()")
+
+# stalled geometry optimization is a fatal event too: the lowest energy of the
+# optimization is not lowered by more than STALL_ENERGY (Eh) during
+# STALL_CYCLES cycles (0 - not checked); groups: cycle of optimization,
+# energy of cycle, end of optimization
+STALL_CYCLES = int(os.environ.get("CHEMSCRIPTS_STALL_CYCLES", "30"))
+STALL_ENERGY = 1e-6
+OPT_EVENTS = re.compile(r"GEOMETRY OPTIMIZATION CYCLE\s+(\d+)|FINAL SINGLE POINT ENERGY\s+(\S+)|(OPTIMIZATION RUN DONE)")
+
+# settings added to input of failed job for repeated runs, one step for every
+# run: name and input lines (keywords and blocks are merged by ORCA)
+RETRY_LADDER = []
+RETRY_LADDER.append(("SlowConv", '''! SlowConv
+%scf
+	MaxIter 500
+end
+%geom
+	MaxIter 200
+end
+'''))
+RETRY_LADDER.append(("VerySlowConv", '''! VerySlowConv
+%scf
+	MaxIter 1000
+	DIISMaxEq 15
+	DirectResetFreq 1
+end
+%geom
+	MaxIter 400
+	Trust -0.1
+end
+'''))
+
+# running ORCA processes: pid -> state of job (name, pid, start, progress)
+RUNNING = {}
+RUNNING_LOCK = threading.Lock()
+
+
+# all descendants of process (MPI processes of ORCA), from /proc
+def descendants(pid):
+	children = {}
+	for d in os.listdir("/proc"):
+		if not d.isdigit():
+			continue
+		try:
+			f = open("/proc/" + d + "/stat", "r")
+			data = f.read()
+			f.close()
+		except OSError:
+			continue
+		children.setdefault(int(data.rsplit(")", 1)[1].split()[1]), []).append(int(d))
+	res = []
+	stack = [pid]
+	while stack:
+		for child in children.get(stack.pop(), []):
+			res.append(child)
+			stack.append(child)
+	return res
+
+# send signal to process and all its descendants
+def signal_tree(pid, signum):
+	for p in descendants(pid) + [pid]:
+		try:
+			os.kill(p, signum)
+		except OSError:
+			pass
+
+# stop of all running ORCA processes (at exit of script)
+def stop_all(signum=signal.SIGTERM):
+	with RUNNING_LOCK:
+		pids = list(RUNNING)
+	for pid in pids:
+		signal_tree(pid, signum)
+
+# copy of states of running jobs
+def running_jobs():
+	with RUNNING_LOCK:
+		return list(map(dict, RUNNING.values()))
+
+# search of events of progress and fatal events in text of output
+def watch(job, text):
+	for event, expression in PROGRESS_EVENTS.items():
+		for match in expression.finditer(text):
+			job["progress"] = (event + " " + match.group(1)).strip()
+			if event == "terminated normally":
+				job["terminated"] = True
+			if PROGRESS:
+				print("[" + job["name"] + "] " + job["progress"], file=sys.stderr, flush=True)
+	for event, expression in FATAL_EVENTS.items():
+		match = expression.search(text)
+		if match and "fatal" not in job:
+			job["fatal"] = (event + " " + match.group(1)).strip()
+	if STALL_CYCLES > 0:
+		watch_optimization(job, text)
+
+# progress of geometry optimization: lowest energy and number of cycles
+# without its improvement, the optimization is started again at cycle 1 (new
+# optimization or step of compound job), single points are not checked
+def watch_optimization(job, text):
+	for match in OPT_EVENTS.finditer(text):
+		if match.group(1) != None:
+			if int(match.group(1)) == 1:
+				job["optimization"] = {"lowest": None, "stalled": 0}
+		elif match.group(3) != None:
+			job.pop("optimization", None)
+		elif "optimization" in job:
+			state = job["optimization"]
+			try:
+				energy = float(match.group(2))
+			except ValueError:
+				continue
+			if state["lowest"] == None or energy < state["lowest"] - STALL_ENERGY:
+				state["lowest"] = energy
+				state["stalled"] = 0
+			else:
+				state["stalled"] += 1
+				if state["stalled"] >= STALL_CYCLES and "fatal" not in job:
+					job["fatal"] = "optimization stalled " + str(state["stalled"])
+
+# waiting for end of process, returns status and resource usage of process
+# with its children; the process is not a child of asyncio, so os.wait4 is
+# used, the end of process is signalled by pidfd (Linux) or found by polling
+async def wait_process(pid):
+	res = os.wait4(pid, os.WNOHANG)
+	if res[0] != 0:
+		return res[1], res[2]
+	try:
+		fd = os.pidfd_open(pid)
+	except (AttributeError, OSError):
+		fd = None
+	if fd != None:
+		loop = asyncio.get_running_loop()
+		finished = asyncio.Event()
+		loop.add_reader(fd, finished.set)
+		try:
+			await finished.wait()
+		finally:
+			loop.remove_reader(fd)
+			os.close(fd)
+		res = os.wait4(pid, 0)
+		return res[1], res[2]
+	while True:
+		res = os.wait4(pid, os.WNOHANG)
+		if res[0] != 0:
+			return res[1], res[2]
+		await asyncio.sleep(POLL_INTERVAL)
+
+# SIGTERM to process with descendants and SIGKILL after KILL_DELAY
+async def stop_process(pid):
+	signal_tree(pid, signal.SIGTERM)
+	try:
+		return await asyncio.wait_for(wait_process(pid), KILL_DELAY)
+	except asyncio.TimeoutError:
+		signal_tree(pid, signal.SIGKILL)
+		return await wait_process(pid)
+
+# run of program (ORCA) in directory cwd, its standard output is written to
+# file output as it is produced and watched for progress of job; stderr -
+# file for standard error, by default it goes to output; the process is
+# stopped when time limit timeout (sec.) is exceeded, a fatal event is found
+# in output (if stop_fatal) or the task is cancelled; returns dictionary:
+# returncode, wall and cpu time, timeout (True if stopped), fatal (event or
+# None), terminated (True if ORCA terminated normally)
+async def run_process(args, output, cwd, name, timeout=None, nice=None, stderr=STDOUT, stop_fatal=True):
+	if timeout == None:
+		timeout = TIMEOUT
+	if nice == None:
+		nice = NICE
+	if nice != 0:
+		args = ["nice", "-n", str(nice)] + list(args)
+	loop = asyncio.get_running_loop()
+	out = open(output, "wb")
+	t_0 = time.perf_counter()
+	proc = Popen(args, cwd=cwd, stdout=PIPE, stderr=stderr)
+	job = {"name": name, "pid": proc.pid, "start": time.time(), "progress": "started"}
+	with RUNNING_LOCK:
+		RUNNING[proc.pid] = job
+	reader = asyncio.StreamReader(limit=BLOCK_SIZE)
+	transport, protocol = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), proc.stdout)
+
+	async def stream():
+		tail = b""
+		while True:
+			block = await reader.read(BLOCK_SIZE)
+			if not block:
+				break
+			out.write(block)
+			# only complete lines are watched, the rest is kept for next block
+			text = tail + block
+			end = text.rfind(b"\n") + 1
+			watch(job, text[:end].decode("latin-1"))
+			tail = text[end:]
+			if stop_fatal and "fatal" in job:
+				print("Warning, ORCA job " + name + " is stopped: " + job["fatal"])
+				return await stop_process(proc.pid)
+		return await wait_process(proc.pid)
+
+	res = {"timeout": False}
+	try:
+		status, rusage = await asyncio.wait_for(stream(), timeout if timeout > 0 else None)
+	except asyncio.TimeoutError:
+		res["timeout"] = True
+		print("Warning, ORCA job " + name + " is stopped by time limit (" + "%g" % timeout + " sec.)")
+		status, rusage = await stop_process(proc.pid)
+	except BaseException:
+		# cancellation of task or interruption of script
+		status, rusage = await asyncio.shield(stop_process(proc.pid))
+		proc.returncode = os.waitstatus_to_exitcode(status)
+		raise
+	finally:
+		transport.close()
+		out.close()
+		with RUNNING_LOCK:
+			RUNNING.pop(proc.pid, None)
+	proc.returncode = os.waitstatus_to_exitcode(status)
+	res["returncode"] = proc.returncode
+	res["wall"] = time.perf_counter() - t_0
+	res["cpu"] = timing.cpu_time(rusage)
+	res["fatal"] = job.get("fatal")
+	res["terminated"] = job.get("terminated", False)
+	return res
+
+# reason of failure of ORCA run from result of run_process(), None if the
+# job is terminated normally
+def failure(res):
+	if res["timeout"]:
+		return "time limit"
+	if res["fatal"] != None:
+		return res["fatal"]
+	if res["returncode"] != 0:
+		return "return code " + str(res["returncode"])
+	if not res["terminated"]:
+		return "not terminated normally"
+	return None
+
+# input of repeated run: settings of step of RETRY_LADDER are added; the
+# compound jobs are not changed, the settings are given in their steps
+def escalate(input_data, attempt):
+	if attempt == 0 or "%compound" in input_data.lower():
+		return input_data
+	return RETRY_LADDER[attempt - 1][1] + input_data
+
+def log_attempt(basename, work_dir, attempt, res, reason):
+	if ATTEMPTS_LOG == None:
+		return
+	entry = {"name": basename, "dir": work_dir, "attempt": attempt, \
+		"settings": RETRY_LADDER[attempt - 1][0] if attempt > 0 else None, \
+		"wall": round(res["wall"], 3), "cpu": round(res["cpu"], 3), "returncode": res["returncode"], "failure": reason, \
+		"time": time.strftime("%Y-%m-%d %H:%M:%S")}
+	with RUNNING_LOCK:
+		f = open(ATTEMPTS_LOG, "a")
+		f.write(json.dumps(entry) + "\n")
+		f.close()
+
+# run of ORCA job with repeated runs: the failed job (not time limit or
+# error of input) is run again with settings of next step of RETRY_LADDER,
+# up to RETRIES times;
+# every run is written to ATTEMPTS_LOG and timing; returns result of last run
+async def run_attempts(orca, input_data, basename, work_dir):
+	input_filename = basename + ".inp"
+	output_filename = os.path.join(work_dir, basename + ".out")
+	compound = "%compound" in input_data.lower()
+	attempt = 0
+	while True:
+		with timing.stage("scratch_write", name=basename):
+			f = open(os.path.join(work_dir, input_filename), "w")
+			f.write(escalate(input_data, attempt))
+			f.close()
+		res = await run_process([orca, input_filename], output_filename, work_dir, basename)
+		reason = failure(res)
+		timing.record("orca", res["wall"], res["cpu"], name=basename, attempt=attempt, failure=reason)
+		log_attempt(basename, work_dir, attempt, res, reason)
+		if reason == None or res["timeout"] or reason.startswith("input error") or compound or attempt >= min(RETRIES, len(RETRY_LADDER)):
+			return res
+		attempt += 1
+		print("Warning, ORCA job " + basename + " failed (" + reason + "), run " + str(attempt + 1) + " with " + RETRY_LADDER[attempt - 1][0])
+
+# run ORCA for input text in working directory and return text of output,
+# the results are taken from cache if the same job was done before;
+# depends - files used by job, its contents are a part of cache key;
+# properties - arguments of extract.extract_file, then the values of
+# properties are returned instead of text, the output file is not read
+# (if a property is absent, the text is saved in output of exception);
+# the failed job is repeated with other settings (run_attempts); the stages
+# of job are measured by module timing
+async def run_orca_async(orca, input_data, basename, work_dir, use_cache=True, depends=(), properties=None):
+	use_cache = use_cache and cache.ENABLED
+	output_filename = os.path.join(work_dir, basename + ".out")
+	found = None
+	if use_cache:
+		with timing.stage("cache", name=basename):
+			key = cache.job_key(input_data, orca, depends)
+			found = cache.lookup(key, work_dir, basename)
+	if found == None:
+		# the result of repeated run is saved to cache with key of original input
+		await run_attempts(orca, input_data, basename, work_dir)
+		if use_cache:
+			with timing.stage("cache", name=basename):
+				cache.store(key, work_dir, basename)
+	if properties != None:
+		try:
+			with timing.stage("parse", name=basename):
+				return extract.extract_file(output_filename, **properties)
+		except extract.MissingPropertyError as e:
+			e.output = read_output(output_filename)
+			raise
+	with timing.stage("scratch_read", name=basename):
+		return read_output(output_filename)
+
+def read_output(filename):
+	f = open(filename, "r")
+	data = f.read()
+	f.close()
+	return data
+
+# the same for scripts without asyncio, every thread has own event loop
+def run_orca(orca, input_data, basename, work_dir, use_cache=True, depends=(), properties=None):
+	return asyncio.run(run_orca_async(orca, input_data, basename, work_dir, use_cache, depends, properties))
+
+# removal of directory with all files; the directory is renamed first, so its
+# name disappears at once and nobody can see it partially removed
+def remove_directory(path):
+	trash = path.rstrip(os.sep) + ".removed"
+	try:
+		os.rename(path, trash)
+	except OSError:
+		trash = path
+	shutil.rmtree(trash, ignore_errors=True)
+
+# scratch directory of one run of script in work_dir, the name is unique
+# (name of script, PID and random suffix), so several runs can share work_dir;
+# all jobs of the run are done in its subdirectories, it is removed at exit,
+# also when the script is stopped by SIGTERM (the running ORCA jobs are
+# stopped before, so the threads waiting for them are finished)
+def run_directory(name, work_dir):
+	os.makedirs(work_dir, exist_ok=True)
+	run_dir = tempfile.mkdtemp(prefix="%s_%d_" % (name, os.getpid()), dir=work_dir)
+	atexit.register(remove_directory, run_dir)
+	if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+		signal.signal(signal.SIGTERM, terminate)
+	return run_dir
+
+def terminate(signum, frame):
+	stop_all()
+	sys.exit(128 + signum)
+
+# temporary subdirectory of work_dir for jobs, it is removed with all files
+# when the jobs are finished
+@contextmanager
+def job_directory(basename, work_dir):
+	job_dir = tempfile.mkdtemp(prefix=basename + "_", dir=work_dir)
+	try:
+		yield job_dir
+	finally:
+		with timing.stage("cleanup", name=basename):
+			remove_directory(job_dir)
+
+# division of threads between jobs running at the same time,
+# every job gets at least one thread
+def split_threads(nproc, n_jobs):
+	return list(map(lambda i: max(1, nproc // n_jobs + (1 if i < nproc % n_jobs else 0)), range(n_jobs)))
+
+# run several ORCA jobs at the same time in one event loop, every job is run
+# in its own temporary subdirectory of work_dir, which is removed after job;
+# jobs - list of pairs (input text, depends), returns list of outputs;
+# properties - list of arguments of extract.extract_file for every job, then
+# the lists of values are returned; limit - maximum number of jobs running at
+# the same time (all by default), the next job is started as soon as a job is
+# finished; done(number of job, output) is called for every finished job
+async def run_orca_parallel_async(orca, jobs, basename, work_dir, use_cache=True, properties=None, limit=None, done=None):
+	semaphore = asyncio.Semaphore(limit if limit != None else max(len(jobs), 1))
+	async def run(num, job, props):
+		input_data, depends = job
+		async with semaphore:
+			with job_directory(basename, work_dir) as job_dir:
+				res = await run_orca_async(orca, input_data, basename, job_dir, use_cache, depends, props)
+		if done != None:
+			done(num, res)
+		return res
+	if properties == None:
+		properties = [None] * len(jobs)
+	# all jobs are finished before the first error is raised
+	res = await asyncio.gather(*map(run, range(len(jobs)), jobs, properties), return_exceptions=True)
+	for r in res:
+		if isinstance(r, BaseException):
+			raise r
+	return list(res)
+
+def run_orca_parallel(orca, jobs, basename, work_dir, use_cache=True, properties=None, limit=None, done=None):
+	return asyncio.run(run_orca_parallel_async(orca, jobs, basename, work_dir, use_cache, properties, limit, done))
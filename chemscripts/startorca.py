@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#  startorca.py
+#  
+#  Copyright 2019 ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+HISTORY = '''
+			0.3 -- added saving XYZ trajectory file
+			0.32 -- added thread number check
+			0.33 -- temporary files have been moved to a separate directory
+			0.34 -- added base processing of %Compound directive
+			0.35 -- added expanded processing of %Compound directive
+			0.36 -- adapted for ORCA 5.0
+			0.37 -- switch to python 3, added processing of %base directive
+			0.4 -- added scheduler: several jobs share the total number of threads, logs for jobs
+			0.41 -- every job is run in own unique scratch directory, several runs can share WORK_DIR
+			0.42 -- timing of stages of jobs
+			0.43 -- directories may be set by environment variables (CHEMSCRIPTS_HOME_DIR, CHEMSCRIPTS_WORK_DIR, CHEMSCRIPTS_ORCA_DIR)
+			0.44 -- jobs are run by asyncio runner: without polling, with time limit and progress of jobs
+			0.45 -- jobs with fatal errors in output (SCF not converged, error termination) are stopped at once
+			0.46 -- scheduler moved to module chemscripts.startorca, the script is a wrapper
+			0.47 -- option --dedup: inputs with the same structure (rotated, translated) and settings are run once
+			0.48 -- fix: failed input or job does not stop other jobs, exit code is 1 if some job is failed
+			0.49 -- fix: jobs are not stopped by fatal events in output (ORCA may go on after "SCF NOT CONVERGED"), they run until ORCA ends
+'''
+
+# Scheduler of ORCA jobs, the calculations of script startorca.py. The input
+# files in HOME_DIR are run by run_jobs(inputs, nproc, n_jobs), the outputs
+# and logs of jobs are written to HOME_DIR:
+#
+#	finished = startorca.run_jobs(["a.inp", "b.inp"], 8, n_jobs=2)
+#	print([job["status"] for job in finished])
+
+
+import os, shutil, datetime, re, argparse, time, tempfile, asyncio
+from glob import glob
+
+from chemscripts.runner import run_directory, remove_directory, run_process
+from chemscripts.cache import normalize_input
+from chemscripts.volume import parse_xyz
+from chemscripts import dedup, timing
+
+VERSION = 0.49
+# directories may be changed of user or by environment variables
+# CHEMSCRIPTS_HOME_DIR, CHEMSCRIPTS_WORK_DIR and CHEMSCRIPTS_ORCA_DIR
+HOME_DIR = os.path.join(os.environ.get("CHEMSCRIPTS_HOME_DIR", os.environ['HOME']  + "/programs_data/orca/"), "")
+WORK_DIR = os.environ.get("CHEMSCRIPTS_WORK_DIR", "/mnt/scratch/orca/")
+ORCA_DIR = os.environ.get("CHEMSCRIPTS_ORCA_DIR", "/opt/orca/")
+ORCA = os.path.join(ORCA_DIR, "orca")
+
+
+# function for parsing command line parameters
+def args_parser():
+	parser = argparse.ArgumentParser()
+	parser.add_argument ("nproc", metavar="N_proc", type=int, help = 'number of threads, in scheduler mode it is total number of threads for all jobs')
+	parser.add_argument ("inputs", metavar="INPUTS", nargs='+', help = 'input files')
+	parser.add_argument ("-j", "--jobs", type=int, default=1, help = 'maximum number of jobs running at the same time, threads are shared between them')
+	parser.add_argument ("--dedup", metavar="RMSD", type=float, nargs='?', const=dedup.RMSD, help = 'inputs with the same settings and structure (RMSD after superposition below RMSD, default ' + str(dedup.RMSD) + ' A) are run once, the files of results are copied')
+	parser.add_argument ("--timing", metavar="FILE", type=str, help = 'file for timing of stages of jobs (JSON lines)')
+	parser.add_argument ("--timing-summary", help = 'print summary table of timing of stages', nargs='*')
+	parser.add_argument ("-v", "--version", action="version", version=str(VERSION), help = 'print version')
+	return parser
+
+
+# Regular expression for parsing Compound files
+EXPRESSIONS = {}
+EXPRESSIONS["job_names"] = re.compile(r"#Alias_Step" + r"(.*?)" + "\n")
+EXPRESSIONS["base_name"] = re.compile(r"%base" + r"(.*?)" + "\n")
+EXPRESSIONS["pal"] = re.compile(r"\%pal\ nprocs\ \d+\ end", re.S)
+EXPRESSIONS["coords"] = re.compile(r"^\s*\*\s*xyz\s+-?\d+\s+\d+\s*\n(.*?)^\s*\*", re.S | re.M | re.I)
+
+
+# write number of threads to input file
+def set_nprocs(f, nproc):
+	par_str = "%pal nprocs " + str(nproc) + " end"
+	af = open(f, "r")
+	data = af.read()
+	af.close()
+	if "%pal nprocs" in data:
+		pal_old = EXPRESSIONS["pal"].findall(data)[0]
+		data = data.replace(pal_old, par_str)
+	else:
+		data = par_str + "\n" + data
+	af = open(f, "w")
+	af.write(data)
+	af.close()
+	return data
+
+# coordinates and key of input file for deduplication: the coordinates of
+# block "* xyz charge multiplicity", the key is the input without them and
+# without %pal; None for %Compound jobs and inputs without coordinates
+def input_structure(f):
+	af = open(f, "r")
+	data = af.read()
+	af.close()
+	match = EXPRESSIONS["coords"].search(data)
+	if "%Compound" in data or match == None:
+		return None, None
+	try:
+		parse_xyz(match.group(1))
+	except (ValueError, IndexError):
+		return None, None
+	return match.group(1), normalize_input(data[:match.start(1)] + data[match.end(1):])
+
+# number of threads for next job: the threads are divided equally between
+# jobs, but the last jobs of queue take all free threads
+def threads_for_job(free, n_queue, nproc, n_jobs):
+	per_job = max(1, nproc // n_jobs)
+	return min(free, max(per_job, free // n_queue))
+
+# copy input file to own scratch directory of job
+def start_job(f, num, nproc, run_dir):
+	job = {}
+	job["file"] = f
+	job["name"] = f[:-4]
+	job["nproc"] = nproc
+	job_data = set_nprocs(f, nproc)
+
+	# the number of job is added because several jobs can be started in one second
+	input_filename = "active_" + datetime.datetime.today().strftime("%Y-%m-%d_%H_%M_%S") + "_" + str(num) + ".inp"
+
+	# processind compound jobs
+	job["job_names"] = []
+	if "%Compound" in job_data:
+		job["job_names"] = list(map(lambda s: s.strip(), EXPRESSIONS["job_names"].findall(job_data)))
+
+	# change base name of job
+	if "%base" in job_data:
+		input_filename = EXPRESSIONS["base_name"].findall(job_data)[0].strip('" ') + ".inp"
+	job["input"] = input_filename
+	job["dir"] = tempfile.mkdtemp(prefix="job_" + str(num) + "_", dir=run_dir)
+
+	with timing.stage("scratch_write", job=f):
+		shutil.copy(f, os.path.join(job["dir"], input_filename))
+	job["log"] = open(HOME_DIR + job["name"] + ".log", "w")
+	job["log"].write("Input file   : " + f + "\n")
+	job["log"].write("Scratch file : " + os.path.join(job["dir"], input_filename) + "\n")
+	job["log"].write("Threads      : " + str(nproc) + "\n")
+	job["log"].write("Started      : " + datetime.datetime.today().strftime("%Y-%m-%d %H:%M:%S") + "\n")
+	job["log"].write("\n")
+	job["log"].flush()
+	job["start"] = time.time()
+	print("Started  " + f + " (" + str(nproc) + " threads)")
+	return job
+
+# run of ORCA, the output is written to home directory as it is produced;
+# exit code and processor time of ORCA process are saved for timing; the
+# jobs of user are not stopped by fatal events, ORCA decides itself
+async def run_job(job, orca):
+	res = await run_process([orca, job["input"]], HOME_DIR + job["name"] + ".out", job["dir"], job["file"], stderr=job["log"], stop_fatal=False)
+	job["returncode"] = res["returncode"]
+	job["cpu"] = res["cpu"]
+	return job
+
+# moving of results to home directory
+def finish_job(job):
+	job["time"] = time.time() - job["start"]
+	timing.record("orca", job["time"], job["cpu"], job=job["file"])
+	T_CLEANUP = timing.clock()
+	input_filename = job["input"]
+	os.chdir(job["dir"])
+
+	# moving files
+	for i, job_name in enumerate(job["job_names"]):
+		try:
+			tmp_list_files = filter(lambda x: "tmp" not in x, glob(input_filename[:-4] + "_Compound_" + str(i+1) + "*"))
+			for f in tmp_list_files:
+				shutil.move(f, f.replace("_Compound_" + str(i+1), job_name))
+		except OSError:
+			pass
+
+	os.remove(input_filename)
+	list_files = filter(lambda x: "tmp" not in x, glob(input_filename[:-4] + "*"))
+	job["files"] = [job["name"] + ".out"]
+	for f in list_files:
+		shutil.move(f, HOME_DIR + f.replace(input_filename[:-4], job["name"]))
+		job["files"].append(f.replace(input_filename[:-4], job["name"]))
+	os.chdir(HOME_DIR)
+	remove_directory(job["dir"])
+	timing.record_since("cleanup", T_CLEANUP, job=job["file"])
+
+	# status of job is taken from ORCA output
+	f = open(HOME_DIR + job["name"] + ".out", "r")
+	job["status"] = "done" if "ORCA TERMINATED NORMALLY" in f.read() else "error"
+	f.close()
+	if job["returncode"] != 0:
+		job["status"] = "error"
+
+	job["log"].write("\nFinished     : " + datetime.datetime.today().strftime("%Y-%m-%d %H:%M:%S") + "\n")
+	job["log"].write("Exit code    : " + str(job["returncode"]) + "\n")
+	job["log"].write("Status       : " + job["status"] + "\n")
+	job["log"].write("Wall time    : " + "%.3f" % job["time"] + " sec.\n")
+	job["log"].close()
+	print("Finished " + job["file"] + " (" + job["status"] + ", " + "%.3f" % job["time"] + " sec.)")
+
+# failed job: the input is not readable, ORCA is not started or results are
+# not moved; the job is finished with status error, so other jobs go on
+def fail_job(f, error, job=None):
+	if job == None:
+		job = {"file": f, "name": f[:-4], "nproc": 0, "start": time.time()}
+	job["time"] = time.time() - job["start"]
+	job["status"] = "error"
+	job.setdefault("files", [])
+	os.chdir(HOME_DIR)
+	if "dir" in job:
+		remove_directory(job["dir"])
+	if "log" in job and not job["log"].closed:
+		job["log"].write("\nError        : " + str(error) + "\n")
+		job["log"].write("Status       : " + job["status"] + "\n")
+		job["log"].close()
+	print("Error, job " + f + " is failed: " + str(error))
+	return job
+
+# input file with the same structure as finished job: files of results are
+# copied with name of input file, the status is taken from the job
+def copy_job(f, job, r):
+	copy = {"file": f, "name": f[:-4], "nproc": 0, "time": 0., "status": job["status"], "files": []}
+	for name in sorted(set(job["files"])):
+		if os.path.isfile(HOME_DIR + name):
+			shutil.copy(HOME_DIR + name, HOME_DIR + copy["name"] + name[len(job["name"]):])
+			copy["files"].append(copy["name"] + name[len(job["name"]):])
+	log = open(HOME_DIR + copy["name"] + ".log", "w")
+	log.write("Input file   : " + f + "\n")
+	log.write("Same as      : " + job["file"] + " (RMSD " + "%.4f" % r + " A)\n")
+	log.write("Status       : " + copy["status"] + "\n")
+	log.close()
+	print(dedup.duplicate_str(f, job["file"], r))
+	return copy
+
+
+# start of jobs: new job is started as soon as the threads become free
+async def run_queue(inputs, nproc_total, n_jobs, run_dir, orca):
+	queue = list(inputs)
+	running = set()
+	finished = []
+	free = nproc_total
+	num = 0
+	# task -> job, the job of failed task is known
+	jobs = {}
+	while queue or running:
+		while queue and len(running) < n_jobs and free > 0:
+			nproc = threads_for_job(free, len(queue), nproc_total, n_jobs)
+			f = queue.pop(0)
+			try:
+				job = start_job(f, num, nproc, run_dir)
+			except Exception as e:
+				finished.append(fail_job(f, e))
+				continue
+			finally:
+				num += 1
+			task = asyncio.create_task(run_job(job, orca))
+			jobs[task] = job
+			running.add(task)
+			free -= nproc
+		if not running:
+			continue
+		done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+		for task in done:
+			job = jobs.pop(task)
+			try:
+				task.result()
+				finish_job(job)
+			except Exception as e:
+				fail_job(job["file"], e, job)
+			finished.append(job)
+			free += job["nproc"]
+	return finished
+
+# run of input files from HOME_DIR, nproc - total number of threads, n_jobs -
+# maximum number of jobs running at the same time; with threshold of RMSD
+# (dedup) the inputs with the same structure and settings are run once, the
+# results are copied after the run; returns finished jobs
+def run_jobs(inputs, nproc, n_jobs=1, orca=ORCA, dedup_rmsd=None):
+	os.chdir(HOME_DIR)
+	duplicates = {}
+	if dedup_rmsd != None:
+		duplicates = dedup.find_duplicates(list(map(input_structure, inputs)), dedup_rmsd)
+	queue = [f for num, f in enumerate(inputs) if num not in duplicates]
+	# unique scratch directory of this run, removed at exit
+	run_dir = run_directory("startorca", WORK_DIR)
+	finished = asyncio.run(run_queue(queue, nproc, min(n_jobs, len(queue)), run_dir, orca))
+	jobs = dict(map(lambda job: (job["file"], job), finished))
+	for num, (unique, r) in sorted(duplicates.items()):
+		finished.append(copy_job(inputs[num], jobs[inputs[unique]], r))
+	return finished
+
+
+def main(argv=None):
+	parser = args_parser()
+	namespace = parser.parse_args(argv)
+	if namespace.nproc < 1 or min(namespace.jobs, len(namespace.inputs)) < 1:
+		print("Number of thread value error")
+		return 1
+	if namespace.timing != None or namespace.timing_summary != None:
+		timing.setup(namespace.timing)
+
+	T_0 = time.time()
+	finished = run_jobs(namespace.inputs, namespace.nproc, namespace.jobs, dedup_rmsd=namespace.dedup)
+
+	# summary of jobs
+	print("")
+	print("Job".ljust(45, " "), "Threads".rjust(8, " "), "Status".rjust(8, " "), "Time, sec.".rjust(12, " "))
+	for job in finished:
+		print(job["file"].ljust(45, " "), str(job["nproc"]).rjust(8, " "), job["status"].rjust(8, " "), ("%.3f" % job["time"]).rjust(12, " "))
+	print("Total execution time: ", "%.3f" % (time.time() - T_0), " sec.")
+	n_done = len([job for job in finished if job["status"] == "done"])
+	print("Jobs done: " + str(n_done) + " from " + str(len(finished)))
+	timing.finish(namespace.timing_summary != None)
+	return 0 if n_done == len(finished) else 1
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+#  thermo.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Thermochemistry in rigid rotor - harmonic oscillator approximation from
+# ORCA Hessian files. All values are calculated for array of temperatures at
+# once and are given in Hartree per molecule, as in ORCA output; the entropy
+# terms are products T*S. The quasi-RRHO treatment of low frequencies for
+# vibrational entropy (S. Grimme, Chem. Eur. J. 2012, 18, 9955) is used as in ORCA.
+
+import numpy as np
+
+# Constants (SI)
+K_BOLTZMANN = 1.380649e-23
+H_PLANCK = 6.62607015e-34
+C_LIGHT = 2.99792458e10		# cm/s
+AMU = 1.66053906660e-27
+BOHR = 0.529177210903e-10
+HARTREE_J = 4.3597447222071e-18
+PRESSURE = 101325.
+
+# parameters of quasi-RRHO, may be changed of user
+QRRHO = True
+CUTOFF_FREQ = 35.		# cm^-1
+QRRHO_ALPHA = 4
+B_AV = 1e-44			# kg m^2
+
+# tolerance for search of symmetry and linear molecules, Bohr
+SYMMETRY_TOL = 0.05
+
+
+# read frequencies (cm^-1), elements, masses (amu), coordinates (Bohr) and
+# electronic energy (Hartree, section $act_energy, None if it is absent or
+# zero) from ORCA Hessian file
+def read_hess(filename):
+	f = open(filename, "r")
+	lines = f.read().split("\n")
+	f.close()
+	sections = {}
+	for i, line in enumerate(lines):
+		if line.startswith("$"):
+			sections[line.strip()] = i
+	hess = {}
+	start = sections["$vibrational_frequencies"]
+	n = int(lines[start + 1])
+	hess["frequencies"] = np.array(list(map(lambda s: float(s.split()[1]), lines[start + 2:start + 2 + n])))
+	start = sections["$atoms"]
+	n = int(lines[start + 1])
+	atoms = list(map(lambda s: s.split(), lines[start + 2:start + 2 + n]))
+	hess["elements"] = list(map(lambda a: a[0], atoms))
+	hess["masses"] = np.array(list(map(lambda a: float(a[1]), atoms)))
+	hess["coords"] = np.array(list(map(lambda a: list(map(float, a[2:5])), atoms)))
+	hess["energy"] = None
+	if "$act_energy" in sections:
+		energy = float(lines[sections["$act_energy"] + 1])
+		if energy != 0.:
+			hess["energy"] = energy
+	return hess
+
+# coordinates relative to center of mass
+def center_of_mass(masses, coords):
+	return coords - np.dot(masses, coords) / masses.sum()
+
+# principal moments of inertia, kg m^2
+def moments_of_inertia(masses, coords):
+	r = center_of_mass(masses, coords) * BOHR
+	m = masses * AMU
+	tensor = -np.einsum("i,ij,ik->jk", m, r, r)
+	tensor += np.eye(3) * np.einsum("i,ij,ij->", m, r, r)
+	return np.linalg.eigvalsh(tensor)
+
+def is_linear(masses, coords):
+	r = center_of_mass(masses, coords)
+	if len(r) < 3:
+		return True
+	# all atoms lie on line through the first atom far from center
+	axis = r[np.argmax(np.linalg.norm(r, axis=1))]
+	axis = axis / np.linalg.norm(axis)
+	return bool(np.all(np.linalg.norm(np.cross(r, axis), axis=1) < SYMMETRY_TOL))
+
+# check that rotation maps every atom to atom of the same element
+def is_symmetry_operation(rot, r, elements):
+	rr = np.dot(r, rot.T)
+	dist = np.linalg.norm(rr[:, None, :] - r[None, :, :], axis=2)
+	same = np.array(elements)[:, None] == np.array(elements)[None, :]
+	return bool(np.all(np.min(np.where(same, dist, np.inf), axis=1) < SYMMETRY_TOL))
+
+# orthonormal frame from two non collinear vectors
+def frame(u, v):
+	e1 = u / np.linalg.norm(u)
+	e2 = v - np.dot(v, e1) * e1
+	e2 = e2 / np.linalg.norm(e2)
+	return np.array([e1, e2, np.cross(e1, e2)]).T
+
+# rotational symmetry number, the order of group of proper rotations of molecule
+def symmetry_number(elements, masses, coords):
+	r = center_of_mass(masses, coords)
+	dist = np.linalg.norm(r, axis=1)
+	if len(r) == 1:
+		return 1
+	if is_linear(masses, coords):
+		return 2 if is_symmetry_operation(-np.eye(3), r, elements) else 1
+	# two reference atoms: the first far from center, the second not collinear with it
+	a = int(np.argmax(dist))
+	b = int(np.argmax(np.linalg.norm(np.cross(r, r[a]), axis=1)))
+	ref = frame(r[a], r[b])
+	order = 0
+	for i in range(len(r)):
+		if elements[i] != elements[a] or abs(dist[i] - dist[a]) > SYMMETRY_TOL:
+			continue
+		for j in range(len(r)):
+			if j == i or elements[j] != elements[b] or abs(dist[j] - dist[b]) > SYMMETRY_TOL:
+				continue
+			if abs(np.dot(r[i], r[j]) - np.dot(r[a], r[b])) > SYMMETRY_TOL * (dist[a] + dist[b]):
+				continue
+			rot = np.dot(frame(r[i], r[j]), ref.T)
+			if is_symmetry_operation(rot, r, elements):
+				order += 1
+	return max(order, 1)
+
+# vibrational entropy of free rotor with the same frequency, J/K
+def S_free_rotor(freq, T):
+	mu = H_PLANCK / (8 * np.pi**2 * C_LIGHT * freq)
+	mu = mu * B_AV / (mu + B_AV)
+	return K_BOLTZMANN * (0.5 + np.log(np.sqrt(8 * np.pi**3 * mu * K_BOLTZMANN * T / H_PLANCK**2)))
+
+# thermochemistry for array of temperatures (K); sigma - symmetry number,
+# if None it is found from geometry; energy - electronic energy, Hartree.
+# Returns dictionary with arrays of values in Hartree
+def thermochemistry(hess, temperature, multiplicity=1, sigma=None, energy=0., pressure=PRESSURE):
+	T = np.atleast_1d(np.asarray(temperature, dtype=float))
+	masses = hess["masses"]
+	coords = hess["coords"]
+	linear = is_linear(masses, coords)
+	if sigma == None:
+		sigma = symmetry_number(hess["elements"], masses, coords)
+	n_skip = 5 if linear else 6
+	if len(masses) == 1:
+		n_skip = 3
+	freq = hess["frequencies"][n_skip:]
+	freq = freq[freq > 0]
+	kT = K_BOLTZMANN * T
+
+	# vibrations
+	e_vib = H_PLANCK * C_LIGHT * freq
+	x = e_vib[None, :] / kT[:, None]
+	ZPE = 0.5 * e_vib.sum()
+	E_vib = np.sum(e_vib[None, :] / np.expm1(x), axis=1)
+	S_vib = K_BOLTZMANN * (x / np.expm1(x) - np.log(-np.expm1(-x)))
+	if QRRHO and len(freq):
+		w = 1. / (1. + (CUTOFF_FREQ / freq)**QRRHO_ALPHA)
+		S_vib = w[None, :] * S_vib + (1. - w[None, :]) * S_free_rotor(freq[None, :], T[:, None])
+	S_vib = np.sum(S_vib, axis=1)
+
+	# rotations
+	if len(masses) == 1:
+		E_rot = np.zeros_like(T)
+		S_rot = np.zeros_like(T)
+	else:
+		inertia = moments_of_inertia(masses, coords)
+		theta = H_PLANCK**2 / (8 * np.pi**2 * K_BOLTZMANN * inertia[inertia > inertia.max() * 1e-8])
+		if linear:
+			E_rot = kT
+			S_rot = K_BOLTZMANN * (np.log(T / (sigma * theta.max())) + 1.)
+		else:
+			E_rot = 1.5 * kT
+			S_rot = K_BOLTZMANN * (np.log(np.sqrt(np.pi) / sigma * np.sqrt(T**3 / np.prod(theta))) + 1.5)
+
+	# translations
+	m = masses.sum() * AMU
+	E_trans = 1.5 * kT
+	S_trans = K_BOLTZMANN * (np.log((2 * np.pi * m * kT / H_PLANCK**2)**1.5 * kT / pressure) + 2.5)
+	S_el = K_BOLTZMANN * np.log(multiplicity) * np.ones_like(T)
+
+	res = {}
+	res["temperature"] = T
+	res["mass"] = masses.sum()
+	res["sigma"] = sigma
+	res["linear"] = linear
+	res["ZPE"] = ZPE / HARTREE_J * np.ones_like(T)
+	res["E_vib"] = E_vib / HARTREE_J
+	res["E_rot"] = E_rot / HARTREE_J
+	res["E_trans"] = E_trans / HARTREE_J
+	res["H"] = energy + (ZPE + E_vib + E_rot + E_trans + kT) / HARTREE_J
+	res["TS_el"] = T * S_el / HARTREE_J
+	res["TS_vib"] = T * S_vib / HARTREE_J
+	res["TS_rot"] = T * S_rot / HARTREE_J
+	res["TS_trans"] = T * S_trans / HARTREE_J
+	res["G"] = res["H"] - res["TS_el"] - res["TS_vib"] - res["TS_rot"] - res["TS_trans"]
+	return res
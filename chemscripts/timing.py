@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+#  timing.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+
+# Timing of stages of calculations. Every measured stage gives one JSON line:
+#   {"stage": "orca", "wall": 12.3, "cpu": 45.6, "job": "mol.xyz", "name": "active_job", "run": ..., ...}
+# wall - elapsed time, cpu - processor time (user + system) of the stage:
+# for ORCA it is the time of ORCA process and its children, for other stages
+# the time of the thread of the script. The stages are:
+#   input - generation of input text;
+#   cache - search and copy of files in cache of ORCA results;
+#   scratch_write, scratch_read - writing of input and reading of output in scratch directory;
+#   orca - run of ORCA;
+#   parse - parsing of outputs and calculation of results;
+#   calculation - calculations done by script instead of ORCA (thermochemistry, volumes);
+#   preopt, opt - the whole pre-optimization by semi-empirical method and DFT optimization;
+#   cleanup - removal of scratch directories and moving of files;
+#   job - the whole calculation of one molecule (input file).
+# Timing is switched off until setup() is called. The records of one run of
+# script have the same identifier (run), so runs may be appended to one file.
+
+import os, sys, time, json, threading, resource, socket, contextvars
+from contextlib import contextmanager
+
+ENABLED = False
+FILENAME = None
+TEMPORARY = False
+RUN = None
+# labels added to every record (name of current job), set by scripts; they
+# are kept in context, so jobs run at the same time in threads or asyncio
+# tasks have own labels
+LABELS = contextvars.ContextVar("labels", default={})
+LOCK = threading.Lock()
+
+STAGES = ["input", "cache", "scratch_write", "orca", "scratch_read", "parse", "calculation", "preopt", "opt", "cleanup", "job"]
+
+
+# switch on timing, records are appended to file; without file they are
+# kept in temporary file for summary; run - identifier of run for worker
+# processes of the same run
+def setup(filename=None, run=None):
+	global ENABLED, FILENAME, TEMPORARY, RUN
+	TEMPORARY = filename == None
+	if TEMPORARY:
+		filename = os.path.join(os.environ.get("TMPDIR", "/tmp"), "chemscripts_timing_%d.jsonl" % os.getpid())
+		if os.path.isfile(filename):
+			os.remove(filename)
+	ENABLED = True
+	FILENAME = filename
+	RUN = run if run != None else "%s-%d-%d" % (socket.gethostname(), os.getpid(), int(time.time()))
+
+def set_labels(**labels):
+	LABELS.set(dict(labels))
+
+# function running in copy of current context, for threads of pool, which
+# do not get the labels of thread which started them
+def in_context(function):
+	context = contextvars.copy_context()
+	return lambda *args: context.copy().run(function, *args)
+
+# writing of record, the line is written at once, so records of several
+# threads and processes are not mixed
+def record(stage, wall, cpu, **info):
+	if not ENABLED:
+		return
+	entry = {"stage": stage, "wall": round(wall, 6), "cpu": round(cpu, 6)}
+	entry.update(LABELS.get())
+	entry.update(info)
+	entry["run"] = RUN
+	entry["pid"] = os.getpid()
+	entry["time"] = round(time.time(), 3)
+	with LOCK:
+		f = open(FILENAME, "a")
+		f.write(json.dumps(entry) + "\n")
+		f.close()
+
+# measurement of stage in current thread
+@contextmanager
+def stage(stage_name, **info):
+	if not ENABLED:
+		yield
+		return
+	t_wall = time.perf_counter()
+	t_cpu = time.thread_time()
+	try:
+		yield
+	finally:
+		record(stage_name, time.perf_counter() - t_wall, time.thread_time() - t_cpu, **info)
+
+# processor time of child process from resource usage (os.wait4)
+def cpu_time(rusage):
+	return rusage.ru_utime + rusage.ru_stime
+
+# wall time and processor time of process with all finished children,
+# start point for record_since()
+def clock():
+	usage = cpu_time(resource.getrusage(resource.RUSAGE_SELF)) + cpu_time(resource.getrusage(resource.RUSAGE_CHILDREN))
+	return time.perf_counter(), usage
+
+# record of stage started at point start from clock(), it is used for stages
+# with ORCA jobs inside (job)
+def record_since(stage, start, **info):
+	wall, cpu = clock()
+	record(stage, wall - start[0], cpu - start[1], **info)
+
+def read_records(filename=None):
+	records = []
+	f = open(filename if filename != None else FILENAME, "r")
+	for line in f:
+		try:
+			records.append(json.loads(line))
+		except ValueError:
+			pass
+	f.close()
+	return records
+
+# summary of records by stages: number, total and maximum wall time, total
+# processor time and share of wall time of all jobs (stages run at the same
+# time are summed, so the shares may give more than 100%)
+def summary(records):
+	stages = {}
+	for entry in records:
+		s = stages.setdefault(entry["stage"], {"count": 0, "wall": 0., "max": 0., "cpu": 0.})
+		s["count"] += 1
+		s["wall"] += entry["wall"]
+		s["cpu"] += entry["cpu"]
+		s["max"] = max(s["max"], entry["wall"])
+	total = stages["job"]["wall"] if "job" in stages else sum(map(lambda s: s["wall"], stages.values()))
+	for s in stages.values():
+		s["share"] = 100. * s["wall"] / total if total > 0 else 0.
+	order = STAGES + sorted(set(stages) - set(STAGES))
+	return [(name, stages[name]) for name in order if name in stages]
+
+def print_summary(records=None, file=sys.stdout):
+	if records == None:
+		records = list(filter(lambda entry: entry.get("run") == RUN, read_records()))
+	print("Stage".ljust(15, " "), "Count".rjust(7, " "), "Wall, sec.".rjust(12, " "), "Mean, sec.".rjust(12, " "), \
+		"Max, sec.".rjust(12, " "), "CPU, sec.".rjust(12, " "), "Share, %".rjust(9, " "), file=file)
+	for name, s in summary(records):
+		print(name.ljust(15, " "), str(s["count"]).rjust(7, " "), ("%.3f" % s["wall"]).rjust(12, " "), ("%.3f" % (s["wall"] / s["count"])).rjust(12, " "), \
+			("%.3f" % s["max"]).rjust(12, " "), ("%.3f" % s["cpu"]).rjust(12, " "), ("%.1f" % s["share"]).rjust(9, " "), file=file)
+
+# end of timing: print of summary table and removal of temporary file
+def finish(print_table=False):
+	global ENABLED
+	if not ENABLED:
+		return
+	if print_table and os.path.isfile(FILENAME):
+		print("")
+		print_summary()
+	if TEMPORARY and os.path.isfile(FILENAME):
+		os.remove(FILENAME)
+	ENABLED = False
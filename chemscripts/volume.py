@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+#  volume.py
+#  
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#  
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#  
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Volume of cavity formed by union of atomic spheres with sharp surface,
+# in place of "Cavity Volume" of ORCA CPCM output; ORCA builds a smoothed
+# (Gaussian) surface, so its values may differ slightly, they are not
+# compared here. The volume is calculated by Gauss theorem,
+# V = 1/3 * integral of (r, n) over surface, where the surface of each sphere
+# is represented by NPOINTS points and only points outside other spheres
+# are taken. The accuracy is set by number of points.
+
+import numpy as np
+
+BOHR_to_ANGS = 0.529177210903
+
+# number of points on sphere, may be changed of user
+NPOINTS = 5810
+
+# radii of atoms (Angstrom) by atomic number for volume of molecule (Bader)
+# and cavity (IDSCRF), see 10.1039/D2CP04720A
+RADII_BADER = {1: 1.52, 6: 1.92, 7: 1.79, 8: 1.7, 9: 1.61, 15: 2.23, 16: 2.14, 17: 2.08, 35: 2.27}
+RADII_IDSCRF = {1: 1.77, 6: 2.22, 7: 2.05, 8: 1.87, 9: 1.89, 15: 2.52, 16: 2.48, 17: 2.39, 35: 2.54}
+
+ELEMENTS = ["H", "He",
+	"Li", "Be", "B", "C", "N", "O", "F", "Ne",
+	"Na", "Mg", "Al", "Si", "P", "S", "Cl", "Ar",
+	"K", "Ca", "Sc", "Ti", "V", "Cr", "Mn", "Fe", "Co", "Ni", "Cu", "Zn", "Ga", "Ge", "As", "Se", "Br", "Kr",
+	"Rb", "Sr", "Y", "Zr", "Nb", "Mo", "Tc", "Ru", "Rh", "Pd", "Ag", "Cd", "In", "Sn", "Sb", "Te", "I", "Xe",
+	"Cs", "Ba", "La", "Ce", "Pr", "Nd", "Pm", "Sm", "Eu", "Gd", "Tb", "Dy", "Ho", "Er", "Tm", "Yb", "Lu",
+	"Hf", "Ta", "W", "Re", "Os", "Ir", "Pt", "Au", "Hg", "Tl", "Pb", "Bi", "Po", "At", "Rn"]
+
+
+# atomic number from symbol or number of element
+def atomic_number(element):
+	if element.isdigit():
+		return int(element)
+	return ELEMENTS.index(element.capitalize()) + 1
+
+# elements and coordinates (Angstrom) from lines of XYZ file
+def parse_xyz(coords):
+	atoms = list(map(lambda s: s.split(), filter(lambda s: s.strip() != "", coords.split("\n"))))
+	elements = list(map(lambda a: a[0], atoms))
+	xyz = np.array(list(map(lambda a: list(map(float, a[1:4])), atoms)))
+	return elements, xyz
+
+# uniform distribution of n points on unit sphere (Fibonacci lattice)
+def sphere_points(n):
+	i = np.arange(n) + 0.5
+	z = 1. - 2. * i / n
+	phi = np.pi * (1. + np.sqrt(5.)) * i
+	s = np.sqrt(1. - z * z)
+	return np.stack([s * np.cos(phi), s * np.sin(phi), z], axis=1)
+
+# volume of union of spheres, Bohr^3; radii - table of radii by atomic number,
+# KeyError is raised for element absent in table
+def cavity_volume(elements, xyz, radii, npoints=None):
+	if npoints == None:
+		npoints = NPOINTS
+	R = np.array(list(map(lambda e: radii[atomic_number(e)], elements)))
+	u = sphere_points(npoints)
+	volume = 0.
+	for i in range(len(R)):
+		# only neighbouring spheres can cover the points of sphere i
+		near = np.linalg.norm(xyz - xyz[i], axis=1) < R + R[i]
+		near[i] = False
+		points = xyz[i] + R[i] * u
+		d2 = np.sum((points[:, None, :] - xyz[near][None, :, :])**2, axis=2)
+		outside = np.all(d2 >= R[near][None, :]**2, axis=1)
+		volume += R[i]**2 * 4. * np.pi / npoints / 3. * np.sum(np.einsum("ij,ij->i", points[outside], u[outside]))
+	return volume / BOHR_to_ANGS**3
+
+# volumes for many geometries; structures - list of pairs (elements, xyz)
+def cavity_volumes(structures, radii, npoints=None):
+	return np.array(list(map(lambda s: cavity_volume(s[0], s[1], radii, npoints), structures)))
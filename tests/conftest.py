@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+#  conftest.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Checks of modules of package chemscripts with reference values (run by
+# python -m pytest tests), ORCA jobs are done by fake ORCA of benchmarks.
+
+import os, sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(TESTS_DIR, "data")
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+FAKE_ORCA = os.path.join(os.path.dirname(TESTS_DIR), "bench", "fake_orca", "orca")
+
+# input of ORCA job for NH3
+INPUT = """! r2SCAN-3c
+* xyz 0 1
+N 0.0 0.0 0.1
+H 0.94 0.0 -0.27
+H -0.47 0.81 -0.27
+H -0.47 -0.81 -0.27
+*"""
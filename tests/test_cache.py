@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+#  test_cache.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Cache of ORCA results: key of job, the same job is run once (fake ORCA
+# writes a line to log for every run), failed jobs are not saved, eviction
+# of least recently used entries.
+
+import os, time
+import pytest
+
+from conftest import FAKE_ORCA, INPUT
+from chemscripts import cache, runner
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+	monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+	monkeypatch.setattr(cache, "ENABLED", True)
+	monkeypatch.setattr(runner, "RETRIES", 0)
+	monkeypatch.setenv("FAKE_ORCA_LOG", str(tmp_path / "orca.log"))
+	return tmp_path
+
+def runs(directory):
+	log = os.path.join(directory, "orca.log")
+	return len(open(log).read().strip().split("\n")) if os.path.isfile(log) else 0
+
+def run(directory, input_data=INPUT, depends=()):
+	work_dir = directory / ("job_%d" % len(list(directory.glob("job_*"))))
+	os.makedirs(work_dir)
+	return runner.run_orca(FAKE_ORCA, input_data, "job", str(work_dir), True, depends)
+
+
+def test_job_key(tmp_path):
+	key = cache.job_key(INPUT, FAKE_ORCA)
+	assert cache.job_key("%pal nprocs 8 end\n" + INPUT.replace("\n", "  \n\n"), FAKE_ORCA) == key
+	assert cache.job_key(INPUT.replace("0.1", "0.2"), FAKE_ORCA) != key
+	assert cache.job_key(INPUT, FAKE_ORCA + "_other") != key
+	depend = tmp_path / "water.csv"
+	depend.write_text("a")
+	key_a = cache.job_key(INPUT, FAKE_ORCA, [str(depend)])
+	depend.write_text("b")
+	assert cache.job_key(INPUT, FAKE_ORCA, [str(depend)]) not in (key, key_a)
+
+def test_cached_run(cache_dir):
+	data = run(cache_dir)
+	assert run(cache_dir) == data
+	assert run(cache_dir, "%pal nprocs 4 end\n" + INPUT) == data
+	assert runs(cache_dir) == 1
+	assert os.path.isfile(cache_dir / "job_1" / "job.gbw")
+	run(cache_dir, INPUT.replace("0.1", "0.2"))
+	assert runs(cache_dir) == 2
+
+def test_failed_not_saved(cache_dir, monkeypatch):
+	monkeypatch.setenv("FAKE_ORCA_SCF_FAIL", "3")
+	run(cache_dir)
+	run(cache_dir)
+	assert runs(cache_dir) == 2
+	assert not os.path.isdir(cache.entry_dir(cache.job_key(INPUT, FAKE_ORCA)))
+
+def test_evict(cache_dir):
+	keys = []
+	for x in ["0.1", "0.2", "0.3"]:
+		run(cache_dir, INPUT.replace("0.1", x))
+		keys.append(cache.job_key(INPUT.replace("0.1", x), FAKE_ORCA))
+		time.sleep(0.01)
+	# the first entry is used, so the second one is the least recently used
+	run(cache_dir)
+	size = cache.entry_size(cache.entry_dir(keys[0]))
+	cache.evict(2.5 * size / 1024**3)
+	assert list(map(lambda k: os.path.isdir(cache.entry_dir(k)), keys)) == [True, False, True]
+	cache.clear()
+	assert not any(map(lambda k: os.path.isdir(cache.entry_dir(k)), keys))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+#  test_compound.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Compound job: input with steps, output split to steps (also of failed job),
+# geometry of pre-optimization, and the same results of cosmo-rs.py and
+# logP.py with and without compound job (fake ORCA).
+
+import os
+
+from conftest import FAKE_ORCA, INPUT
+from chemscripts import compound, cosmors_script, logp, preopt, runner
+
+COORDS = "N 0.0 0.0 0.1\nH 0.94 0.0 -0.27\nH -0.47 0.81 -0.27\nH -0.47 -0.81 -0.27"
+# lines of header of real output of ORCA 6.0 (test fixture job.out of ORCA
+# Python Interface 1.0.0, GPL-3.0), the credits mention compound job
+CREDITS = """   Dagmar Lenk            : GEPOL surface, SMD, ORCA-2-JSON
+   Dimitrios Liakos       : Extrapolation schemes; Compound Job, initial MDCI parallelization
+   Dimitrios Manganas     : Further ROCIS development; embedding schemes. LFT, Crystal Embedding
+"""
+
+
+def run(directory, input_data):
+	return runner.run_orca(FAKE_ORCA, input_data, "job", str(directory), False)
+
+# XYZ file of NH3 in directory
+def write_job(directory):
+	job = os.path.join(directory, "NH3.xyz")
+	f = open(job, "w")
+	f.write("4\nNH3\n" + COORDS + "\n")
+	f.close()
+	return job
+
+
+def test_job_compound():
+	data = compound.job_compound(COORDS, ["! opt r2SCAN-3c\n", "! freq r2SCAN-3c"], 2, "1", "2")
+	assert data.startswith("%pal nprocs 2 end")
+	assert data.count("* xyz 1 2\n" + COORDS + "\n*\n") == 1
+	assert data.index("* xyz") < data.index("%Compound")
+	assert data.count("New_Step\n") == 2 and data.count("Step_End\n") == 2
+	assert "New_Step\n! opt r2SCAN-3c\nStep_End\n" in data
+	assert data.endswith("Step_End\nend\n")
+
+def test_split_steps(tmp_path):
+	data = run(tmp_path, compound.job_compound(COORDS, ["! opt r2SCAN-3c", "! r2SCAN-3c", "! freq r2SCAN-3c"], 1))
+	steps = compound.split_steps(data, 3)
+	assert "".join(steps) in data
+	assert "OPTIMIZATION RUN DONE" in steps[0] and "OPTIMIZATION RUN DONE" not in steps[1]
+	assert "THERMOCHEMISTRY" in steps[2] and "THERMOCHEMISTRY" not in steps[0] + steps[1]
+	# ORCA failed in step 2: the last steps are empty
+	steps = compound.split_steps(data[:data.index("FINAL SINGLE POINT", len(data) - len(steps[1] + steps[2]))], 3)
+	assert steps[0] != "" and steps[1] != "" and steps[2] == ""
+	assert compound.split_steps("ORCA finished by error termination", 2) == ["", ""]
+
+def test_step_header(tmp_path):
+	# the header of step is found by splitting of output and by the runner,
+	# not in the credits of ORCA
+	data = run(tmp_path, compound.job_compound(COORDS, ["! r2SCAN-3c", "! r2SCAN-3c"], 1))
+	header = data.index("Compound Job Step 1")
+	data = data[:header] + CREDITS + data[header:]
+	assert list(map(lambda m: m.group(1), compound.EXPRESSIONS["step"].finditer(data))) == ["1", "2"]
+	assert compound.split_steps(CREDITS, 1) == [""]
+	assert runner.PROGRESS_EVENTS["compound step"] is compound.EXPRESSIONS["step"]
+	job = {"name": "test"}
+	runner.watch(job, CREDITS)
+	assert "progress" not in job
+	runner.watch(job, data)
+	assert job["progress"] == "terminated normally"
+	runner.watch(job, data[:data.index("Compound Job Step 2") + 30])
+	assert job["progress"] == "compound step 2"
+
+def test_read_xyz(tmp_path):
+	assert preopt.read_xyz(run(tmp_path, INPUT)) == None
+	xyz = preopt.read_xyz(run(tmp_path, INPUT.replace("!", "! opt")))
+	assert list(map(lambda line: line.split()[0], xyz.strip().split("\n"))) == ["N", "H", "H", "H"]
+
+def test_step_geometry(tmp_path, monkeypatch):
+	# the first COSMO-RS step gives the input geometry again
+	inputs = []
+	job_compound = compound.job_compound
+	monkeypatch.setattr(compound, "job_compound", lambda *args: inputs.append(args[1]) or job_compound(*args))
+	options = cosmors_script.make_options(method="r2SCAN-3c", solvents=["water", "hexane"], opt=True, compound=True, \
+		use_cache=False, orca=FAKE_ORCA, work_dir=str(tmp_path))
+	cosmors_script.calculate(write_job(tmp_path), options)
+	steps = inputs[0]
+	assert "%cosmors" in steps[2].lower() and compound.block_coords(COORDS, 0) in steps[2]
+	assert "* xyz" not in steps[0] + steps[1] + steps[3]
+
+def test_cosmors_same_results(tmp_path):
+	job = write_job(tmp_path)
+	res = []
+	for compound_job in [False, True]:
+		for opt, preopt_method in [(False, None), (True, None), (True, preopt.METHOD)]:
+			options = cosmors_script.make_options(method="r2SCAN-3c", solvents=["water", "hexane"], opt=opt, preopt=preopt_method, \
+				compound=compound_job, use_cache=False, orca=FAKE_ORCA, work_dir=str(tmp_path))
+			res.append(cosmors_script.calculate(job, options))
+	for r in res[1:]:
+		assert r["G_solv"] == res[0]["G_solv"] and None not in r["G_solv"]
+	assert res[1]["G_gas"] == res[4]["G_gas"] and res[2]["G_gas"] == res[5]["G_gas"]
+
+def test_logp_same_results(tmp_path):
+	job = write_job(tmp_path)
+	res = []
+	for compound_job in [False, True]:
+		options = logp.make_options(compound=compound_job, preopt=preopt.METHOD, use_cache=False, orca=FAKE_ORCA, work_dir=str(tmp_path))
+		res.append(logp.calculate(job, options))
+	assert res[0]["logP"] == res[1]["logP"] and res[0]["logP"]["COSMO-RS"] != None
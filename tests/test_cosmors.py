@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+#  test_cosmors.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# COSMO-RS for several solvents: full jobs for ORCA 6.1 (no keyword for
+# reading of solute surface), surface of solute calculated once for version
+# of ORCA with the keyword (FAKE_ORCA_SURFACE_KEYWORD), and fallback to full
+# jobs when the surface file is not written or the keyword is not accepted.
+
+import os
+import pytest
+
+from conftest import FAKE_ORCA
+from chemscripts import cosmors
+
+COORDS = "N 0.0 0.0 0.1\nH 0.94 0.0 -0.27\nH -0.47 0.81 -0.27\nH -0.47 -0.81 -0.27"
+SOLVENTS = ["water", "1-octanol", "hexane"]
+
+
+# free energies of solvation and names of ORCA jobs (from log of fake ORCA)
+def evaluate(directory, monkeypatch):
+	log = os.path.join(directory, "orca.log")
+	if os.path.isfile(log):
+		os.remove(log)
+	monkeypatch.setenv("FAKE_ORCA_LOG", log)
+	res = cosmors.evaluate_solvents(FAKE_ORCA, COORDS, SOLVENTS, 1, str(directory), use_cache=False)
+	jobs = list(map(lambda line: line.split()[2], open(log).read().strip().split("\n")))
+	return dict(map(lambda s: (s, res[s][0]), SOLVENTS)), jobs
+
+# version of ORCA, which reads the surface of solute with keyword
+@pytest.fixture
+def keyword(monkeypatch):
+	monkeypatch.setattr(cosmors, "SURFACE_KEYWORD", "solutefilename")
+	monkeypatch.setenv("FAKE_ORCA_SURFACE_KEYWORD", "solutefilename")
+
+
+def test_full_jobs(tmp_path, monkeypatch, capsys):
+	G_solv, jobs = evaluate(tmp_path, monkeypatch)
+	assert jobs == ["surface.inp"] * 3
+	assert "Warning" not in capsys.readouterr().out
+	assert None not in G_solv.values()
+
+def test_surface_once(tmp_path, monkeypatch, capsys, keyword):
+	G_solv, jobs = evaluate(tmp_path, monkeypatch)
+	assert jobs == ["surface.inp", "solvent.inp", "solvent.inp"]
+	assert "Warning" not in capsys.readouterr().out
+	assert None not in G_solv.values()
+
+def test_surface_not_written(tmp_path, monkeypatch, capsys, keyword):
+	G_solv, jobs = evaluate(tmp_path, monkeypatch)
+	monkeypatch.setattr(cosmors, "SURFACE_EXT", ".missing")
+	G_full, jobs = evaluate(tmp_path, monkeypatch)
+	assert jobs == ["surface.inp"] * 3
+	out = capsys.readouterr().out
+	assert out.count("Warning") == 1 and "SURFACE_EXT" in out
+	assert G_full == G_solv
+
+def test_keyword_not_accepted(tmp_path, monkeypatch, capsys, keyword):
+	# ORCA without the keyword stops with input error
+	G_solv, jobs = evaluate(tmp_path, monkeypatch)
+	monkeypatch.delenv("FAKE_ORCA_SURFACE_KEYWORD")
+	G_full, jobs = evaluate(tmp_path, monkeypatch)
+	assert jobs == ["surface.inp", "solvent.inp", "surface.inp", "surface.inp"]
+	out = capsys.readouterr().out
+	assert out.count("Warning, surface") == 1 and "SURFACE_KEYWORD" in out
+	assert G_full == G_solv
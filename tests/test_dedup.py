@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+#  test_dedup.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Geometric deduplication: RMSD after superposition does not depend on
+# translation, rotation and numbering of atoms, the mirror image of chiral
+# structure is not the same structure.
+
+import numpy as np
+import pytest
+
+import conftest
+from chemscripts import dedup
+
+# asymmetric (chiral) structure, all distances from center are different
+RNG = np.random.default_rng(7)
+ELEMENTS = ["C", "C", "C", "O", "N", "H", "H", "H", "H", "H", "H", "H"]
+XYZ = RNG.uniform(-2., 2., (len(ELEMENTS), 3))
+
+
+def coords(xyz, elements=ELEMENTS):
+	return "\n".join(map(lambda e, c: e + " %.8f %.8f %.8f" % tuple(c), elements, xyz))
+
+# random proper rotation
+def rotation(seed):
+	q, r = np.linalg.qr(np.random.default_rng(seed).normal(size=(3, 3)))
+	q = q * np.sign(np.diag(r))
+	return q if np.linalg.det(q) > 0 else -q
+
+
+def test_rotation_translation():
+	for seed in range(5):
+		moved = XYZ @ rotation(seed).T + np.array([3., -1., 10.])
+		assert dedup.rmsd(dedup.structure(coords(XYZ)), dedup.structure(coords(moved))) == pytest.approx(0., abs=1e-6)
+		duplicates = dedup.find_duplicates([(coords(XYZ), None), (coords(moved), None)])
+		assert list(duplicates) == [1] and duplicates[1][0] == 0
+
+def test_permutation():
+	order = RNG.permutation(len(ELEMENTS))
+	moved = (XYZ @ rotation(1).T)[order]
+	elements = [ELEMENTS[i] for i in order]
+	r = dedup.rmsd(dedup.structure(coords(XYZ)), dedup.structure(coords(moved, elements)))
+	assert r == pytest.approx(0., abs=1e-6)
+
+def test_noise():
+	# noise of coordinates 0.01 A gives RMSD about 0.017 A
+	noisy = XYZ @ rotation(2).T + np.random.default_rng(3).normal(scale=0.01, size=XYZ.shape)
+	r = dedup.rmsd(dedup.structure(coords(XYZ)), dedup.structure(coords(noisy)))
+	assert 0.005 < r < 0.03
+	assert 1 in dedup.find_duplicates([(coords(XYZ), None), (coords(noisy), None)])
+	assert dedup.find_duplicates([(coords(XYZ), None), (coords(noisy), None)], threshold=0.001) == {}
+
+def test_mirror_image():
+	mirror = XYZ * np.array([-1., 1., 1.])
+	assert dedup.rmsd(dedup.structure(coords(XYZ)), dedup.structure(coords(mirror))) > dedup.RMSD
+	assert dedup.find_duplicates([(coords(XYZ), None), (coords(mirror), None)]) == {}
+
+def test_keys_and_composition():
+	other = ["C", "C", "C", "O", "O"] + ELEMENTS[5:]
+	structures = [(coords(XYZ), "charge 0"), (coords(XYZ), "charge 1"), (coords(XYZ, other), "charge 0"), (None, "charge 0"), \
+		(coords(XYZ + 1.), "charge 1")]
+	duplicates = dedup.find_duplicates(structures)
+	assert list(duplicates) == [4] and duplicates[4][0] == 1
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+#  test_extract.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Extraction of properties from outputs: the tail-first scan of large files
+# gives the same values as the full scan, also for values cut by the window,
+# and truncated outputs give the last complete values.
+
+import os
+import pytest
+
+import conftest
+from chemscripts import extract
+from chemscripts.extract import MissingPropertyError
+
+FILLER = "          ITERATION    ENERGY           DELTA-E\n"
+
+
+def energy(e):
+	return "FINAL SINGLE POINT ENERGY      %.10f\n\n" % e
+
+def coords(x):
+	return "CARTESIAN COORDINATES (ANGSTROEM)\n---------------------------------\n  N  %.6f  0.000000  0.000000\n  H  1.000000  0.000000  0.000000\n\n" % x
+
+def write(directory, data, name="job.out"):
+	filename = os.path.join(directory, name)
+	f = open(filename, "w")
+	f.write(data)
+	f.close()
+	return filename
+
+
+def test_huge_file(tmp_path):
+	# the energy is far from the tail, the Gibbs energy is at the end
+	data = energy(-56.1) + FILLER * (64 * extract.TAIL_SIZE // len(FILLER)) + "Final Gibbs free energy         ...    -56.52 Eh\n"
+	filename = write(tmp_path, data)
+	assert os.path.getsize(filename) > 64 * extract.TAIL_SIZE
+	res = extract.extract_file(filename, last=["Energy", "G_gas"])
+	assert res == {"Energy": -56.1, "G_gas": -56.52}
+
+def test_last_first_all(tmp_path):
+	data = "".join(map(lambda n: energy(-56. - n) + FILLER * 2000, range(50)))
+	filename = write(tmp_path, data)
+	assert extract.extract_file(filename, last=["Energy"])["Energy"] == -105.
+	assert extract.extract_file(filename, first=["Energy"])["Energy"] == -56.
+	assert extract.extract_file(filename, all=["Energy"])["Energy"] == list(map(lambda n: -56. - n, range(50)))
+
+def test_window_boundary(tmp_path):
+	# the last energy is cut by the start of tail window at every position
+	line = energy(-56.25)
+	for shift in range(len(line) + 2):
+		data = energy(-1.) + FILLER * 10 + line + "x" * (extract.TAIL_SIZE - len(line) + shift - 1) + "\n"
+		filename = write(tmp_path, data)
+		assert extract.extract_file(filename, last=["Energy"])["Energy"] == -56.25
+
+def test_truncated(tmp_path):
+	# the output is cut inside of the last block of coordinates
+	data = coords(0.1) + energy(-56.3) + coords(0.2) + energy(-56.4) + coords(0.3)
+	filename = write(tmp_path, data[:-20])
+	res = extract.extract_file(filename, last=["XYZ", "Energy"])
+	assert res["XYZ"].split()[:2] == ["N", "0.200000"]
+	assert res["Energy"] == -56.4
+	assert extract.extract(data, last=["XYZ"])["XYZ"].split()[:2] == ["N", "0.300000"]
+
+def test_missing(tmp_path):
+	filename = write(tmp_path, energy(-56.3) * 3, "truncated.out")
+	with pytest.raises(MissingPropertyError) as e:
+		extract.extract_file(filename, last=["Energy", "G_gas"])
+	assert e.value.names == ["G_gas"] and "truncated.out" in str(e.value)
+	assert extract.extract_file(filename, last=["G_gas"], all=["Volume"], optional=["G_gas", "Volume"]) == {"G_gas": None, "Volume": []}
+	empty = write(tmp_path, "", "empty.out")
+	assert extract.extract_file(empty, last=["Energy"], optional=["Energy"]) == {"Energy": None}
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+#  test_journal.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Journal of stages: the stages are taken on resume only with the same key,
+# a broken last line (interrupted write) is ignored, the journal used by
+# other run is not opened.
+
+import json
+import pytest
+
+import conftest
+from chemscripts import journal
+
+
+def test_resume(tmp_path):
+	filename = str(tmp_path / "journal.jsonl")
+	j = journal.open_journal(filename)
+	key = journal.stage_key("! opt\n* xyz 0 1\nN 0 0 0\n*", "orca")
+	journal.record_stage(j, "NH3.xyz", "opt-water", {"Energy": -56.5, "XYZ": "N 0 0 0"}, key)
+	journal.record_stage(j, "NH3.xyz", "CRS-water", {"G_solv": -0.01}, "other")
+	journal.close_journal(j)
+	j = journal.open_journal(filename, resume=True)
+	assert journal.get_stage(j, "NH3.xyz", "opt-water", key) == {"Energy": -56.5, "XYZ": "N 0 0 0"}
+	assert journal.get_stage(j, "NH3.xyz", "opt-water", "changed") == None
+	assert journal.get_stage(j, "NH3.xyz", "opt-octanol", key) == None
+	assert journal.get_stage(j, "H2O.xyz", "opt-water", key) == None
+	assert journal.get_stage(None, "NH3.xyz", "opt-water", key) == None
+	journal.close_journal(j)
+	# without resume the journal is started again
+	j = journal.open_journal(filename)
+	assert journal.get_stage(j, "NH3.xyz", "opt-water", key) == None
+	journal.close_journal(j)
+	assert open(filename).read() == ""
+
+def test_locked(tmp_path):
+	# the second run with the same journal fails and does not truncate it
+	filename = str(tmp_path / "journal.jsonl")
+	j = journal.open_journal(filename)
+	journal.record_stage(j, "NH3.xyz", "vacuum", {"G_gas": -56.5}, "key")
+	for resume in [False, True]:
+		with pytest.raises(journal.JournalLockedError):
+			journal.open_journal(filename, resume)
+	journal.record_stage(j, "NH3.xyz", "CRS-water", {"G_solv": -0.01}, "key")
+	journal.close_journal(j)
+	j = journal.open_journal(filename, resume=True)
+	assert journal.get_stage(j, "NH3.xyz", "vacuum", "key") == {"G_gas": -56.5}
+	assert journal.get_stage(j, "NH3.xyz", "CRS-water", "key") == {"G_solv": -0.01}
+	journal.close_journal(j)
+
+def test_broken_line(tmp_path):
+	filename = str(tmp_path / "journal.jsonl")
+	j = journal.open_journal(filename)
+	journal.record_stage(j, "NH3.xyz", "vacuum", {"G_gas": -56.5}, "key")
+	journal.close_journal(j)
+	f = open(filename, "a")
+	f.write('{"job": "NH3.xyz", "stage": "CRS-wat')
+	f.close()
+	j = journal.open_journal(filename, resume=True)
+	assert journal.get_stage(j, "NH3.xyz", "vacuum", "key") == {"G_gas": -56.5}
+	journal.record_stage(j, "NH3.xyz", "CRS-water", {"G_solv": -0.01}, "key")
+	journal.close_journal(j)
+	lines = open(filename).read().split("\n")
+	assert json.loads(lines[2])["stage"] == "CRS-water"
+	j = journal.open_journal(filename, resume=True)
+	assert journal.get_stage(j, "NH3.xyz", "CRS-water", "key") == {"G_solv": -0.01}
+	journal.close_journal(j)
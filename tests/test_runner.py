@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+#  test_runner.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Watching of ORCA output by the runner: fatal events and stalled geometry
+# optimization; retry ladder of failed jobs with fake ORCA (SCF is not
+# converged without SlowConv or VerySlowConv).
+
+import os, json, asyncio
+
+from conftest import FAKE_ORCA, INPUT
+from chemscripts import runner
+
+
+# parts of real outputs of ORCA 6.0 (test fixtures failed_scf.out and
+# failed_geometry.out of ORCA Python Interface 1.0.0, GPL-3.0): SCF is not
+# converged in single point and the run is aborted, optimization reached
+# the maximum number of cycles
+FAILED_SCF = """
+               *****************************************************
+               *                      ERROR                        *
+               *        SCF NOT CONVERGED AFTER   1 CYCLES         *
+               *****************************************************
+
+[file orca_leanscf/orca_leanscf.cpp, line 294]: Error (ORCA_LEANSCF): unfortunately, the SCF has not converged. There may be a way out but we have to stop here 
+
+ORCA finished by error termination in LEANSCF
+Calling Command: /home/mathieu/Programs/orca6/bin/orca_leanscf job.gbw 
+[file orca_tools/qcmsg.cpp, line 394]: 
+  .... aborting the run
+"""
+FAILED_GEOMETRY = """
+    ----------------------------------------------------------------------------
+                                  WARNING !!!
+       The optimization did not converge but reached the maximum number of
+       optimization cycles.
+       Please check your results very carefully.
+    ----------------------------------------------------------------------------
+"""
+
+# output of optimization with energies of cycles, in blocks as from pipe
+def optimization(energies, done=False):
+	res = []
+	for cycle, energy in enumerate(energies, 1):
+		res.append("  *   GEOMETRY OPTIMIZATION CYCLE  %d   *\n...\nFINAL SINGLE POINT ENERGY      %.10f\n" % (cycle, energy))
+	if done:
+		res.append("                 *** OPTIMIZATION RUN DONE ***\nFINAL SINGLE POINT ENERGY      %.10f\n" % energies[-1])
+	return res
+
+def watch(blocks):
+	job = {"name": "test"}
+	for block in blocks:
+		runner.watch(job, block)
+	return job
+
+
+def test_converging():
+	job = watch(optimization([-56.5 - 0.001 * n for n in range(3 * runner.STALL_CYCLES)], done=True))
+	assert "fatal" not in job
+	assert job["progress"] == "optimization cycle " + str(3 * runner.STALL_CYCLES)
+
+def test_oscillating():
+	energies = [-56.5 - 0.001 * n for n in range(5)] + [-56.503, -56.5035] * runner.STALL_CYCLES
+	job = watch(optimization(energies))
+	assert job["fatal"] == "optimization stalled " + str(runner.STALL_CYCLES)
+
+def test_new_optimization():
+	# the steps of compound job: the second optimization starts at higher energy
+	energies = [-56.5 - 0.001 * n for n in range(runner.STALL_CYCLES)]
+	job = watch(optimization(energies, done=True) + optimization([e + 1. for e in energies], done=True))
+	assert "fatal" not in job
+
+def test_single_points():
+	job = watch(["FINAL SINGLE POINT ENERGY      -56.5\n"] * (2 * runner.STALL_CYCLES))
+	assert "fatal" not in job
+
+def test_fatal_events():
+	# message of SCF alone is not fatal, ORCA may go on
+	job = watch(["SCF NOT CONVERGED AFTER 125 CYCLES\n"])
+	assert "fatal" not in job
+	job = watch([FAILED_SCF[:FAILED_SCF.index("[file")], FAILED_SCF[FAILED_SCF.index("[file"):]])
+	assert job["fatal"] == "error termination LEANSCF"
+	job = watch([FAILED_GEOMETRY])
+	assert job["fatal"] == "optimization not converged"
+	job = watch(["ORCA TERMINATED NORMALLY\n"])
+	assert "fatal" not in job and job["terminated"]
+
+def test_not_stopped(tmp_path):
+	# without stop_fatal (startorca.py) the job runs until the end
+	script = "printf '" + FAILED_GEOMETRY + "'; sleep 0.2; echo '****ORCA TERMINATED NORMALLY****'"
+	res = asyncio.run(runner.run_process(["sh", "-c", script], str(tmp_path / "job.out"), str(tmp_path), "job", stop_fatal=False))
+	assert res["returncode"] == 0 and res["terminated"] and res["fatal"] == "optimization not converged"
+	res = asyncio.run(runner.run_process(["sh", "-c", script], str(tmp_path / "job.out"), str(tmp_path), "job"))
+	assert not res["terminated"] and res["fatal"] == "optimization not converged"
+
+
+# run of job with fake ORCA failing with SCF_FAIL, returns output and runs
+# of job from ATTEMPTS_LOG
+def run(directory, monkeypatch, scf_fail, input_data=INPUT, retries=2):
+	log = os.path.join(directory, "attempts.log")
+	monkeypatch.setenv("FAKE_ORCA_SCF_FAIL", str(scf_fail))
+	monkeypatch.setattr(runner, "ATTEMPTS_LOG", log)
+	monkeypatch.setattr(runner, "RETRIES", retries)
+	data = runner.run_orca(FAKE_ORCA, input_data, "job", str(directory), use_cache=False)
+	return data, list(map(json.loads, open(log).read().strip().split("\n")))
+
+def test_no_retry(tmp_path, monkeypatch):
+	data, attempts = run(tmp_path, monkeypatch, 0)
+	assert "ORCA TERMINATED NORMALLY" in data
+	assert len(attempts) == 1 and attempts[0]["failure"] == None
+
+def test_retry_ladder(tmp_path, monkeypatch):
+	data, attempts = run(tmp_path, monkeypatch, 1)
+	assert "ORCA TERMINATED NORMALLY" in data
+	assert list(map(lambda a: a["settings"], attempts)) == [None, "SlowConv"]
+	assert attempts[0]["failure"] == "error termination SCF" and attempts[1]["failure"] == None
+	os.remove(os.path.join(tmp_path, "attempts.log"))
+	data, attempts = run(tmp_path, monkeypatch, 2)
+	assert "ORCA TERMINATED NORMALLY" in data
+	assert list(map(lambda a: a["settings"], attempts)) == [None, "SlowConv", "VerySlowConv"]
+
+def test_retries_exhausted(tmp_path, monkeypatch):
+	data, attempts = run(tmp_path, monkeypatch, 3)
+	assert "ORCA TERMINATED NORMALLY" not in data
+	assert len(attempts) == 1 + len(runner.RETRY_LADDER) and all(map(lambda a: a["failure"] != None, attempts))
+	os.remove(os.path.join(tmp_path, "attempts.log"))
+	data, attempts = run(tmp_path, monkeypatch, 1, retries=0)
+	assert len(attempts) == 1
+
+def test_compound_not_repeated(tmp_path, monkeypatch):
+	compound = INPUT.replace("! r2SCAN-3c\n", "") + "\n%Compound\nNew_Step\n! r2SCAN-3c\nStep_End\nend\n"
+	data, attempts = run(tmp_path, monkeypatch, 1, compound)
+	assert len(attempts) == 1 and attempts[0]["failure"] != None
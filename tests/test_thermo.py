@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+#  test_thermo.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Thermochemistry of NH3 (experimental geometry and fundamental frequencies
+# in data/NH3.hess) against NIST-JANAF: S(298.15 K, 1 bar) = 192.77 J/(mol K),
+# H(298.15) - H(0) = 10.043 kJ/mol; the Gibbs energies of free_energy include
+# the electronic energy of Hessian file.
+
+import os
+import pytest
+
+from conftest import DATA_DIR, FAKE_ORCA
+from chemscripts import thermo, free_energy
+
+HARTREE_KJ = 2625.49963948
+T = 298.15
+
+
+def test_read_hess():
+	hess = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))
+	assert hess["elements"] == ["N", "H", "H", "H"]
+	assert len(hess["frequencies"]) == 12
+	assert hess["energy"] == pytest.approx(-56.53617)
+
+def test_nist_reference():
+	hess = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))
+	res = thermo.thermochemistry(hess, T, energy=hess["energy"], pressure=1e5)
+	assert res["sigma"] == 3
+	assert not res["linear"]
+	S = (res["TS_el"] + res["TS_vib"] + res["TS_rot"] + res["TS_trans"])[0] / T * HARTREE_KJ * 1000
+	assert S == pytest.approx(192.77, abs=0.5)
+	H_thermal = (res["H"] - hess["energy"] - res["ZPE"])[0] * HARTREE_KJ
+	assert H_thermal == pytest.approx(10.043, abs=0.05)
+	assert res["G"][0] - hess["energy"] == pytest.approx((res["H"] - hess["energy"] - T * S / HARTREE_KJ / 1000)[0])
+
+def test_temperatures():
+	hess = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))
+	res = thermo.thermochemistry(hess, [250., 298.15, 400.])
+	assert res["G"][1] == pytest.approx(thermo.thermochemistry(hess, 298.15)["G"][0])
+	assert res["G"][0] > res["G"][1] > res["G"][2]
+
+# molecule NH3 in directory of test, the Hessian file with or without
+# electronic energy, optionally with output of frequency job
+def molecule(directory, energy=True, output=None):
+	hess = open(os.path.join(DATA_DIR, "NH3.hess")).read()
+	if not energy:
+		hess = hess.replace("-56.536170", "0.000000")
+	open(os.path.join(directory, "NH3.hess"), "w").write(hess)
+	coords = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))["coords"] * thermo.BOHR * 1e10
+	xyz = "\n".join(map(lambda e, c: e + " %.6f %.6f %.6f" % tuple(c), ["N", "H", "H", "H"], coords))
+	open(os.path.join(directory, "NH3.xyz"), "w").write("4\nNH3\n" + xyz + "\n")
+	if output != None:
+		open(os.path.join(directory, "NH3.out"), "w").write(output)
+
+def calculate(directory, native_thermochem=True, input_dir=None):
+	options = free_energy.make_options(temperature=[T], native_thermochem=native_thermochem, use_cache=False, \
+		orca=FAKE_ORCA, work_dir=str(directory), input_dir=input_dir)
+	return free_energy.calculate("NH3", options)
+
+def test_gibbs_includes_energy(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	molecule(tmp_path)
+	res = calculate(tmp_path)
+	assert res["thermochem_method"] == "native"
+	hess = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))
+	assert res["G_gas"][0] == pytest.approx(thermo.thermochemistry(hess, T, energy=-56.53617)["G"][0])
+	assert -56.6 < res["G_gas"][0] < -56.5
+	assert -56.6 < res["G_liquid"][0] < -56.5
+
+# all files of job are read from input directory, not from current one
+def test_input_dir(tmp_path, monkeypatch):
+	os.makedirs(tmp_path / "input")
+	molecule(tmp_path / "input")
+	monkeypatch.chdir(tmp_path)
+	res = calculate(tmp_path, input_dir=str(tmp_path / "input"))
+	monkeypatch.chdir(tmp_path / "input")
+	assert res["G_gas"] == calculate(tmp_path)["G_gas"]
+
+def test_energy_from_output(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	molecule(tmp_path, energy=False, output="FINAL SINGLE POINT ENERGY       -56.400000000\n\nFINAL SINGLE POINT ENERGY       -56.500000000\n")
+	res = calculate(tmp_path)
+	hess = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))
+	assert res["G_gas"][0] == pytest.approx(thermo.thermochemistry(hess, T, energy=-56.5)["G"][0])
+
+# without electronic energy the thermochemistry is calculated by ORCA, the
+# Gibbs energy is the "Final Gibbs free energy" of ORCA output
+def test_fallback_to_orca(tmp_path, monkeypatch, capsys):
+	monkeypatch.chdir(tmp_path)
+	molecule(tmp_path, energy=False)
+	res = calculate(tmp_path)
+	assert "electronic energy is not found" in capsys.readouterr().out
+	assert res["thermochem_method"] == "orca"
+	orca = calculate(tmp_path, native_thermochem=False)
+	assert res["G_gas"] == orca["G_gas"]
+	assert res["G_gas"][0] < -50.
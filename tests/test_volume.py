@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+#  test_volume.py
+#
+#  Copyright 2026 Ad <ad.dycost@gmail.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+# Volume of union of atomic spheres against exact values (one sphere, two
+# overlapping spheres) and regression values for NH3 (geometry of
+# data/NH3.hess): 252.2 (Bader radii) and 361.2 Bohr^3 (IDSCRF), the values
+# converged by this calculator (252.14 and 361.23 at 200000 points), not
+# outputs of ORCA; with NPOINTS the error depends on orientation, up to
+# 0.4 Bohr^3.
+
+import os, math
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR
+from chemscripts import volume, thermo
+
+BOHR3 = volume.BOHR_to_ANGS**3
+
+
+def test_one_sphere():
+	R = volume.RADII_BADER[7]
+	V = volume.cavity_volume(["N"], np.zeros((1, 3)), volume.RADII_BADER)
+	assert V == pytest.approx(4. / 3. * math.pi * R**3 / BOHR3, rel=1e-9)
+
+def test_two_spheres():
+	# union of two spheres: twice the sphere without lens of intersection
+	R = volume.RADII_BADER[8]
+	for d in [0.5, 1.2, 2.5, 3.6]:
+		V = volume.cavity_volume(["O", "O"], np.array([[0., 0., 0.], [d, 0., 0.]]), volume.RADII_BADER)
+		lens = math.pi * (4. * R + d) * (2. * R - d)**2 / 12. if d < 2. * R else 0.
+		assert V == pytest.approx((8. / 3. * math.pi * R**3 - lens) / BOHR3, abs=0.1)
+
+def test_NH3_regression():
+	hess = thermo.read_hess(os.path.join(DATA_DIR, "NH3.hess"))
+	xyz = hess["coords"] * thermo.BOHR * 1e10
+	assert volume.cavity_volume(hess["elements"], xyz, volume.RADII_BADER) == pytest.approx(252.2, abs=0.4)
+	assert volume.cavity_volume(hess["elements"], xyz, volume.RADII_IDSCRF) == pytest.approx(361.2, abs=0.4)
+
+def test_invariance():
+	elements, xyz = volume.parse_xyz("N 0 0 0\nH 0.9396 0 -0.3061\nH -0.4698 0.8137 -0.3061\nH -0.4698 -0.8137 -0.3061")
+	c, s = math.cos(0.7), math.sin(0.7)
+	moved = xyz @ np.array([[c, -s, 0.], [s, c, 0.], [0., 0., 1.]]).T + 5.
+	V = volume.cavity_volumes([(elements, xyz), (elements, moved), (elements[::-1], xyz[::-1])], volume.RADII_BADER)
+	assert V[1] == pytest.approx(V[0], abs=0.6)
+	assert V[2] == pytest.approx(V[0], abs=1e-6)
+	V = volume.cavity_volumes([(elements, xyz), (elements, moved)], volume.RADII_BADER, 50000)
+	assert V[1] == pytest.approx(V[0], abs=0.1)
+	with pytest.raises(KeyError):
+		volume.cavity_volume(["Xe"], np.zeros((1, 3)), volume.RADII_BADER)